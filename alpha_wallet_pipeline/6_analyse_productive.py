@@ -1,18 +1,23 @@
 import asyncio
 import copy
 import random
-from datetime import datetime
-from typing import Optional
+from datetime import datetime, timedelta
+from typing import Optional, List
 
+import pandas as pd
 from dotenv import load_dotenv
 
-from bot.token_watcher import prepare_current_dataset
+from birdeye_api.ohlcv_endpoint import get_time_frame_ohlcv
 from config.config_reader import load_yaml_to_dict
-from constants import BIN_AMOUNT_KEY, CONFIG_2_FILE, TOKEN_COLUMN, RANDOM_SEED, TRADING_MINUTE_COLUMN
+from constants import BIN_AMOUNT_KEY, CONFIG_2_FILE, TOKEN_COLUMN, RANDOM_SEED, TRADING_MINUTE_COLUMN, \
+    LAUNCH_DATE_COLUMN, TRADER_COLUMN
 from data.combine_price_trades import prepare_timestamps, convert_trading_amount
 from data.dataset import prepare_test_data, prepare_dataset
+from data.token_feature_state import TokenFeatureState, get_traders_from_columns
+from database.raw_sql import setup_database
 from database.token_dataset_table import get_token_datasets_by_token
 from dune.data_collection import collect_all_data
+from dto.trade_model import Trade
 from ml_model.hist_gradient_model_builder import HistGradientBoostModelBuilder
 
 
@@ -37,18 +42,26 @@ async def data_leak_check(amount_of_tokens: int = 10, use_cache: bool = True):
     val_x, val_y = model_builder.prepare_prediction_data(val.copy(), True)
     val_predictions = model_builder.predict(val_x)
 
-    # predict token on split data using same logic to create df like production
+    # predict token on split data using the incremental feature state of production
     for token in selected_tokens:
         test = val[val[TOKEN_COLUMN] == token]
         starting_minute = val[val[TOKEN_COLUMN] == token][TRADING_MINUTE_COLUMN].min()
         end_minute = val[val[TOKEN_COLUMN] == token][TRADING_MINUTE_COLUMN].max()
         current_minute = starting_minute
 
+        token_trades = top_trader_trades[top_trader_trades[TOKEN_COLUMN] == token]
+        feature_state = TokenFeatureState(token, token_trades[LAUNCH_DATE_COLUMN].iloc[0],
+                                          get_traders_from_columns(model_builder.get_columns()))
+        feature_state.add_trades(get_trades_from_dataframe(token_trades), len(token_trades))
+
         while current_minute <= end_minute:
-            valid_trades = top_trader_trades[
-                (top_trader_trades[TOKEN_COLUMN] == token) & (top_trader_trades[TRADING_MINUTE_COLUMN] <= starting_minute)]
+            candles = await get_time_frame_ohlcv(token, current_minute,
+                                                 feature_state.get_missing_minutes(current_minute), "1m")
+            df = feature_state.update(current_minute, candles)
+            current_minute += timedelta(minutes=1)
+            if df is None:
+                continue
 
-            df = await prepare_current_dataset(valid_trades, starting_minute, token, model_builder.get_columns())
             prediction_data, _ = model_builder.prepare_prediction_data(df.copy(), False)
             prediction = model_builder.predict(prediction_data)
 
@@ -56,6 +69,11 @@ async def data_leak_check(amount_of_tokens: int = 10, use_cache: bool = True):
             # todo compare the data not only the prediction results.
 
 
+def get_trades_from_dataframe(trades: pd.DataFrame) -> List[Trade]:
+    return [Trade(row[TRADER_COLUMN], row[TOKEN_COLUMN], row["token_amount"], row["sol_amount"], row["buy"], 0,
+                  pd.Timestamp(row[TRADING_MINUTE_COLUMN]).isoformat(), "") for _, row in trades.iterrows()]
+
+
 async def check_token(token: str):
     config = dict()
     config[BIN_AMOUNT_KEY] = 10
@@ -104,4 +122,5 @@ async def main(token: Optional[str], date_form: Optional[datetime], date_to: Opt
 
 if __name__ == '__main__':
     load_dotenv()
+    setup_database()
     asyncio.run(data_leak_check())
@@ -1,24 +1,280 @@
+import asyncio
+import enum
 import logging
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional
 
-from constants import BIRD_EYE_COUNTER
-from data.redis_helper import get_async_redis
+import redis.asyncio
+
+from constants import BIRDEYE_QUOTA
+from data.redis_helper import get_shared_async_redis
 
 logger = logging.getLogger(__name__)
 
+OHLCV_ENDPOINT = "ohlcv"
+TRADER_TRADES_ENDPOINT = "trader_trades"
+TOKEN_CREATION_ENDPOINT = "token_creation_info"
 
-async def check_api_limit(check_limit: bool) -> bool:
-    if not check_limit:
-        return True
+BIRDEYE_REQUESTS_PER_SECOND = 15
+BIRDEYE_REQUESTS_PER_MINUTE = 900
+BIRDEYE_REQUESTS_PER_DAY = 50000
+BIRDEYE_TRADER_TRADES_PER_SECOND = 10
+BACKFILL_SHARE = 0.8
+LIVE_WAITING_SECONDS = 1
+LIVE_ACQUIRE_TIMEOUT_SECONDS = 10
+MAX_QUOTA_WAIT_SECONDS = 5
+
+
+class TokenBucket:
+    """
+    In process token bucket, rate tokens per second up to capacity.
+
+    Args:
+        rate: Tokens added per second.
+        capacity: Maximum burst, rate by default.
+        clock: Monotonic clock in seconds, replaceable for deterministic tests.
+    """
+
+    def __init__(self, rate: float, capacity: Optional[float] = None, clock: Callable[[], float] = time.monotonic):
+        self.rate = rate
+        self.capacity = rate if capacity is None else capacity
+        self.clock = clock
+        self.tokens = self.capacity
+        self.updated = clock()
+
+    def try_acquire(self, tokens: float = 1) -> float:
+        """Takes the tokens if available, otherwise returns the seconds until they are."""
+        now = self.clock()
+        self.tokens = min(self.capacity, self.tokens + max(0.0, now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens >= tokens:
+            self.tokens -= tokens
+            return 0
+
+        return (tokens - self.tokens) / self.rate
+
+    async def acquire(self, tokens: float = 1):
+        while (wait := self.try_acquire(tokens)) > 0:
+            await asyncio.sleep(wait)
+
+
+class ApiLimitError(Exception):
+    pass
+
+
+class Priority(enum.Enum):
+    LIVE = 'LIVE'
+    BACKFILL = 'BACKFILL'
+
+
+@dataclass
+class WindowLimit:
+    name: str
+    limit: int
+    seconds: int
+
+
+@dataclass
+class EndpointQuota:
+    rate: Optional[float] = None
+    capacity: Optional[float] = None
+    windows: List[WindowLimit] = field(default_factory=list)
+
+
+# KEYS[1]: flag set while live requests wait, KEYS[2..]: bucket hashes followed by window key prefixes.
+# ARGV: live (1/0), backfill share, bucket count, per bucket rate and capacity, per window limit and seconds.
+# A window is a sliding window counter: the count of the previous fixed window is weighted by the part of it that
+# still overlaps the sliding window. Returns the seconds to wait, 0 if the request was counted in all buckets and
+# windows. The window keys are derived from their prefix, so the script expects a single redis instance.
+QUOTA_SCRIPT = """
+local time = redis.call('TIME')
+local now = tonumber(time[1]) + tonumber(time[2]) / 1000000
+local live = ARGV[1] == '1'
+local share = live and 1 or tonumber(ARGV[2])
+local bucket_count = tonumber(ARGV[3])
+
+if not live then
+    local waiting = redis.call('PTTL', KEYS[1])
+    if waiting > 0 then
+        return tostring(waiting / 1000)
+    end
+end
+
+local wait = 0
+local buckets = {}
+for i = 1, bucket_count do
+    local rate = tonumber(ARGV[2 + i * 2])
+    local capacity = tonumber(ARGV[3 + i * 2])
+    local bucket = redis.call('HMGET', KEYS[1 + i], 'tokens', 'updated')
+    local tokens = tonumber(bucket[1]) or capacity
+    local updated = tonumber(bucket[2]) or now
+    tokens = math.min(capacity, tokens + math.max(0, now - updated) * rate)
+    if tokens < 1 then
+        wait = math.max(wait, (1 - tokens) / rate)
+    end
+    buckets[i] = tokens
+end
+
+local windows = {}
+for i = 1, #KEYS - 1 - bucket_count do
+    local prefix = KEYS[1 + bucket_count + i]
+    local limit = tonumber(ARGV[2 + bucket_count * 2 + i * 2]) * share
+    local seconds = tonumber(ARGV[3 + bucket_count * 2 + i * 2])
+    local index = math.floor(now / seconds)
+    local current_key = prefix .. ':' .. index
+    local current = tonumber(redis.call('GET', current_key)) or 0
+    local previous = tonumber(redis.call('GET', prefix .. ':' .. (index - 1))) or 0
+    local elapsed = (now - index * seconds) / seconds
+    if current + 1 > limit then
+        wait = math.max(wait, (index + 1) * seconds - now)
+    elseif previous * (1 - elapsed) + current + 1 > limit then
+        local needed = 1 - (limit - current - 1) / previous
+        wait = math.max(wait, (needed - elapsed) * seconds)
+    end
+    windows[#windows + 1] = {current_key, seconds}
+end
+
+if wait > 0 then
+    if live then
+        redis.call('SET', KEYS[1], 1, 'PX', math.ceil(math.max(wait, tonumber(ARGV[#ARGV])) * 1000))
+    end
+    return tostring(wait)
+end
+
+for i = 1, bucket_count do
+    local capacity = tonumber(ARGV[3 + i * 2])
+    local rate = tonumber(ARGV[2 + i * 2])
+    redis.call('HSET', KEYS[1 + i], 'tokens', tostring(buckets[i] - 1), 'updated', tostring(now))
+    redis.call('EXPIRE', KEYS[1 + i], math.ceil(capacity / rate) + 60)
+end
+for _, window in ipairs(windows) do
+    redis.call('INCR', window[1])
+    redis.call('EXPIRE', window[1], window[2] * 2 + 1)
+end
+return '0'
+"""
 
-    r = get_async_redis()
 
-    await r.incr(BIRD_EYE_COUNTER)
+class ApiQuota:
+    """
+    Request budget of an API shared by all processes via redis.
 
-    counter = await r.get(BIRD_EYE_COUNTER)
+    Every request has to fit into the global quota and the quota of its endpoint, each made of an optional token
+    bucket (requests per second and burst) and sliding windows (e.g. per minute and per day). All of them are checked
+    and counted atomically in one Lua script. Backfill requests only use backfill_share of every window and pause
+    while a live request waits, so live trading is not starved by a backfill.
+
+    Args:
+        name: Prefix of the redis keys.
+        global_quota: Limits of all requests.
+        endpoints: Additional limits per endpoint.
+        backfill_share: Part of each window usable by backfill requests.
+        live_waiting: Seconds backfill requests pause after a live request had to wait.
+        redis_factory: Returns the redis client of the running loop.
+    """
+
+    def __init__(self, name: str, global_quota: EndpointQuota, endpoints: Optional[Dict[str, EndpointQuota]] = None,
+                 backfill_share: float = BACKFILL_SHARE, live_waiting: float = LIVE_WAITING_SECONDS,
+                 redis_factory: Callable[[], redis.asyncio.Redis] = get_shared_async_redis):
+        self.name = name
+        self.global_quota = global_quota
+        self.endpoints = endpoints if endpoints is not None else dict()
+        self.backfill_share = backfill_share
+        self.live_waiting = live_waiting
+        self.redis_factory = redis_factory
+
+    def get_script_args(self, endpoint: str, priority: Priority) -> List:
+        quotas = [("global", self.global_quota)]
+        if endpoint in self.endpoints:
+            quotas.append((endpoint, self.endpoints[endpoint]))
+
+        bucket_keys, bucket_args, window_keys, window_args = list(), list(), list(), list()
+        for quota_name, quota in quotas:
+            if quota.rate is not None:
+                bucket_keys.append(f"{self.name}:{quota_name}:bucket")
+                bucket_args.extend([quota.rate, quota.rate if quota.capacity is None else quota.capacity])
+            for window in quota.windows:
+                window_keys.append(f"{self.name}:{quota_name}:{window.name}")
+                window_args.extend([window.limit, window.seconds])
+
+        keys = [f"{self.name}:live_waiting"] + bucket_keys + window_keys
+        args = [1 if priority == Priority.LIVE else 0, self.backfill_share, len(bucket_keys)] + bucket_args + \
+            window_args + [self.live_waiting]
+        return [len(keys)] + keys + args
+
+    async def try_acquire(self, endpoint: str, priority: Priority = Priority.BACKFILL) -> float:
+        """Counts the request if the quota allows it, otherwise returns the seconds to wait."""
+        wait = await self.redis_factory().eval(QUOTA_SCRIPT, *self.get_script_args(endpoint, priority))
+        return float(wait)
+
+    async def acquire(self, endpoint: str, priority: Priority = Priority.BACKFILL,
+                      timeout: Optional[float] = None) -> bool:
+        """
+        Waits until the request fits into the quota.
+
+        Args:
+            endpoint: Endpoint of the request.
+            priority: Live requests win over backfill requests.
+            timeout: Maximum seconds to wait, unlimited if None.
+
+        Returns:
+            bool: True if the request was counted, False if the timeout passed first. If redis is not reachable the
+            request is allowed.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            try:
+                wait = await self.try_acquire(endpoint, priority)
+            except Exception as e:
+                logger.exception("Failed to check api quota, allow request", extra={"endpoint": endpoint})
+                return True
+
+            if wait <= 0:
+                return True
+
+            if deadline is not None and time.monotonic() + wait > deadline:
+                logger.warning("Api quota exhausted", extra={"endpoint": endpoint, "priority": priority.value,
+                                                             "wait": wait})
+                return False
+
+            await asyncio.sleep(min(wait, MAX_QUOTA_WAIT_SECONDS))
+
+    def limiter(self, endpoint: str, priority: Priority = Priority.BACKFILL) -> "QuotaLimiter":
+        return QuotaLimiter(self, endpoint, priority)
+
+
+class QuotaLimiter:
+    """Rate limiter interface (await acquire()) of one endpoint and priority of a quota."""
+
+    def __init__(self, quota: ApiQuota, endpoint: str, priority: Priority):
+        self.quota = quota
+        self.endpoint = endpoint
+        self.priority = priority
+
+    async def acquire(self):
+        await self.quota.acquire(self.endpoint, self.priority)
+
+
+birdeye_quota = ApiQuota(BIRDEYE_QUOTA,
+                         EndpointQuota(rate=BIRDEYE_REQUESTS_PER_SECOND,
+                                       windows=[WindowLimit("minute", BIRDEYE_REQUESTS_PER_MINUTE, 60),
+                                                WindowLimit("day", BIRDEYE_REQUESTS_PER_DAY, 24 * 60 * 60)]),
+                         {TRADER_TRADES_ENDPOINT: EndpointQuota(rate=BIRDEYE_TRADER_TRADES_PER_SECOND)})
+
+
+async def check_api_limit(check_limit: bool, endpoint: str = "", priority: Priority = Priority.BACKFILL,
+                          timeout: Optional[float] = None) -> bool:
+    """
+    Waits for the Birdeye quota, live requests wait at most LIVE_ACQUIRE_TIMEOUT_SECONDS by default.
+
+    Returns:
+        bool: False if the quota was not available in time, the request should not be sent.
+    """
+    if not check_limit:
+        return True
 
-    if counter is None:
-        counter = 1
+    if timeout is None and priority == Priority.LIVE:
+        timeout = LIVE_ACQUIRE_TIMEOUT_SECONDS
 
-    if int(counter) >= 50000:
-        logger.error("Brideye limit reached!!!")
-        raise Exception("Brideye limit reached!!!")
+    return await birdeye_quota.acquire(endpoint, priority, timeout)
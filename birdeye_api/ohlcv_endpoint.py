@@ -1,17 +1,33 @@
+import asyncio
 import logging
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Optional, List, Dict, Tuple
 
-import aiohttp
+import numpy as np
 import pandas as pd
 
-from birdeye_api.api_limit import check_api_limit
+from birdeye_api.api_limit import check_api_limit, Priority, OHLCV_ENDPOINT, ApiLimitError
 from constants import BIRDEYE_KEY, TRADING_MINUTE_COLUMN, TOKEN_COLUMN, TOTAL_VOLUME_COLUMN, \
     PRICE_COLUMN
+from data.candle_store import CandleStore, CANDLE_DTYPE, CANDLE_SECONDS, deduplicate_candles, candles_to_dataframe
 from env_data.get_env_value import get_env_value
+from solana_api.http_client import get_http_session
 
 logger = logging.getLogger(__name__)
 
+OHLCV_MAX_CANDLES = 1000
+OHLCV_FETCH_CONCURRENCY = 8
+
+_candle_store: Optional[CandleStore] = None
+
+
+def get_candle_store() -> CandleStore:
+    global _candle_store
+    if _candle_store is None:
+        _candle_store = CandleStore()
+
+    return _candle_store
+
 
 def ohlcv_to_dataframe(result: dict) -> pd.DataFrame:
     items = result.get("data", {}).get("items", [])
@@ -41,7 +57,10 @@ async def get_time_frame_ohlcv(token: str, trading_minute: datetime, window: int
         start = trading_minute - timedelta(minutes=window - 1)
         end = trading_minute
 
-        data = await get_ohlcv(token, start, end, interval)
+        if interval == "1m":
+            return await get_candles(token, start, end, Priority.LIVE)
+
+        data = await get_ohlcv(token, start, end, interval, priority=Priority.LIVE)
 
         return ohlcv_to_dataframe(data)
     except Exception as e:
@@ -49,8 +68,77 @@ async def get_time_frame_ohlcv(token: str, trading_minute: datetime, window: int
         return None
 
 
+def ohlcv_to_candles(result: dict) -> np.ndarray:
+    items = result.get("data", {}).get("items", [])
+    candles = np.empty(len(items), dtype=CANDLE_DTYPE)
+    for index, item in enumerate(items):
+        candles[index] = (item["unixTime"], item["c"], item["v"])
+
+    return candles
+
+
+async def get_candles(token: str, start_date: datetime, end_date: datetime,
+                      priority: Priority = Priority.BACKFILL, store: Optional[CandleStore] = None) -> pd.DataFrame:
+    """
+    Returns the 1m candles of a token from start_date to end_date (both included).
+
+    Only the minutes missing in the candle store are requested from Birdeye, in chunks of OHLCV_MAX_CANDLES, and
+    stored for the next call. The store is used from a worker thread, its file lock and reads never block the loop.
+
+    Args:
+        token (str): The token address.
+        start_date (datetime): First minute (UTC).
+        end_date (datetime): Last minute (UTC).
+        priority (Priority): Priority of the Birdeye requests.
+        store (CandleStore): Candle store, the shared one below CACHE_FOLDER by default.
+
+    Returns:
+        pd.DataFrame: token, trading minute, total volume and price sorted by time.
+    """
+    store = store if store is not None else get_candle_store()
+    start = int(start_date.timestamp())
+    end = int(end_date.timestamp()) + CANDLE_SECONDS
+    unsettled = list()
+    missing_ranges = await asyncio.to_thread(store.missing_ranges, token, start, end)
+    for range_start, range_end in missing_ranges:
+        for chunk_start in range(range_start, range_end, OHLCV_MAX_CANDLES * CANDLE_SECONDS):
+            chunk_end = min(range_end, chunk_start + OHLCV_MAX_CANDLES * CANDLE_SECONDS)
+            data = await get_ohlcv(token, datetime.fromtimestamp(chunk_start), datetime.fromtimestamp(chunk_end - 1),
+                                   "1m", priority=priority)
+            candles = ohlcv_to_candles(data)
+            await asyncio.to_thread(store.append, token, candles, chunk_start, chunk_end)
+            unsettled.append(candles[(candles["timestamp"] >= start) & (candles["timestamp"] < end)])
+
+    stored = await asyncio.to_thread(store.read, token, start, end)
+    candles = deduplicate_candles(np.concatenate([stored] + unsettled))
+    return candles_to_dataframe(token, candles)
+
+
+async def get_candles_for_tokens(token_ranges: Dict[str, Tuple[datetime, datetime]],
+                                 priority: Priority = Priority.BACKFILL, store: Optional[CandleStore] = None,
+                                 concurrency: int = OHLCV_FETCH_CONCURRENCY) -> List[pd.DataFrame]:
+    """
+    Loads the candles of many tokens concurrently, see get_candles.
+
+    Tokens that fail are logged and left out, their missing candles are requested again by the next call.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def load(token: str, start_date: datetime, end_date: datetime) -> Optional[pd.DataFrame]:
+        async with semaphore:
+            try:
+                return await get_candles(token, start_date, end_date, priority, store)
+            except Exception as e:
+                logger.exception("Failed to load candles", extra={"token": token})
+                return None
+
+    candles = await asyncio.gather(*[load(token, start_date, end_date)
+                                     for token, (start_date, end_date) in token_ranges.items()])
+    return [token_candles for token_candles in candles if token_candles is not None]
+
+
 async def get_ohlcv(token: str, start_date: datetime, end_date: datetime, interval: str,
-                    api_limit: bool = True) -> pd.DataFrame:
+                    api_limit: bool = True, priority: Priority = Priority.BACKFILL) -> pd.DataFrame:
     """
        Fetches OHLCV (Open, High, Low, Close, Volume) data for a specific token within a given time range
        from the BirdEye API.
@@ -60,20 +148,19 @@ async def get_ohlcv(token: str, start_date: datetime, end_date: datetime, interv
            start_date (datetime): The start date and time of the requested data range (UTC).
            end_date (datetime): The end date and time of the requested data range (UTC).
            interval (str): The interval type for the data (e.g., '1m', '5m', '1h', '1d').
-           api_limit (bool): Checks if birdeye limit is reached or not.
+           api_limit (bool): Waits for the Birdeye quota before the request.
+           priority (Priority): Live requests are served before backfill requests.
 
        Returns:
            dict: The JSON response from the BirdEye API containing OHLCV data.
 
        Raises:
-           Exception: If the BirdEye API request limit (50,000) is reached.
+           ApiLimitError: If the Birdeye quota was not available in time.
            aiohttp.ClientResponseError: If the API response has a non-2xx status code.
 
        Notes:
            - The BirdEye API provides OHLCV data for tokens on the Solana blockchain.
-           - This function increments an API call counter in Redis (BIRD_EYE_COUNTER) and logs an error
-             if the daily limit is exceeded.
-           - Ensure that the Redis counter is initialized and properly configured before using this function.
+           - The request is counted in the Redis backed Birdeye quota (see birdeye_api.api_limit).
        """
 
     url = "https://public-api.birdeye.so/defi/ohlcv"
@@ -91,9 +178,9 @@ async def get_ohlcv(token: str, start_date: datetime, end_date: datetime, interv
         "time_to": int(end_date.timestamp())
     }
 
-    await check_api_limit(api_limit)
+    if not await check_api_limit(api_limit, OHLCV_ENDPOINT, priority):
+        raise ApiLimitError(f"Birdeye quota not available for {OHLCV_ENDPOINT}")
 
-    async with aiohttp.ClientSession() as session:
-        async with session.get(url, headers=headers, params=params) as response:
-            response.raise_for_status()
-            return await response.json()
+    async with get_http_session().get(url, headers=headers, params=params) as response:
+        response.raise_for_status()
+        return await response.json()
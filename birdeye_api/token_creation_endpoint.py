@@ -1,12 +1,11 @@
 from datetime import datetime
 from typing import Tuple
 
-import aiohttp
-
-from birdeye_api.api_limit import check_api_limit
+from birdeye_api.api_limit import check_api_limit, TOKEN_CREATION_ENDPOINT, ApiLimitError
 from constants import BIRDEYE_KEY
 from data.redis_helper import get_async_redis
 from env_data.get_env_value import get_env_value
+from solana_api.http_client import get_http_session
 from solana_api.solana_data import block_time_stamp_to_datetime
 
 
@@ -24,11 +23,11 @@ async def get_token_create_info_bird_eye(token: str, api_limit: bool = False) ->
         "address": token
     }
 
-    await check_api_limit(api_limit)
+    if not await check_api_limit(api_limit, TOKEN_CREATION_ENDPOINT):
+        raise ApiLimitError(f"Birdeye quota not available for {TOKEN_CREATION_ENDPOINT}")
 
-    async with aiohttp.ClientSession() as session:
-        async with session.get(url, headers=headers, params=params) as response:
-            response.raise_for_status()  # Raises error if status is 4xx or 5xx
-            result = await response.json()
-            timestamp = result["data"]["blockUnixTime"]
-            return block_time_stamp_to_datetime(timestamp), result["data"]["owner"]
+    async with get_http_session().get(url, headers=headers, params=params) as response:
+        response.raise_for_status()  # Raises error if status is 4xx or 5xx
+        result = await response.json()
+        timestamp = result["data"]["blockUnixTime"]
+        return block_time_stamp_to_datetime(timestamp), result["data"]["owner"]
@@ -0,0 +1,267 @@
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import random
+import time
+from datetime import datetime
+from typing import Dict, List, Optional, Set
+
+import aiohttp
+
+from birdeye_api.api_limit import birdeye_quota, TRADER_TRADES_ENDPOINT, Priority
+from constants import BIRDEYE_KEY, CACHE_FOLDER
+from env_data.get_env_value import get_env_value
+from solana_api.http_client import get_http_session
+
+logger = logging.getLogger(__name__)
+
+BIRDEYE_URL = "https://public-api.birdeye.so"
+TRADER_TRADES_PATH = "/trader/txs/seek_by_time"
+BACKFILL_CONCURRENCY = 8
+PAGE_LIMIT = 100
+MAX_TRADES_PER_TRADER = 25000
+MAX_PAGES_PER_TRADER = 750
+MAX_RETRIES = 5
+RETRY_BASE_DELAY_SECONDS = 1
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+PROGRESS_LOG_INTERVAL_SECONDS = 30
+
+
+class InvalidResponseError(Exception):
+    pass
+
+
+def get_trade_key(trade: dict) -> str:
+    return hashlib.sha1(json.dumps(trade, sort_keys=True).encode()).hexdigest()
+
+
+class BackfillCheckpointStore:
+    """
+    Per trader progress of a backfill, stored as files so an interrupted run continues where it stopped.
+
+    <trader>.jsonl holds the fetched trades, <trader>.checkpoint.json the last block_unix_time, the keys of the trades
+    with that time and whether the trader is done.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def trades_path(self, trader: str) -> str:
+        return os.path.join(self.directory, f"{trader}.jsonl")
+
+    def checkpoint_path(self, trader: str) -> str:
+        return os.path.join(self.directory, f"{trader}.checkpoint.json")
+
+    def load(self, trader: str) -> Optional[dict]:
+        try:
+            with open(self.checkpoint_path(trader)) as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+
+    def save(self, trader: str, checkpoint: dict):
+        path = self.checkpoint_path(trader)
+        with open(path + ".tmp", "w") as f:
+            json.dump(checkpoint, f)
+        os.replace(path + ".tmp", path)
+
+    def append(self, trader: str, trades: List[dict], checkpoint: dict):
+        # trades first, a crash in between only repeats trades that are skipped by their key on resume
+        with open(self.trades_path(trader), "a") as f:
+            for trade in trades:
+                f.write(json.dumps(trade) + "\n")
+        self.save(trader, checkpoint)
+
+    def read_trades(self, trader: str) -> List[dict]:
+        trades = list()
+        keys = set()
+        try:
+            with open(self.trades_path(trader)) as f:
+                for line in f:
+                    trade = json.loads(line)
+                    key = get_trade_key(trade)
+                    if key not in keys:
+                        keys.add(key)
+                        trades.append(trade)
+        except FileNotFoundError:
+            pass
+
+        return trades
+
+    def clear(self, trader: str):
+        for path in [self.trades_path(trader), self.checkpoint_path(trader)]:
+            if os.path.exists(path):
+                os.remove(path)
+
+
+class BackfillStats:
+
+    def __init__(self, traders: int):
+        self.traders = traders
+        self.done = 0
+        self.failed = 0
+        self.skipped = 0
+        self.pages = 0
+        self.trades = 0
+        self.retries = 0
+        self.started = time.perf_counter()
+        self.last_log = time.monotonic()
+
+    def summary(self) -> Dict[str, float]:
+        elapsed = time.perf_counter() - self.started
+        return {"traders": self.traders, "done": self.done, "failed": self.failed, "skipped": self.skipped,
+                "pages": self.pages, "trades": self.trades, "retries": self.retries, "elapsed_s": elapsed,
+                "pages_per_s": self.pages / elapsed if elapsed > 0 else 0.0,
+                "trades_per_s": self.trades / elapsed if elapsed > 0 else 0.0}
+
+    def log_if_due(self):
+        if time.monotonic() - self.last_log >= PROGRESS_LOG_INTERVAL_SECONDS:
+            self.log()
+
+    def log(self):
+        self.last_log = time.monotonic()
+        summary = self.summary()
+        logger.info(f"Trade backfill {summary['done'] + summary['failed'] + summary['skipped']} of "
+                    f"{summary['traders']} traders", extra={"backfill": summary})
+
+
+class TradeBackfill:
+    """
+    Loads the Birdeye swaps of many traders concurrently.
+
+    Up to concurrency traders are fetched at the same time, every request takes a token of the shared rate limiter,
+    by default the backfill share of the Birdeye quota.
+    Pages are requested by time (after_time = last block_unix_time) and already stored trades are skipped by their
+    key, so a trader can be resumed from its checkpoint. Rate limits, server errors and invalid responses are retried
+    with exponential backoff and jitter.
+    """
+
+    def __init__(self, start_date: datetime, end_date: datetime, store: BackfillCheckpointStore, rate_limiter=None,
+                 concurrency: int = BACKFILL_CONCURRENCY, base_url: str = BIRDEYE_URL,
+                 max_retries: int = MAX_RETRIES, retry_base_delay: float = RETRY_BASE_DELAY_SECONDS,
+                 max_trades: int = MAX_TRADES_PER_TRADER, max_pages: int = MAX_PAGES_PER_TRADER,
+                 seed: Optional[int] = None):
+        self.start_time = int(start_date.timestamp())
+        self.end_time = int(end_date.timestamp())
+        self.store = store
+        self.rate_limiter = rate_limiter if rate_limiter is not None else \
+            birdeye_quota.limiter(TRADER_TRADES_ENDPOINT, Priority.BACKFILL)
+        self.concurrency = concurrency
+        self.url = base_url + TRADER_TRADES_PATH
+        self.max_retries = max_retries
+        self.retry_base_delay = retry_base_delay
+        self.max_trades = max_trades
+        self.max_pages = max_pages
+        self.random = random.Random(seed)
+        self.stats = BackfillStats(0)
+
+    async def fetch_page(self, trader: str, after_time: int, offset: int) -> dict:
+        headers = {"accept": "application/json", "x-chain": "solana", "X-API-KEY": get_env_value(BIRDEYE_KEY)}
+        params = {"address": trader, "after_time": after_time, "offset": offset, "limit": PAGE_LIMIT,
+                  "tx_type": "swap"}
+        attempt = 0
+        while True:
+            await self.rate_limiter.acquire()
+            try:
+                async with get_http_session().get(self.url, headers=headers, params=params) as response:
+                    response.raise_for_status()
+                    data = await response.json()
+                    if data.get("data") is None or data["data"].get("items") is None:
+                        raise InvalidResponseError(json.dumps(data)[:200])
+                    self.stats.pages += 1
+                    return data["data"]
+            except (aiohttp.ClientError, asyncio.TimeoutError, InvalidResponseError) as e:
+                retry = not isinstance(e, aiohttp.ClientResponseError) or e.status in RETRY_STATUS_CODES
+                if not retry or attempt >= self.max_retries:
+                    raise
+
+                delay = self.retry_base_delay * 2 ** attempt * self.random.uniform(0.5, 1.5)
+                logger.warning("Birdeye request failed, retry", extra={"trader": trader, "attempt": attempt,
+                                                                       "error": str(e), "delay": delay})
+                self.stats.retries += 1
+                attempt += 1
+                await asyncio.sleep(delay)
+
+    async def backfill_trader(self, trader: str):
+        checkpoint = self.store.load(trader) or {"after_time": self.start_time, "keys": [], "count": 0,
+                                                 "done": False, "skipped": False}
+        if checkpoint["done"]:
+            return
+
+        after_time = checkpoint["after_time"]
+        boundary_keys: Set[str] = set(checkpoint["keys"])
+        offset = 0
+        for _ in range(self.max_pages):
+            # after_time is exclusive, request the last second again and skip the trades stored already
+            page = await self.fetch_page(trader, max(self.start_time, after_time - 1), offset)
+            items = page["items"]
+            finished = len(items) < PAGE_LIMIT or not page.get("hasNext", page.get("has_next", True))
+            new_trades = list()
+            for trade in items:
+                if trade["block_unix_time"] >= self.end_time:
+                    finished = True
+                    break
+                key = get_trade_key(trade)
+                if trade["block_unix_time"] < after_time or key in boundary_keys:
+                    continue
+                if trade["block_unix_time"] > after_time:
+                    after_time = trade["block_unix_time"]
+                    boundary_keys = set()
+                boundary_keys.add(key)
+                new_trades.append(trade)
+
+            # a full page within one second gives no progress by time, continue with the offset
+            offset = offset + PAGE_LIMIT if len(new_trades) == 0 and not finished else 0
+            checkpoint = {"after_time": after_time, "keys": sorted(boundary_keys),
+                          "count": checkpoint["count"] + len(new_trades), "done": finished, "skipped": False}
+            if checkpoint["count"] > self.max_trades:
+                logger.error("Trader reached max trades and will be skipped", extra={"trader": trader})
+                self.store.clear(trader)
+                self.store.save(trader, {**checkpoint, "done": True, "skipped": True})
+                return
+
+            self.store.append(trader, new_trades, checkpoint)
+            self.stats.trades += len(new_trades)
+            if finished:
+                return
+
+        logger.error("Trader reached max pages and will be skipped", extra={"trader": trader})
+        self.store.clear(trader)
+        self.store.save(trader, {**checkpoint, "done": True, "skipped": True})
+
+    async def run_trader(self, semaphore: asyncio.Semaphore, trader: str):
+        async with semaphore:
+            try:
+                await self.backfill_trader(trader)
+                checkpoint = self.store.load(trader)
+                if checkpoint is not None and checkpoint["skipped"]:
+                    self.stats.skipped += 1
+                else:
+                    self.stats.done += 1
+            except Exception as e:
+                self.stats.failed += 1
+                logger.exception("Failed to backfill trader, resume with the next run", extra={"trader": trader})
+
+            self.stats.log_if_due()
+
+    async def run(self, traders: List[str]) -> List[dict]:
+        """Backfills all traders and returns the trades of the completed ones in trader order."""
+        self.stats = BackfillStats(len(traders))
+        semaphore = asyncio.Semaphore(self.concurrency)
+        await asyncio.gather(*[self.run_trader(semaphore, trader) for trader in traders])
+        self.stats.log()
+
+        trades = list()
+        for trader in traders:
+            checkpoint = self.store.load(trader)
+            if checkpoint is not None and checkpoint["done"] and not checkpoint["skipped"]:
+                trades.extend(self.store.read_trades(trader))
+
+        return trades
+
+
+def get_backfill_directory(start_date: datetime, end_date: datetime) -> str:
+    return os.path.join(CACHE_FOLDER, "trade_backfill", f"{int(start_date.timestamp())}_{int(end_date.timestamp())}")
@@ -4,15 +4,17 @@ from asyncio import sleep
 from datetime import datetime
 from typing import List, Dict, Tuple, Optional
 
-import aiohttp
 import pandas as pd
 
-from birdeye_api.api_limit import check_api_limit
-from blockchain_token.token_creation import check_token_create_info_date_range, get_token_create_info
+from birdeye_api.api_limit import check_api_limit, TRADER_TRADES_ENDPOINT, ApiLimitError
+from birdeye_api.trade_backfill import TradeBackfill, BackfillCheckpointStore, get_backfill_directory
+from blockchain_token.token_creation import check_token_create_info_date_range, load_token_create_info
 from cache_helper import get_cache_file_data, write_data_to_cache
-from constants import BIRDEYE_KEY, TOP_TRADER_TRADES_BIRDEYE, LAUNCH_DATE_COLUMN, TOKEN_COLUMN
-from database.token_creation_info_table import select_token_creation_info_for_list
+from constants import BIRDEYE_KEY, TOP_TRADER_TRADES_BIRDEYE, LAUNCH_DATE_COLUMN, TOKEN_COLUMN, \
+    BULK_INSERT_BATCH_SIZE
+from database.token_creation_info_table import select_token_creation_info_for_list, insert_token_creation_infos
 from env_data.get_env_value import get_env_value
+from solana_api.http_client import get_http_session
 from solana_api.jupiter_api import SOL_MINT
 
 logger = logging.getLogger(__name__)
@@ -37,13 +39,18 @@ def extract_trade_data(trade: dict) -> Optional[dict]:
     return extracted_data
 
 
-async def get_all_trader_trades(traders: List[str], start_date: datetime, end_date: datetime,
-                                api_limit: bool = False):
-    trader_trades = list()
-    for index, trader in enumerate(traders):
-        logger.info(f"Getting trades for {index + 1} of {len(traders)}")
-        trades = await get_trader_trades(trader, start_date, end_date, api_limit)
-        trader_trades.extend(trades)
+async def get_all_trader_trades(traders: List[str], start_date: datetime, end_date: datetime):
+    """
+    Loads the trades of all traders concurrently under the backfill share of the Birdeye quota, so live requests are
+    served first.
+
+    Progress is checkpointed per trader below CACHE_FOLDER, a failed or interrupted run continues with the next call.
+    Traders that still fail are missing in the result and logged.
+    """
+    store = BackfillCheckpointStore(get_backfill_directory(start_date, end_date))
+    backfill = TradeBackfill(start_date, end_date, store)
+    trader_trades = await backfill.run(traders)
+    logger.info("Fetched trader trades", extra={"backfill": backfill.stats.summary()})
 
     return trader_trades
 
@@ -57,8 +64,7 @@ def get_structured_trade_list(trades: List[dict]) -> List[dict]:
 
 
 async def get_top_trader_trades_from_birdeye(traders: List[str], start_date: datetime, end_date: datetime,
-                                             use_cache: bool = True,
-                                             api_limit: bool = False) -> pd.DataFrame:
+                                             use_cache: bool = True) -> pd.DataFrame:
     logger.info("Starting to fetch top trader trades from Birdeye API")
     if use_cache:
         result_data = get_cache_file_data(TOP_TRADER_TRADES_BIRDEYE)
@@ -73,8 +79,8 @@ async def get_top_trader_trades_from_birdeye(traders: List[str], start_date: dat
         trader_trades = get_cache_file_data(cache_key)
 
     if not use_cache or trader_trades is None:
-        trader_trades = await get_all_trader_trades(traders, start_date, end_date, api_limit)
-        write_data_to_cache(cache_key, trader_trades)
+        trader_trades = await get_all_trader_trades(traders, start_date, end_date)
+        write_data_to_cache(cache_key, trader_trades, source="birdeye")
 
     logger.info(f"Fetched {len(trader_trades)} trades from all traders.")
 
@@ -107,7 +113,7 @@ async def get_top_trader_trades_from_birdeye(traders: List[str], start_date: dat
     dataset = pd.DataFrame(enriched_trades)
     logger.info(f"Created dataset with {len(dataset)} rows.")
 
-    write_data_to_cache(TOP_TRADER_TRADES_BIRDEYE, dataset)
+    write_data_to_cache(TOP_TRADER_TRADES_BIRDEYE, dataset, source="birdeye")
 
     # Step 7: Return the dataset
     return dataset
@@ -141,6 +147,7 @@ def get_tokens(trades: List[dict]) -> List[str]:
 async def get_relevant_tokens(tokens: List[str], start_date: datetime, end_date: datetime) -> List[dict]:
     relevant_tokens = []
     saved_token_info = select_token_creation_info_for_list(tokens)
+    new_token_info = list()
 
     for index, token in enumerate(tokens):
         logger.info(f"Check if token is relevant {index + 1} of {len(tokens)}")
@@ -148,13 +155,23 @@ async def get_relevant_tokens(tokens: List[str], start_date: datetime, end_date:
         if saved_token_info is not None and token in saved_token_info:
             create_info = saved_token_info[token]
         else:
-            create_info = await get_token_create_info(token)
+            create_info = await load_token_create_info(token)
+            if create_info is None:
+                create_info = None, None
+            else:
+                token_create_time, owner = create_info
+                new_token_info.append((token, owner, token_create_time))
+
+        if len(new_token_info) >= BULK_INSERT_BATCH_SIZE:
+            insert_token_creation_infos(new_token_info)
+            new_token_info = list()
 
         result, launch_date = await check_token_create_info_date_range(token, start_date, end_date, create_info)
 
         if result:
             relevant_tokens.append({TOKEN_COLUMN: token, LAUNCH_DATE_COLUMN: launch_date})
 
+    insert_token_creation_infos(new_token_info)
     return relevant_tokens
 
 
@@ -181,20 +198,18 @@ async def get_trader_trades(trader: str, start_date: datetime, end_date: datetim
         trader (str): The address of the trader.
         start_date (datetime): The start date and time of the requested trade range (UTC).
         end_date (datetime): The end date and time of the requested trade range (UTC).
-        api_limit (bool): Checks if BirdEye API limit is reached or not.
+        api_limit (bool): Waits for the Birdeye quota before every request.
         max_trades (int): Maximum number of trades to return.
     Returns:
         List[Dict]: A list of all trades for the specified trader within the given time frame.
 
     Raises:
-        Exception: If the BirdEye API request limit (50,000) is reached.
+        ApiLimitError: If the Birdeye quota was not available.
         aiohttp.ClientResponseError: If the API response has a non-2xx status code.
 
     Notes:
         - The BirdEye API provides trade data for traders on the Solana blockchain.
-        - This function increments an API call counter in Redis (BIRD_EYE_COUNTER) and logs an error
-          if the daily limit is exceeded.
-        - Ensure that the Redis counter is initialized and properly configured before using this function.
+        - Every request is counted in the Redis backed Birdeye quota (see birdeye_api.api_limit).
     """
     url = "https://public-api.birdeye.so/trader/txs/seek_by_time"
 
@@ -229,36 +244,36 @@ async def get_trader_trades(trader: str, start_date: datetime, end_date: datetim
             params["offset"] = offset
             params["after_time"] = all_trades[-1]["block_unix_time"]
 
-        await check_api_limit(api_limit)
-
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url, headers=headers, params=params) as response:
-
-                data = await response.json()
-                success, trades = validate_response(data, trader)
-                if not success:
-                    consecutive_failures += 1
-                    if consecutive_failures > 10:
-                        return []
-                    await sleep(5)
-                    continue
-                else:
-                    consecutive_failures = 0
-
-                finished = False
-                for trade in trades:
-                    after_time = trade["block_unix_time"]
-                    # Stop if we've passed the end_date
-                    if after_time >= int(end_date.timestamp()):
-                        finished = True
-                        break
-                    all_trades.append(trade)
-
-                if data.get("has_next", False) or finished:
+        if not await check_api_limit(api_limit, TRADER_TRADES_ENDPOINT):
+            raise ApiLimitError(f"Birdeye quota not available for {TRADER_TRADES_ENDPOINT}")
+
+        async with get_http_session().get(url, headers=headers, params=params) as response:
+
+            data = await response.json()
+            success, trades = validate_response(data, trader)
+            if not success:
+                consecutive_failures += 1
+                if consecutive_failures > 10:
+                    return []
+                await sleep(5)
+                continue
+            else:
+                consecutive_failures = 0
+
+            finished = False
+            for trade in trades:
+                after_time = trade["block_unix_time"]
+                # Stop if we've passed the end_date
+                if after_time >= int(end_date.timestamp()):
+                    finished = True
                     break
+                all_trades.append(trade)
+
+            if data.get("has_next", False) or finished:
+                break
 
-                offset += limit  # Move to the next page
-                total_offset += offset
-                request_counter += 1
+            offset += limit  # Move to the next page
+            total_offset += offset
+            request_counter += 1
 
     return all_trades
@@ -3,8 +3,8 @@ from datetime import datetime
 from typing import Optional, Tuple
 
 from birdeye_api.token_creation_endpoint import get_token_create_info_bird_eye
+from blockchain_token.token_creation_cache import token_creation_info_cache
 from constants import PUMP_DOT_FUN_AUTHORITY
-from database.token_creation_info_table import select_token_creation_info, insert_token_creation_info
 
 logger = logging.getLogger(__name__)
 
@@ -19,16 +19,10 @@ async def load_token_create_info(token: str) -> Optional[Tuple[datetime, str]]:
 
 
 async def get_token_create_info(token) -> Tuple[Optional[datetime], Optional[str]]:
-    token_create_info = select_token_creation_info(token)
-
+    token_create_info = await token_creation_info_cache.get(token)
     if token_create_info is None:
-        token_create_info = await load_token_create_info(token)
-        if token_create_info is None:
-            logger.info("Failed to load token create info")
-            return None, None
-
-        token_create_time, owner = token_create_info
-        insert_token_creation_info(token, owner, token_create_time)
+        logger.info("Failed to load token create info", extra={"token": token})
+        return None, None
 
     token_create_time, owner = token_create_info
     return token_create_time, owner
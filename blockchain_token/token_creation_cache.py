@@ -0,0 +1,164 @@
+import asyncio
+import json
+import logging
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Callable, Dict, Optional, Tuple
+
+import aiohttp
+import redis.asyncio
+
+from birdeye_api.token_creation_endpoint import get_token_create_info_bird_eye
+from constants import TOKEN_CREATION_INFO
+from data.redis_helper import get_shared_async_redis
+from database.token_creation_info_table import select_token_creation_info_async, insert_token_creation_info_async
+
+logger = logging.getLogger(__name__)
+
+TOKEN_CREATION_CACHE_MAX_SIZE = 10_000
+TOKEN_CREATION_TTL_SECONDS = 7 * 24 * 60 * 60
+# fresh mints are indexed by Birdeye within seconds, a missing token is only cached long enough to absorb a burst
+TOKEN_CREATION_NEGATIVE_TTL_SECONDS = 30
+
+LOCAL_LAYER = "local"
+REDIS_LAYER = "redis"
+POSTGRES_LAYER = "postgres"
+BIRDEYE_LAYER = "birdeye"
+
+TokenCreationInfo = Tuple[datetime, str]
+
+
+def is_transient_error(e: Exception) -> bool:
+    """Rate limits, server and connection errors are not cached, the token could exist."""
+    if isinstance(e, aiohttp.ClientResponseError):
+        return e.status == 429 or e.status >= 500
+
+    return isinstance(e, (aiohttp.ClientConnectionError, asyncio.TimeoutError))
+
+
+def encode_info(info: Optional[TokenCreationInfo]) -> str:
+    if info is None:
+        return json.dumps({})
+
+    token_create_time, owner = info
+    return json.dumps({"time": token_create_time.isoformat(), "owner": owner})
+
+
+def decode_info(value: bytes) -> Optional[TokenCreationInfo]:
+    data = json.loads(value)
+    if len(data) == 0:
+        return None
+
+    return datetime.fromisoformat(data["time"]), data["owner"]
+
+
+class TokenCreationInfoCache:
+    """
+    Layered lookup of token creation infos: process LRU -> redis -> Postgres -> Birdeye.
+
+    Found infos never change and are cached for ttl seconds. Tokens without creation info on Birdeye are cached as
+    missing for negative_ttl seconds, transient Birdeye errors are not cached. Concurrent lookups of the same token
+    share one load (single-flight).
+    """
+
+    def __init__(self, max_size: int = TOKEN_CREATION_CACHE_MAX_SIZE, ttl: int = TOKEN_CREATION_TTL_SECONDS,
+                 negative_ttl: int = TOKEN_CREATION_NEGATIVE_TTL_SECONDS,
+                 redis_factory: Callable[[], redis.asyncio.Redis] = get_shared_async_redis):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.redis_factory = redis_factory
+        self.hits: Dict[str, int] = {LOCAL_LAYER: 0, REDIS_LAYER: 0, POSTGRES_LAYER: 0, BIRDEYE_LAYER: 0}
+        self._local: OrderedDict[str, Tuple[Optional[TokenCreationInfo], float]] = OrderedDict()
+        self._in_flight: Dict[str, asyncio.Task] = dict()
+
+    def get_local(self, token: str) -> Tuple[bool, Optional[TokenCreationInfo]]:
+        entry = self._local.get(token)
+        if entry is None:
+            return False, None
+
+        info, expires_at = entry
+        if expires_at < time.monotonic():
+            del self._local[token]
+            return False, None
+
+        self._local.move_to_end(token)
+        return True, info
+
+    def set_local(self, token: str, info: Optional[TokenCreationInfo]):
+        ttl = self.ttl if info is not None else self.negative_ttl
+        self._local[token] = (info, time.monotonic() + ttl)
+        self._local.move_to_end(token)
+        while len(self._local) > self.max_size:
+            self._local.popitem(last=False)
+
+    async def get_redis(self, token: str) -> Tuple[bool, Optional[TokenCreationInfo]]:
+        try:
+            value = await self.redis_factory().get(f"{TOKEN_CREATION_INFO}:{token}")
+            if value is None:
+                return False, None
+
+            return True, decode_info(value)
+        except Exception as e:
+            logger.exception("Failed to get token creation info from redis", extra={"token": token})
+            return False, None
+
+    async def set_redis(self, token: str, info: Optional[TokenCreationInfo]):
+        try:
+            await self.redis_factory().set(f"{TOKEN_CREATION_INFO}:{token}", encode_info(info),
+                                           ex=self.ttl if info is not None else self.negative_ttl)
+        except Exception as e:
+            logger.exception("Failed to store token creation info in redis", extra={"token": token})
+
+    async def load(self, token: str) -> Optional[TokenCreationInfo]:
+        found, info = await self.get_redis(token)
+        if found:
+            self.hits[REDIS_LAYER] += 1
+            self.set_local(token, info)
+            return info
+
+        info = await select_token_creation_info_async(token)
+        if info is not None:
+            self.hits[POSTGRES_LAYER] += 1
+        else:
+            try:
+                info = await get_token_create_info_bird_eye(token)
+                self.hits[BIRDEYE_LAYER] += 1
+                await insert_token_creation_info_async(token, info[1], info[0])
+            except Exception as e:
+                if is_transient_error(e):
+                    logger.exception("Failed to load token creation info, not cached", extra={"token": token})
+                    return None
+
+                logger.info("No token creation info found, cache as missing", extra={"token": token,
+                                                                                    "error": str(e)})
+
+        self.set_local(token, info)
+        await self.set_redis(token, info)
+        return info
+
+    async def get(self, token: str) -> Optional[TokenCreationInfo]:
+        found, info = self.get_local(token)
+        if found:
+            self.hits[LOCAL_LAYER] += 1
+            return info
+
+        task = self._in_flight.get(token)
+        if task is None or task.get_loop() is not asyncio.get_running_loop():
+            task = asyncio.create_task(self.load(token))
+            self._in_flight[token] = task
+            task.add_done_callback(lambda done: self.remove_in_flight(token, done))
+
+        return await asyncio.shield(task)
+
+    def remove_in_flight(self, token: str, task: asyncio.Task):
+        if self._in_flight.get(token) is task:
+            del self._in_flight[token]
+
+    def clear(self):
+        self._local.clear()
+        self._in_flight.clear()
+
+
+token_creation_info_cache = TokenCreationInfoCache()
@@ -1,99 +1,101 @@
 import asyncio
-import json
 import logging
-import os.path
-from asyncio import sleep
-from typing import List
+from functools import partial
+from typing import Dict, Optional
 
-import websockets
 from dotenv import load_dotenv
 from rq import Queue
 
-from bot.event_worker import handle_user_event
-from constants import SOLANA_WS, EVENT_QUEUE, SUBSCRIPTION_MAP, ROOT_DIR
-from data.redis_helper import get_sync_redis, get_async_redis
-from database.raw_sql import run_sql_file
-from env_data.get_env_value import get_env_value
-from ml_model.hist_gradient_model_builder import HistGradientBoostModelBuilder
+from bot.event_pipeline import EventPipeline, DEFAULT_EVENT_CONSUMERS
+from bot.event_worker import handle_user_event, process_user_event
+from bot.subscription_cache import store_subscription_map
+from bot.subscription_manager import SubscriptionManager, DEFAULT_SUBSCRIPTION_CONNECTIONS, \
+    DEFAULT_SUBSCRIPTION_RATE
+from constants import SOLANA_WS, EVENT_QUEUE, SUBSCRIPTION_MAP, SUBSCRIPTION_MODE, ACCOUNT_SUBSCRIPTION_MODE, \
+    LOGS_SUBSCRIPTION_MODE, TRANSACTION_SUBSCRIPTION_MODE, EVENT_PIPELINE_MODE, EVENT_PIPELINE_CONSUMERS, TOKEN_QUEUE, \
+    SUBSCRIPTION_CONNECTIONS, SUBSCRIPTION_RATE
+from data.redis_helper import get_sync_redis, get_async_redis, close_shared_async_redis
+from database.raw_sql import setup_database
+from env_data.get_env_value import get_env_value, get_env_bool_value
+from ml_model.model_registry import get_model
+from solana_api.http_client import close_http_session
+from solana_api.rpc_client import close_solana_clients, rpc_latency_stats
 from structure_log.logger_setup import setup_logger
 
-subscription_map = {}
-
 setup_logger("bot_main")
 logger = logging.getLogger(__name__)
 
 
-# Function to handle WebSocket messages
-async def on_message(websocket):
-    queue = Queue(EVENT_QUEUE, connection=get_sync_redis())
-    r = get_async_redis()
+def create_event_pipeline() -> EventPipeline:
+    """In-process event handling, RQ stays the fallback for messages that do not fit into the queue."""
+    connection = get_sync_redis()
+    event_queue = Queue(EVENT_QUEUE, connection=connection)
+    token_queue = Queue(TOKEN_QUEUE, connection=connection, default_timeout=19000)
+    consumers = get_env_value(EVENT_PIPELINE_CONSUMERS)
+
+    return EventPipeline(partial(process_user_event, r=get_async_redis(), queue=token_queue),
+                         consumers=DEFAULT_EVENT_CONSUMERS if consumers is None else int(consumers),
+                         fallback=partial(event_queue.enqueue, handle_user_event))
+
 
-    while True:
-        try:
-            message = await websocket.recv()
-            if not await r.exists(SUBSCRIPTION_MAP):
-                await r.set(SUBSCRIPTION_MAP, json.dumps(subscription_map))
-
-            queue.enqueue(handle_user_event, message)
-        except Exception as e:
-            logger.exception("Failed to process message")
-            break
-
-
-# Function to subscribe to account changes via WebSocket
-async def subscribe_to_accounts(websocket, traders: List[str]):
-    for address in traders:
-        await sleep(0.2)
-        subscription_message = {
-            "jsonrpc": "2.0",
-            "method": "accountSubscribe",
-            "params": [address, {"encoding": "jsonParsed", "commitment": "finalized"}],
-            "id": 1
-        }
-        await websocket.send(json.dumps(subscription_message))
-        while True:
-            response = await websocket.recv()
-            response_data = json.loads(response)
-            if "result" in response_data:
-                subscription_id = response_data["result"]
-                subscription_map[subscription_id] = address
-                logger.info("Subscription mapped", extra={"subscription_id": subscription_id, "address": address})
-                break
-            else:
-                logger.info(f"Subscription unexpected result {json.dumps(response_data)}",
-                            extra={"address": address, "result": response_data})
+def get_subscription_mode() -> str:
+    mode = get_env_value(SUBSCRIPTION_MODE)
+    return mode if mode in (LOGS_SUBSCRIPTION_MODE, TRANSACTION_SUBSCRIPTION_MODE) else ACCOUNT_SUBSCRIPTION_MODE
+
+
+def get_env_number(key: str, default: int) -> int:
+    value = get_env_value(key)
+    return default if value is None else int(value)
 
 
 # Main function to handle WebSocket and Solana queries
 async def main():
     ws_url = get_env_value(SOLANA_WS)
-    model = HistGradientBoostModelBuilder(dict())
-    model.load_model("hist_gradient")
+    model = get_model("hist_gradient")
 
     r = get_async_redis()
     traders = [column.split("_")[0] for column in model.get_columns() if
                "_sol_amount_spent" in column]  # todo move to function
 
-    retries = 0
-    while True:
-        try:
-            async with websockets.connect(ws_url, max_size=200 ** 7) as websocket:
-                logger.info("Connected to WebSocket")
-                # Subscribe to accounts via WebSocket
-                await subscribe_to_accounts(websocket, traders)
-                # Handle incoming WebSocket messages
-                await r.set(SUBSCRIPTION_MAP, json.dumps(subscription_map))
-                await on_message(websocket)
-        except Exception as e:
-            logger.exception(f"Unexpected error. Retrying in {2 ** retries} seconds...")
-
-        retries += 1
-        await asyncio.sleep(min(30, 2 ** retries))
+    queue = Queue(EVENT_QUEUE, connection=get_sync_redis())
+    pipeline = None
+    if get_env_bool_value(EVENT_PIPELINE_MODE):
+        pipeline = create_event_pipeline()
+        pipeline.start()
+
+    async def on_subscriptions_changed(subscription_map: Dict[int, str]):
+        await store_subscription_map(r, subscription_map)
+
+    # Function to handle WebSocket messages
+    async def on_message(message: str, trader: Optional[str]):
+        if not await r.exists(SUBSCRIPTION_MAP):
+            await store_subscription_map(r, manager.subscription_map)
+
+        if pipeline is not None:
+            pipeline.submit(message, trader=trader)
+        else:
+            queue.enqueue(handle_user_event, message, trader=trader)
+
+    mode = get_subscription_mode()
+    logger.info("Subscribe to traders", extra={"mode": mode, "traders": len(traders)})
+    manager = SubscriptionManager(ws_url, traders, mode, on_message, on_subscriptions_changed,
+                                  connections=get_env_number(SUBSCRIPTION_CONNECTIONS,
+                                                             DEFAULT_SUBSCRIPTION_CONNECTIONS),
+                                  rate=get_env_number(SUBSCRIPTION_RATE, DEFAULT_SUBSCRIPTION_RATE))
+    try:
+        await manager.run()
+    finally:
+        if pipeline is not None:
+            await pipeline.stop()
+            rpc_latency_stats.log()
+            await close_http_session()
+            await close_solana_clients()
+            await close_shared_async_redis()
 
 
 if __name__ == '__main__':
     load_dotenv()
-    run_sql_file(os.path.join(ROOT_DIR, "database/tables.sql"))
+    setup_database()
     setup_logger("bot_main")
     # Run the event loop
     asyncio.run(main())
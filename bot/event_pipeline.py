@@ -0,0 +1,149 @@
+import asyncio
+import logging
+import time
+from collections import deque
+from typing import Awaitable, Callable, Deque, Dict, List, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_EVENT_CONSUMERS = 16
+DEFAULT_EVENT_QUEUE_SIZE = 1000
+PIPELINE_LATENCY_SAMPLES = 1000
+PIPELINE_STATS_LOG_INTERVAL_SECONDS = 60
+
+QUEUE_WAIT_STAGE = "queue_wait"
+HANDLE_STAGE = "handle"
+END_TO_END_STAGE = "end_to_end"
+
+
+class PipelineStats:
+    """Queue depth, counters and per stage latency of the event pipeline, logged once per log interval."""
+
+    def __init__(self, max_samples: int = PIPELINE_LATENCY_SAMPLES,
+                 log_interval: float = PIPELINE_STATS_LOG_INTERVAL_SECONDS):
+        self.max_samples = max_samples
+        self.log_interval = log_interval
+        self.samples: Dict[str, Deque[float]] = dict()
+        self.submitted = 0
+        self.processed = 0
+        self.failed = 0
+        self.dropped = 0
+        self.fallbacks = 0
+        self.max_depth = 0
+        self.last_log = time.monotonic()
+
+    def record(self, stage: str, seconds: float):
+        self.samples.setdefault(stage, deque(maxlen=self.max_samples)).append(seconds)
+
+    def record_depth(self, depth: int):
+        self.max_depth = max(self.max_depth, depth)
+
+    def summary(self, depth: int = 0) -> Dict[str, object]:
+        """Counters, current and max queue depth and p50/p99/max latency in ms per stage."""
+        stages = dict()
+        for stage, samples in self.samples.items():
+            latencies = np.array(samples) * 1000
+            stages[stage] = {
+                "p50_ms": float(np.percentile(latencies, 50)),
+                "p99_ms": float(np.percentile(latencies, 99)),
+                "max_ms": float(latencies.max()),
+            }
+
+        return {"submitted": self.submitted, "processed": self.processed, "failed": self.failed,
+                "dropped": self.dropped, "fallbacks": self.fallbacks, "depth": depth, "max_depth": self.max_depth,
+                "stages": stages}
+
+    def log_if_due(self, depth: int):
+        if time.monotonic() - self.last_log >= self.log_interval:
+            self.log(depth)
+
+    def log(self, depth: int = 0):
+        self.last_log = time.monotonic()
+        logger.info("Event pipeline stats", extra={"event_pipeline": self.summary(depth)})
+
+
+class EventPipeline:
+    """
+    In-process alternative to enqueueing every websocket message into RQ.
+
+    Messages go into a bounded asyncio queue that is drained by a fixed number of consumer tasks, so there is no
+    pickling, Redis round-trip or process handoff per event. If the queue is full the message is passed to the
+    fallback (e.g. the RQ enqueue) or dropped when there is none. Keyword arguments of submit are passed on to the
+    handler or the fallback.
+    """
+
+    def __init__(self, handler: Callable[..., Awaitable], consumers: int = DEFAULT_EVENT_CONSUMERS,
+                 max_size: int = DEFAULT_EVENT_QUEUE_SIZE, fallback: Optional[Callable[..., object]] = None,
+                 stats: Optional[PipelineStats] = None):
+        self.handler = handler
+        self.consumers = consumers
+        self.fallback = fallback
+        self.stats = PipelineStats() if stats is None else stats
+        self.queue: asyncio.Queue[Tuple[float, str, dict]] = asyncio.Queue(maxsize=max_size)
+        self._tasks: List[asyncio.Task] = list()
+
+    @property
+    def depth(self) -> int:
+        return self.queue.qsize()
+
+    def start(self):
+        if len(self._tasks) > 0:
+            return
+
+        self._tasks = [asyncio.create_task(self.consume(), name=f"event_consumer_{index}")
+                       for index in range(self.consumers)]
+        logger.info("Started event pipeline", extra={"consumers": self.consumers, "max_size": self.queue.maxsize})
+
+    def submit(self, message: str, **kwargs) -> bool:
+        """Adds a message without waiting, returns False if the queue was full."""
+        self.stats.submitted += 1
+        try:
+            self.queue.put_nowait((time.perf_counter(), message, kwargs))
+            self.stats.record_depth(self.depth)
+            return True
+        except asyncio.QueueFull:
+            if self.fallback is None:
+                self.stats.dropped += 1
+                logger.error("Event pipeline full, message dropped", extra={"depth": self.depth})
+                return False
+
+        try:
+            self.fallback(message, **kwargs)
+            self.stats.fallbacks += 1
+        except Exception as e:
+            self.stats.dropped += 1
+            logger.exception("Event pipeline fallback failed, message dropped")
+
+        return False
+
+    async def consume(self):
+        while True:
+            received, message, kwargs = await self.queue.get()
+            start = time.perf_counter()
+            self.stats.record(QUEUE_WAIT_STAGE, start - received)
+            try:
+                await self.handler(message, **kwargs)
+                self.stats.processed += 1
+            except Exception as e:
+                self.stats.failed += 1
+                logger.exception("Failed to handle event")
+            finally:
+                end = time.perf_counter()
+                self.stats.record(HANDLE_STAGE, end - start)
+                self.stats.record(END_TO_END_STAGE, end - received)
+                self.queue.task_done()
+                self.stats.log_if_due(self.depth)
+
+    async def stop(self, drain: bool = True):
+        """Stops the consumers, waits for the queued messages to be handled first if drain is set."""
+        if drain and len(self._tasks) > 0:
+            await self.queue.join()
+
+        for task in self._tasks:
+            task.cancel()
+
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = list()
+        self.stats.log(self.depth)
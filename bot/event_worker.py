@@ -1,65 +1,96 @@
 import json
 import logging
 from datetime import datetime
-from typing import Dict, Optional, Tuple
+from typing import Optional, Tuple
 
 import redis.asyncio
 from dotenv import load_dotenv
 from rq import Queue
 from solders.pubkey import Pubkey
+from solders.signature import Signature
 
 from blockchain_token.token_creation import check_token_create_info_age_now
+from bot.subscription_cache import subscription_cache
 from bot.token_watcher import watch_token
-from constants import TOKEN_QUEUE, SOL_RPC, SUBSCRIPTION_MAP
-from data.redis_helper import get_async_redis, get_sync_redis
-from database.event_table import insert_event
-from database.token_watch_table import token_watch_exists
-from database.trade_table import insert_trade
-from env_data.get_env_value import get_env_value
-from solana_api.solana_data import get_latest_user_trade
+from constants import TOKEN_QUEUE, SOL_RPC, TOKEN_SCHEDULER_MODE, TOKEN_WATCH_REQUESTS
+from data.redis_helper import get_async_redis, get_sync_redis, close_shared_async_redis
+from data.signature_cache import claim_signature
+from database.event_table import insert_event_async
+from database.token_watch_table import token_watch_exists_async
+from database.trade_table import insert_trade_async
+from dto.trade_model import Trade
+from env_data.get_env_value import get_env_value, get_env_bool_value
+from solana_api.http_client import close_http_session
+from solana_api.rpc_client import close_solana_clients, rpc_latency_stats
+from solana_api.solana_data import get_latest_user_trade, get_user_trade_by_signature, \
+    get_user_trade_from_notification
 from structure_log.logger_setup import setup_logger, ensure_logging_flushed
 
 setup_logger("event_worker")
 logger = logging.getLogger(__name__)
 
 
-async def get_subscription_map(r: redis.asyncio.Redis) -> Optional[Dict[int, str]]:
-    try:
-        subscription_map = await r.get(SUBSCRIPTION_MAP)
-        if subscription_map is None:
-            return None
-
-        logger.debug("Raw subscription_map", extra={"subscription_map": str(subscription_map)})
-        subscription_map = json.loads(subscription_map)
-        logger.debug("Parsed subscription_map", extra={"subscription_map": str(subscription_map)})
-        subscription_map = {int(key): value for key, value in subscription_map.items()}
-        logger.info("Loaded subscription map from redis")
-        return subscription_map
-    except Exception as e:
-        logger.exception(f"Failed to get subscription map")
-        return None
-
-
 async def get_trader_form_event(event) -> Optional[str]:
     data = json.loads(event)
     r = get_async_redis()
     sub_id = data["params"]["subscription"]
     logger.info("Trader id form event", extra={"sub_id": sub_id})
 
-    subscription_map = await get_subscription_map(r)
-    if subscription_map is None:
-        logger.error("Subscription map not found in redis", extra={"sub_id": sub_id})
+    trader = await subscription_cache.get_trader(r, sub_id)
+    if trader is None:
+        logger.error("Id not found in subscription map", extra={"sub_id": sub_id})
         return None
 
-    if sub_id not in subscription_map:
-        logger.error("Id not found in map", extra={"sub_id": sub_id})
-
-    trader = subscription_map[sub_id]
     logger.info(f"Received wallet action {trader}", extra={"data": data, "trader": trader})
 
     return trader
 
 
+async def get_trade_from_event(event, trader: str, solana_rpc: str) -> Optional[Trade]:
+    """
+    Loads the trade of a websocket notification depending on the subscription type.
+
+    transactionSubscribe pushes the full transaction, logsSubscribe the signature and accountSubscribe only the
+    account change, which needs the latest signature and the transaction to be fetched.
+    """
+    data = json.loads(event)
+    user = Pubkey.from_string(trader)
+    method = data.get("method")
+    result = data["params"]["result"]
+    if method == "transactionNotification":
+        # parsing needs no RPC call, only a found trade is claimed so a notification that failed to parse is retried
+        trade = get_user_trade_from_notification(user, result)
+        if trade is None:
+            return None
+
+        if not await claim_signature(result["signature"]):
+            logger.info("Signature already checked", extra={"trader": trader, "signature": result["signature"]})
+            return None
+
+        return trade
+
+    if method == "logsNotification":
+        value = result["value"]
+        if value.get("err") is not None:
+            logger.info("Skip failed transaction", extra={"trader": trader, "signature": value["signature"]})
+            return None
+
+        if not await claim_signature(value["signature"]):
+            logger.info("Signature already checked", extra={"trader": trader, "signature": value["signature"]})
+            return None
+
+        return await get_user_trade_by_signature(user, Signature.from_string(value["signature"]), solana_rpc)
+
+    # repeated account notifications of the same slot resolve to the same latest signature
+    slot = result.get("context", dict()).get("slot")
+    slot_key = f"{trader}:{slot}" if slot is not None else None
+    if slot_key is not None and not await claim_signature(slot_key):
+        logger.info("Account change already checked", extra={"trader": trader, "slot": slot})
+        return None
+
+    return await get_latest_user_trade(user, solana_rpc, slot_key)
+
+
 def setup_handler() -> Tuple[redis.asyncio.Redis, Queue]:
     logger.info("Start of event worker task")
 
@@ -70,17 +101,22 @@ def setup_handler() -> Tuple[redis.asyncio.Redis, Queue]:
     return r, queue
 
 
-async def handle_user_event(event):
-    r, queue = setup_handler()
+async def process_user_event(event, r: redis.asyncio.Redis, queue: Queue, trader: Optional[str] = None):
+    """
+    Handles one websocket notification, shared by the RQ job and the in-process event pipeline.
 
+    The trader is resolved by the websocket connection that received the event, events without trader are looked up
+    in the subscription map.
+    """
     try:
-        trader = await get_trader_form_event(event)
-        insert_event(trader if trader is not None else "FAILED", datetime.utcnow(), "")
+        if trader is None:
+            trader = await get_trader_form_event(event)
+        await insert_event_async(trader if trader is not None else "FAILED", datetime.utcnow(), "")
         if trader is None:
             return
 
         solana_rpc = get_env_value(SOL_RPC)
-        trade = await get_latest_user_trade(Pubkey.from_string(trader), solana_rpc)
+        trade = await get_trade_from_event(event, trader, solana_rpc)
         if trade is None:
             logger.info(f"No trades found for {trader}", extra={"trader": trader})
             return
@@ -88,7 +124,7 @@ async def handle_user_event(event):
         logger.info(f"Trade found for trader {trader}", extra={"trader": trader})
 
         # check if coin is in list already
-        token_is_watched = token_watch_exists(trade.token)
+        token_is_watched = await token_watch_exists_async(trade.token)
         logger.info("Token already in list", extra={"token_exist": token_is_watched})
 
         result = await check_token_create_info_age_now(trade.token)
@@ -97,17 +133,31 @@ async def handle_user_event(event):
             logger.info("Skip token create info check is false")
             return
 
-        insert_trade(trade)
+        await insert_trade_async(trade)
         logger.info("Token trade added to list", extra={"trade": trade.to_dict()})
 
         # add coin to list if not
         if not token_is_watched:
             # Enqueue a task with some data
             logger.info("Add token to token watch", extra={"trade": trade.to_dict()})
-            queue.enqueue(watch_token, trade.token)
+            if get_env_bool_value(TOKEN_SCHEDULER_MODE):
+                await r.rpush(TOKEN_WATCH_REQUESTS, trade.token)
+            else:
+                queue.enqueue(watch_token, trade.token)
 
     except Exception as e:
         logger.exception("Failed to process message")
+
+
+async def handle_user_event(event, trader: Optional[str] = None):
+    r, queue = setup_handler()
+
+    try:
+        await process_user_event(event, r, queue, trader)
     finally:
         logger.info("Finished watch task clean up and exit.")
+        rpc_latency_stats.log()
+        await close_http_session()
+        await close_solana_clients()
+        await close_shared_async_redis()
         ensure_logging_flushed()
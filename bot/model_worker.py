@@ -0,0 +1,38 @@
+import logging
+import sys
+
+from dotenv import load_dotenv
+from rq import Worker
+
+from data.redis_helper import get_sync_redis
+from database.raw_sql import setup_database
+from ml_model.model_registry import get_model
+from structure_log.logger_setup import setup_logger
+
+setup_logger("model_worker")
+logger = logging.getLogger(__name__)
+
+
+class ModelWorker(Worker):
+    """
+    RQ worker that keeps the model loaded in the parent process.
+
+    The work horses are forked from the parent, so every job starts with the model already in memory instead of
+    unpickling it again. The registry is refreshed before each fork to pick up a new model version.
+    """
+
+    def execute_job(self, job, queue):
+        try:
+            get_model()
+        except Exception as e:
+            logger.exception("Failed to refresh model before job")
+
+        return super().execute_job(job, queue)
+
+
+if __name__ == '__main__':
+    load_dotenv()
+    setup_database()
+    get_model()
+    worker = ModelWorker(sys.argv[1:], connection=get_sync_redis())
+    worker.work()
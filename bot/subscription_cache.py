@@ -0,0 +1,75 @@
+import logging
+import time
+from typing import Dict, Optional
+
+import redis.asyncio
+
+from constants import SUBSCRIPTION_MAP, SUBSCRIPTION_MAP_VERSION
+
+logger = logging.getLogger(__name__)
+
+VERSION_CHECK_INTERVAL_SECONDS = 1
+
+
+async def store_subscription_map(r: redis.asyncio.Redis, subscription_map: Dict[int, str]):
+    """
+    Replaces the subscription map in redis and bumps its version in one transaction.
+
+    The map is stored as hash (subscription id -> wallet), so workers look up single ids with HGET instead of
+    loading and parsing the whole map.
+    """
+    async with r.pipeline(transaction=True) as pipe:
+        pipe.delete(SUBSCRIPTION_MAP)
+        if len(subscription_map) > 0:
+            pipe.hset(SUBSCRIPTION_MAP, mapping={str(key): value for key, value in subscription_map.items()})
+        pipe.incr(SUBSCRIPTION_MAP_VERSION)
+        await pipe.execute()
+
+
+class SubscriptionCache:
+    """
+    Worker local cache of subscription id -> wallet lookups.
+
+    Missing ids are loaded with a single HGET. The cache is cleared when bot_main stored a new map, which is noticed
+    by checking SUBSCRIPTION_MAP_VERSION at most once per check interval.
+    """
+
+    def __init__(self, check_interval: float = VERSION_CHECK_INTERVAL_SECONDS):
+        self.check_interval = check_interval
+        self.traders: Dict[int, str] = dict()
+        self.version: Optional[bytes] = None
+        self.checked_at: Optional[float] = None
+
+    async def check_version(self, r: redis.asyncio.Redis):
+        now = time.monotonic()
+        if self.checked_at is not None and now - self.checked_at < self.check_interval:
+            return
+
+        version = await r.get(SUBSCRIPTION_MAP_VERSION)
+        self.checked_at = now
+        if version != self.version:
+            logger.info("Subscription map changed, clear cache", extra={"version": str(version)})
+            self.traders.clear()
+            self.version = version
+
+    async def get_trader(self, r: redis.asyncio.Redis, sub_id: int) -> Optional[str]:
+        await self.check_version(r)
+        trader = self.traders.get(sub_id)
+        if trader is not None:
+            return trader
+
+        trader = await r.hget(SUBSCRIPTION_MAP, str(sub_id))
+        if trader is None:
+            return None
+
+        trader = trader.decode() if isinstance(trader, bytes) else trader
+        self.traders[sub_id] = trader
+        return trader
+
+    def clear(self):
+        self.traders.clear()
+        self.version = None
+        self.checked_at = None
+
+
+subscription_cache = SubscriptionCache()
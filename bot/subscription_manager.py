@@ -0,0 +1,236 @@
+import asyncio
+import itertools
+import json
+import logging
+import time
+from typing import Awaitable, Callable, Dict, List, Optional
+
+import websockets
+
+from constants import LOGS_SUBSCRIPTION_MODE, TRANSACTION_SUBSCRIPTION_MODE
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SUBSCRIPTION_CONNECTIONS = 4
+DEFAULT_SUBSCRIPTION_RATE = 20
+MAX_SUBSCRIPTIONS_IN_FLIGHT = 50
+SUBSCRIPTION_RESPONSE_TIMEOUT_SECONDS = 10
+SUBSCRIPTION_ATTEMPTS = 3
+RECONNECT_BASE_DELAY_SECONDS = 1
+RECONNECT_MAX_DELAY_SECONDS = 30
+WEBSOCKET_MAX_SIZE = 200 ** 7
+
+
+def create_subscription_message(address: str, mode: str, request_id: int = 1) -> dict:
+    """
+    Subscription request of a wallet.
+
+    accountSubscribe only reports that the account changed, the worker has to fetch the latest signature and the
+    transaction. logsSubscribe pushes the signature and transactionSubscribe (Helius/Geyser RPCs) the full
+    transaction, so the trade is parsed from the notification without any refetch.
+    """
+    if mode == LOGS_SUBSCRIPTION_MODE:
+        method = "logsSubscribe"
+        params = [{"mentions": [address]}, {"commitment": "finalized"}]
+    elif mode == TRANSACTION_SUBSCRIPTION_MODE:
+        method = "transactionSubscribe"
+        params = [{"accountInclude": [address], "vote": False, "failed": False},
+                  {"commitment": "finalized", "encoding": "json", "transactionDetails": "full",
+                   "maxSupportedTransactionVersion": 0}]
+    else:
+        method = "accountSubscribe"
+        params = [address, {"encoding": "jsonParsed", "commitment": "finalized"}]
+
+    return {"jsonrpc": "2.0", "method": method, "params": params, "id": request_id}
+
+
+class SubscriptionConnection:
+    """
+    One websocket connection with its share of the wallets.
+
+    Subscription requests are sent without waiting for the previous response, limited to rate requests per second
+    and max_in_flight unanswered requests. A reader task matches the responses to the requests by JSON-RPC id and
+    forwards every notification to on_message together with its wallet. The wallet is resolved from the
+    subscriptions of this connection, ids are only unique per connection (e.g. behind a load balanced RPC url every
+    connection can land on another node). When the connection drops, only its wallets are resubscribed.
+    """
+
+    def __init__(self, index: int, ws_url: str, wallets: List[str], mode: str,
+                 on_message: Callable[[str, Optional[str]], Awaitable],
+                 on_subscribed: Callable[[int, Dict[int, str]], Awaitable],
+                 rate: float = DEFAULT_SUBSCRIPTION_RATE, max_in_flight: int = MAX_SUBSCRIPTIONS_IN_FLIGHT,
+                 response_timeout: float = SUBSCRIPTION_RESPONSE_TIMEOUT_SECONDS,
+                 reconnect_base_delay: float = RECONNECT_BASE_DELAY_SECONDS):
+        self.index = index
+        self.ws_url = ws_url
+        self.wallets = wallets
+        self.mode = mode
+        self.on_message = on_message
+        self.on_subscribed = on_subscribed
+        self.rate = rate
+        self.max_in_flight = max_in_flight
+        self.response_timeout = response_timeout
+        self.reconnect_base_delay = reconnect_base_delay
+        self.pending: Dict[int, asyncio.Future] = dict()
+        self.subscriptions: Dict[int, str] = dict()
+        self.subscribe_seconds: Optional[float] = None
+        self.connects = 0
+        self._ids = itertools.count(1)
+        self._next_send = 0.0
+
+    async def run(self):
+        retries = 0
+        while True:
+            reader = None
+            try:
+                async with websockets.connect(self.ws_url, max_size=WEBSOCKET_MAX_SIZE) as websocket:
+                    self.connects += 1
+                    logger.info("Connected to WebSocket", extra={"connection": self.index})
+                    reader = asyncio.create_task(self.read(websocket))
+                    start = time.perf_counter()
+                    subscriptions = await self.subscribe(websocket)
+                    self.subscribe_seconds = time.perf_counter() - start
+                    logger.info("Connection subscribed",
+                                extra={"connection": self.index, "wallets": len(self.wallets),
+                                       "subscribed": len(subscriptions), "seconds": self.subscribe_seconds})
+                    await self.on_subscribed(self.index, subscriptions)
+                    retries = 0
+                    await reader
+            except Exception as e:
+                logger.exception("Websocket connection failed", extra={"connection": self.index})
+            finally:
+                if reader is not None and not reader.done():
+                    reader.cancel()
+                self.pending.clear()
+
+            delay = min(RECONNECT_MAX_DELAY_SECONDS, self.reconnect_base_delay * 2 ** retries)
+            logger.info(f"Reconnect in {delay} seconds", extra={"connection": self.index})
+            retries += 1
+            await asyncio.sleep(delay)
+
+    async def read(self, websocket):
+        try:
+            async for message in websocket:
+                data = json.loads(message)
+                if len(self.pending) > 0 and self.resolve_response(data):
+                    continue
+
+                try:
+                    await self.on_message(message, self.get_wallet(data))
+                except Exception as e:
+                    logger.exception("Failed to process message", extra={"connection": self.index})
+        finally:
+            for future in self.pending.values():
+                if not future.done():
+                    future.set_exception(ConnectionError("Websocket connection closed"))
+
+    def get_wallet(self, data) -> Optional[str]:
+        if not isinstance(data, dict) or not isinstance(data.get("params"), dict):
+            return None
+
+        wallet = self.subscriptions.get(data["params"].get("subscription"))
+        if wallet is None:
+            logger.warning("Notification of unknown subscription", extra={"connection": self.index})
+
+        return wallet
+
+    def resolve_response(self, data) -> bool:
+        if not isinstance(data, dict) or "method" in data or data.get("id") is None:
+            return False
+
+        future = self.pending.get(data["id"])
+        if future is not None and not future.done():
+            future.set_result(data)
+
+        return True
+
+    async def wait_for_send_slot(self):
+        now = time.monotonic()
+        send_at = max(now, self._next_send)
+        self._next_send = send_at + 1 / self.rate
+        await asyncio.sleep(send_at - now)
+
+    async def subscribe_wallet(self, websocket, semaphore: asyncio.Semaphore, address: str) -> Optional[int]:
+        for attempt in range(SUBSCRIPTION_ATTEMPTS):
+            async with semaphore:
+                await self.wait_for_send_slot()
+                request_id = next(self._ids)
+                future = asyncio.get_running_loop().create_future()
+                self.pending[request_id] = future
+                try:
+                    await websocket.send(json.dumps(create_subscription_message(address, self.mode, request_id)))
+                    response = await asyncio.wait_for(future, self.response_timeout)
+                except asyncio.TimeoutError:
+                    logger.warning("Subscription timed out", extra={"address": address, "attempt": attempt})
+                    continue
+                finally:
+                    self.pending.pop(request_id, None)
+
+            if "result" in response:
+                # notifications can arrive before all wallets of the connection are subscribed
+                self.subscriptions[response["result"]] = address
+                return response["result"]
+
+            logger.info(f"Subscription unexpected result {json.dumps(response)}",
+                        extra={"address": address, "result": response, "attempt": attempt})
+
+        logger.error("Failed to subscribe wallet", extra={"address": address, "connection": self.index})
+        return None
+
+    async def subscribe(self, websocket) -> Dict[int, str]:
+        """Subscribes all wallets of the connection, returns subscription id -> wallet."""
+        semaphore = asyncio.Semaphore(self.max_in_flight)
+        self._next_send = 0.0
+        self.subscriptions = dict()
+        subscription_ids = await asyncio.gather(*[self.subscribe_wallet(websocket, semaphore, address)
+                                                  for address in self.wallets], return_exceptions=True)
+        for subscription_id in subscription_ids:
+            if isinstance(subscription_id, BaseException):
+                raise subscription_id
+
+        return {subscription_id: address for subscription_id, address in zip(subscription_ids, self.wallets)
+                if subscription_id is not None}
+
+
+class SubscriptionManager:
+    """
+    Spreads the wallet subscriptions over several websocket connections.
+
+    Every connection subscribes and reconnects on its own, on_subscriptions_changed gets the merged subscription map
+    whenever one of them (re)subscribed. The merged map is only a fallback for events without wallet, notifications
+    are passed to on_message with the wallet of their connection.
+    """
+
+    def __init__(self, ws_url: str, wallets: List[str], mode: str,
+                 on_message: Callable[[str, Optional[str]], Awaitable],
+                 on_subscriptions_changed: Callable[[Dict[int, str]], Awaitable],
+                 connections: int = DEFAULT_SUBSCRIPTION_CONNECTIONS, rate: float = DEFAULT_SUBSCRIPTION_RATE,
+                 **connection_kwargs):
+        self.on_subscriptions_changed = on_subscriptions_changed
+        self.subscriptions: Dict[int, Dict[int, str]] = dict()
+        connections = max(1, min(connections, len(wallets)))
+        # the rate limit is shared by all connections of the endpoint
+        self.connections = [SubscriptionConnection(index, ws_url, wallets[index::connections], mode, on_message,
+                                                   self.on_subscribed, rate / connections, **connection_kwargs)
+                            for index in range(connections)]
+
+    @property
+    def subscription_map(self) -> Dict[int, str]:
+        subscription_map = dict()
+        for subscriptions in self.subscriptions.values():
+            subscription_map.update(subscriptions)
+
+        return subscription_map
+
+    async def on_subscribed(self, index: int, subscriptions: Dict[int, str]):
+        for other_index, other_subscriptions in self.subscriptions.items():
+            if other_index != index and len(other_subscriptions.keys() & subscriptions.keys()) > 0:
+                logger.warning("Subscription id used by several connections, the merged map is ambiguous",
+                               extra={"connection": index, "other_connection": other_index})
+
+        self.subscriptions[index] = subscriptions
+        await self.on_subscriptions_changed(self.subscription_map)
+
+    async def run(self):
+        logger.info("Start subscription manager", extra={"connections": len(self.connections)})
+        await asyncio.gather(*[connection.run() for connection in self.connections])
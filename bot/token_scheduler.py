@@ -0,0 +1,239 @@
+import asyncio
+import logging
+from datetime import datetime, timedelta
+from typing import Dict, Optional
+
+import pandas as pd
+from dotenv import load_dotenv
+from rq import Queue
+
+from birdeye_api.ohlcv_endpoint import get_time_frame_ohlcv
+from bot.token_watcher import check_if_token_done, create_token_feature_state
+from bot.trade_watcher import watch_trade
+from constants import TRADE_QUEUE, TOKEN_WATCH_REQUESTS, TOKEN_SCHEDULER_WATCHES, TOKEN_SCHEDULER_MODE
+from data.close_volume_data import get_trading_minute
+from data.redis_helper import get_async_redis, get_sync_redis
+from data.token_feature_state import TokenFeatureState
+from database.raw_sql import setup_database
+from database.token_dataset_table import insert_token_datasets_async
+from database.token_watch_table import insert_token_watch_async, set_end_time_async, get_open_token_watches_async
+from database.trade_table import get_new_trades_by_tokens_async
+from dto.token_dataset_model import TokenDataset
+from env_data.get_env_value import get_env_bool_value
+from ml_model.model_registry import get_model
+from ml_model.sk_learn_classifier_builder import SKLearnClassifierBuilder
+from solana_api.http_client import close_http_session
+from structure_log.logger_setup import setup_logger
+
+setup_logger("token_scheduler")
+logger = logging.getLogger(__name__)
+
+MAX_TOKEN_AGE_MINUTES = 120
+MINUTE_OFFSET_SECONDS = 2
+MAX_CONCURRENT_OHLCV_REQUESTS = 20
+
+
+def get_seconds_until_next_minute(offset: float) -> float:
+    now = datetime.utcnow()
+    next_minute = now.replace(second=0, microsecond=0) + timedelta(minutes=1, seconds=offset)
+    return (next_minute - now).total_seconds()
+
+
+class TokenWatchScheduler:
+    """
+    Watches all active tokens from one event loop.
+
+    Once per minute the new trades of all tokens are loaded with one query, the missing candles are fetched
+    concurrently and all token rows are scored with a single model.predict call. Tokens are requested by the event
+    workers through the TOKEN_WATCH_REQUESTS redis list. The tokens the scheduler watches are kept in the
+    TOKEN_SCHEDULER_WATCHES redis set, after a restart only these are watched again, open token_watch rows of RQ
+    watch_token jobs are left to their job. A failing token is logged and skipped, the other tokens of the minute are
+    still handled.
+    """
+
+    def __init__(self, model: SKLearnClassifierBuilder, max_concurrent_requests: int = MAX_CONCURRENT_OHLCV_REQUESTS):
+        self.model = model
+        self.feature_states: Dict[str, TokenFeatureState] = dict()
+        self.redis = get_async_redis()
+        self.trade_queue = Queue(TRADE_QUEUE, connection=get_sync_redis(), default_timeout=9000)
+        self.ohlcv_semaphore = asyncio.Semaphore(max_concurrent_requests)
+
+    async def add_requested_tokens(self):
+        while True:
+            token = await self.redis.lpop(TOKEN_WATCH_REQUESTS)
+            if token is None:
+                return
+
+            token = token.decode() if isinstance(token, bytes) else token
+            if token in self.feature_states or await check_if_token_done(token):
+                continue
+
+            await self.start_token_watch(token, new_watch=True)
+
+    async def restore_token_watches(self):
+        scheduler_tokens = {token.decode() if isinstance(token, bytes) else token
+                            for token in await self.redis.smembers(TOKEN_SCHEDULER_WATCHES)}
+        open_tokens = set(await get_open_token_watches_async())
+        for token in scheduler_tokens - open_tokens:
+            await self.redis.srem(TOKEN_SCHEDULER_WATCHES, token)
+
+        for token in scheduler_tokens & open_tokens:
+            if token not in self.feature_states:
+                logger.info("Restore token watch", extra={"token": str(token)})
+                await self.start_token_watch(token, new_watch=False)
+
+    async def start_token_watch(self, token: str, new_watch: bool):
+        try:
+            feature_state = await create_token_feature_state(token, self.model.get_columns())
+            if feature_state is None:
+                return
+
+            if new_watch:
+                logger.info("Start token watch", extra={"token": str(token)})
+                await insert_token_watch_async(token, datetime.utcnow(), None)
+                await self.redis.sadd(TOKEN_SCHEDULER_WATCHES, token)
+            self.feature_states[token] = feature_state
+        except Exception as e:
+            logger.exception("Failed to start token watch", extra={"token": str(token)})
+
+    async def stop_token_watch(self, token: str):
+        self.feature_states.pop(token, None)
+        await set_end_time_async(token, datetime.utcnow())
+        await self.redis.srem(TOKEN_SCHEDULER_WATCHES, token)
+
+    async def remove_old_tokens(self, now: datetime):
+        for token, feature_state in list(self.feature_states.items()):
+            if (now - feature_state.launch_time).total_seconds() > MAX_TOKEN_AGE_MINUTES * 60:
+                logger.info("Stop watch for token because of age", extra={"token": str(token)})
+                await self.stop_token_watch(token)
+
+    async def add_new_trades(self):
+        new_trades = await get_new_trades_by_tokens_async(
+            {token: feature_state.last_trade_id for token, feature_state in self.feature_states.items()})
+
+        for token, (trades, last_trade_id) in new_trades.items():
+            try:
+                self.feature_states[token].add_trades(trades, last_trade_id)
+            except Exception as e:
+                logger.exception("Failed to add new trades", extra={"token": str(token)})
+
+    async def get_candles(self, feature_state: TokenFeatureState, trading_minute: datetime) -> Optional[pd.DataFrame]:
+        async with self.ohlcv_semaphore:
+            return await get_time_frame_ohlcv(feature_state.token, trading_minute,
+                                              feature_state.get_missing_minutes(trading_minute), "1m")
+
+    async def prepare_current_datasets(self, trading_minute: datetime) -> Dict[str, pd.DataFrame]:
+        feature_states = [feature_state for feature_state in self.feature_states.values()
+                          if feature_state.has_valid_trades(trading_minute)]
+        candles = await asyncio.gather(
+            *[self.get_candles(feature_state, trading_minute) for feature_state in feature_states],
+            return_exceptions=True)
+
+        datasets = dict()
+        for feature_state, token_candles in zip(feature_states, candles):
+            if token_candles is None or isinstance(token_candles, BaseException):
+                logger.error("Issue in creating dataset",
+                             extra={'token': feature_state.token, 'trading_minute': trading_minute,
+                                    'error': str(token_candles)})
+                continue
+
+            try:
+                df = feature_state.update(trading_minute, token_candles)
+            except Exception as e:
+                logger.exception("Failed to update feature state",
+                                 extra={'token': feature_state.token, 'trading_minute': trading_minute})
+                continue
+
+            if df is not None:
+                datasets[feature_state.token] = df
+
+        return datasets
+
+    def predict_tokens(self, datasets: Dict[str, pd.DataFrame]) -> Dict[str, bool]:
+        tokens = list(datasets.keys())
+        columns = self.model.get_columns()
+        values = pd.concat([datasets[token] for token in tokens], ignore_index=True).reindex(
+            columns=columns, fill_value=0.0).to_numpy(dtype=float)
+
+        predictions = self.model.predict_batch(values, columns)
+        return {token: bool(prediction) for token, prediction in zip(tokens, predictions)}
+
+    def predict(self, datasets: Dict[str, pd.DataFrame]) -> Dict[str, bool]:
+        """Scores all tokens in one batch, if the batch fails every token is scored on its own."""
+        try:
+            return self.predict_tokens(datasets)
+        except Exception as e:
+            logger.exception("Failed to predict batch, predict tokens one by one", extra={"tokens": len(datasets)})
+
+        predictions = dict()
+        for token, df in datasets.items():
+            try:
+                predictions.update(self.predict_tokens({token: df}))
+            except Exception as e:
+                logger.exception("Failed to predict token", extra={"token": str(token)})
+
+        return predictions
+
+    async def run_minute(self, trading_minute: datetime):
+        await self.add_requested_tokens()
+        await self.remove_old_tokens(datetime.utcnow())
+        if len(self.feature_states) == 0:
+            return
+
+        await self.add_new_trades()
+        datasets = await self.prepare_current_datasets(trading_minute)
+        if len(datasets) == 0:
+            return
+
+        try:
+            await insert_token_datasets_async([TokenDataset(token, trading_minute, df)
+                                               for token, df in datasets.items()])
+        except Exception as e:
+            logger.exception("Failed to insert token datasets", extra={"trading_minute": trading_minute})
+
+        logger.info("Make predictions for trading minute",
+                    extra={"trading_minute": trading_minute, "tokens": len(datasets)})
+        predictions = self.predict(datasets)
+
+        for token, prediction in predictions.items():
+            if not prediction:
+                continue
+
+            try:
+                logger.info("Start trader watcher", extra={"token": str(token), "trading_minute": trading_minute})
+                self.trade_queue.enqueue(watch_trade, token)
+                await self.stop_token_watch(token)
+            except Exception as e:
+                logger.exception("Failed to start trade watcher", extra={"token": str(token)})
+
+    async def run(self):
+        await self.restore_token_watches()
+        while True:
+            await asyncio.sleep(get_seconds_until_next_minute(MINUTE_OFFSET_SECONDS))
+            trading_minute = get_trading_minute()
+            try:
+                # picks up a reloaded model if the pickle changed
+                self.model = get_model(self.model.model_name, type(self.model))
+                await self.run_minute(trading_minute)
+            except Exception as e:
+                logger.exception("Failed to run token watch minute", extra={"trading_minute": trading_minute})
+
+
+async def main():
+    if not get_env_bool_value(TOKEN_SCHEDULER_MODE):
+        # the event workers start RQ watch_token jobs, those own the open token watches
+        logger.info("Token scheduler mode is disabled, exit")
+        return
+
+    setup_database()
+    logger.info("Load model")
+    scheduler = TokenWatchScheduler(get_model("hist_gradient"))
+    try:
+        await scheduler.run()
+    finally:
+        await close_http_session()
+
+
+if __name__ == '__main__':
+    load_dotenv()
+    asyncio.run(main())
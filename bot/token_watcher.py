@@ -12,53 +12,24 @@ from birdeye_api.ohlcv_endpoint import get_time_frame_ohlcv
 from bot.trade_watcher import watch_trade
 from constants import TRADE_QUEUE
 from data.close_volume_data import get_trading_minute
-from data.data_type import convert_columns
-from data.dataset import add_inactive_traders_values
-from data.feature_engineering import add_features
 from data.redis_helper import get_sync_redis
-from data.trade_data import get_valid_trades, get_traders, create_dataframe_with_trades
-from database.token_creation_info_table import select_token_creation_info
-from database.token_dataset_table import insert_token_dataset
-from database.token_watch_table import get_token_watch, set_end_time, insert_token_watch
-from database.trade_table import get_trades_by_token
+from data.token_feature_state import TokenFeatureState, get_traders_from_columns
+from database.token_creation_info_table import select_token_creation_info_async
+from database.token_dataset_table import insert_token_dataset_async
+from database.token_watch_table import get_token_watch_async, set_end_time_async, insert_token_watch_async
+from database.trade_table import get_new_trades_by_token_async
 from dto.token_dataset_model import TokenDataset
-from dto.trade_model import Trade
-from ml_model.hist_gradient_model_builder import HistGradientBoostModelBuilder
+from ml_model.model_registry import get_model
+from solana_api.http_client import close_http_session
 from structure_log.logger_setup import setup_logger, ensure_logging_flushed
 
 setup_logger("token_watcher")
 logger = logging.getLogger(__name__)
 
 
-def get_valid_trades_of_token(token: str, trading_minute: datetime) -> List[Trade]:
-    trades = get_trades_by_token(token)
-    valid_trades = get_valid_trades(trades, trading_minute)
-
-    return valid_trades
-
-
-async def get_base_data(valid_trades: List[Trade], trading_minute: datetime, token: str) -> Optional[pd.DataFrame]:
-    df = create_dataframe_with_trades(valid_trades, trading_minute, 1)
-
-    # get close and volume data
-    price_df = await get_time_frame_ohlcv(token, trading_minute, 1, "1m")
-    if price_df is None:
-        return None
-
-    df = pd.merge(
-        df,
-        price_df,
-        left_index=True,  # Join on the index of df
-        right_index=True,  # Join on the index of price_df
-        how="inner"  # Keeps only the rows with matching indices in both DataFrames
-    )
-
-    return df
-
-
-def check_if_token_done(token: str) -> bool:
+async def check_if_token_done(token: str) -> bool:
     try:
-        token_watch_info = get_token_watch(token)
+        token_watch_info = await get_token_watch_async(token)
         if token_watch_info is not None and token_watch_info[3]:
             logger.info("Token done", extra={"token": str(token)})
             return True
@@ -69,9 +40,9 @@ def check_if_token_done(token: str) -> bool:
     return False
 
 
-def check_age_of_token(token: str) -> bool:
+async def check_age_of_token(token: str) -> bool:
     logger.info("Check trading minute", extra={"token": str(token)})
-    token_create_info = select_token_creation_info(token)
+    token_create_info = await select_token_creation_info_async(token)
     if token_create_info is None:
         logger.error("Failed to get token", extra={"token": str(token)})
         return False
@@ -87,25 +58,31 @@ def check_age_of_token(token: str) -> bool:
     return True
 
 
-async def prepare_current_dataset(valid_trades: List[Trade], trading_minute: datetime, token: str,
-                                  columns: List[str]) -> Optional[pd.DataFrame]:
-    logger.info("Get base dataset")
-    df = await get_base_data(valid_trades, trading_minute, token)
-    if df is None:
+async def create_token_feature_state(token: str, columns: List[str]) -> Optional[TokenFeatureState]:
+    token_create_info = await select_token_creation_info_async(token)
+    if token_create_info is None:
+        logger.error("Failed to get token creation info", extra={"token": str(token)})
         return None
 
-    # run data preparation
-    logger.info("Adjust type of columns", extra={"token": str(token), "trading_minute": trading_minute})
-    df = convert_columns(df)
+    token_create_time, _ = token_create_info
+    return TokenFeatureState(token, token_create_time, get_traders_from_columns(columns))
 
-    # Add features
-    logger.info("Add features", extra={"token": str(token), "trading_minute": trading_minute})
-    df = add_features(df)
 
-    logger.info("Add inactive traders", extra={"token": str(token), "trading_minute": trading_minute})
-    df = add_inactive_traders_values(get_traders(valid_trades), columns, df)
+async def add_new_trades_to_feature_state(feature_state: TokenFeatureState):
+    new_trades, last_trade_id = await get_new_trades_by_token_async(feature_state.token, feature_state.last_trade_id)
+    feature_state.add_trades(new_trades, last_trade_id)
 
-    return df
+
+async def prepare_current_dataset_incremental(feature_state: TokenFeatureState,
+                                              trading_minute: datetime) -> Optional[pd.DataFrame]:
+    logger.info("Get missing candles", extra={"token": str(feature_state.token), "trading_minute": trading_minute})
+    candles = await get_time_frame_ohlcv(feature_state.token, trading_minute,
+                                         feature_state.get_missing_minutes(trading_minute), "1m")
+    if candles is None:
+        return None
+
+    logger.info("Update feature state", extra={"token": str(feature_state.token), "trading_minute": trading_minute})
+    return feature_state.update(trading_minute, candles)
 
 
 async def watch_token(token) -> bool:
@@ -114,24 +91,27 @@ async def watch_token(token) -> bool:
     logger.info("Start token watch", extra={"token": str(token)})
     logger.info("Check if token already watched", extra={"token": str(token)})
 
-    if check_if_token_done(token):
+    if await check_if_token_done(token):
         return False
 
     logger.info("Mark token for watch", extra={"token": str(token)})
-    insert_token_watch(token, datetime.utcnow(), None)
+    await insert_token_watch_async(token, datetime.utcnow(), None)
 
     queue = Queue(TRADE_QUEUE, connection=get_sync_redis(), default_timeout=9000)
 
     try:
         logger.info("Load model")
-        model = HistGradientBoostModelBuilder(dict())
-        model.load_model("hist_gradient")  # todo refactor as the name is set in builder anyway!
+        model = get_model("hist_gradient")
+
+        feature_state = await create_token_feature_state(token, model.get_columns())
+        if feature_state is None:
+            return False
 
         last_trading_minute = None
         while True:
             try:
                 trading_minute = get_trading_minute()
-                if not check_age_of_token(token):
+                if not await check_age_of_token(token):
                     logger.info("Token watch finished because of age", extra={"token": str(token)})
                     return False
 
@@ -145,16 +125,16 @@ async def watch_token(token) -> bool:
 
                 last_trading_minute = copy.deepcopy(trading_minute)
 
-                # get trades and prepare trader columns
-                logger.info("Get valid trades", extra={"token": str(token)})
-                valid_trades = get_valid_trades_of_token(token, trading_minute)
-                if len(valid_trades) == 0:
+                # get new trades and update trader columns
+                logger.info("Get new trades", extra={"token": str(token)})
+                await add_new_trades_to_feature_state(feature_state)
+                if not feature_state.has_valid_trades(trading_minute):
                     logger.info("No valid trades", extra={"token": str(token), "trading_minute": trading_minute})
                     await sleep(5)
                     continue
 
                 logger.info("Prepare dataset for prediction", extra={"token": str(token)})
-                df = await prepare_current_dataset(valid_trades, trading_minute, token, model.get_columns())
+                df = await prepare_current_dataset_incremental(feature_state, trading_minute)
 
                 if df is None:
                     logger.error("Issue in creating dataset",
@@ -162,7 +142,7 @@ async def watch_token(token) -> bool:
                     await sleep(30)
                     continue
 
-                insert_token_dataset(TokenDataset(token, trading_minute, df))
+                await insert_token_dataset_async(TokenDataset(token, trading_minute, df))
 
                 # predict
                 logger.info("Prepare data for model prediction", extra={"token": str(token)})
@@ -188,5 +168,6 @@ async def watch_token(token) -> bool:
     except Exception as e:
         logger.exception("Failed to get token", extra={"token": str(token)}, exc_info=True)
     finally:
-        set_end_time(token, datetime.utcnow())
+        await set_end_time_async(token, datetime.utcnow())
+        await close_http_session()
         ensure_logging_flushed()
@@ -7,10 +7,12 @@ from dotenv import load_dotenv
 from constants import INVESTMENT_AMOUNT, REAL_MONEY_MODE
 from data.data_format import get_sol_price
 from data.redis_helper import get_async_redis
-from database.token_trade_history_table import insert_token_trade_history, update_sell_price
+from database.token_trade_history_table import insert_token_trade_history_async, update_sell_price_async
 from dto.token_trade_history_model import TokenTradeHistory
 from env_data.get_env_value import get_env_bool_value
+from solana_api.http_client import close_http_session
 from solana_api.jupiter_api import get_token_price_by_quote
+from solana_api.rpc_client import close_solana_clients
 from solana_api.trader import buy_token, sell_token
 from structure_log.logger_setup import setup_logger
 
@@ -36,9 +38,9 @@ async def watch_trade(token: str):
                     extra={"token": token, "start_price": str(start_price), "buy_time": buy_time.isoformat(),
                            "buy_amount": str(buy_amount)})
 
-        insert_token_trade_history(TokenTradeHistory(token=token, buy_time=buy_time,
-                                                     sell_time=None, buy_price=start_price,
-                                                     sell_price=None))
+        await insert_token_trade_history_async(TokenTradeHistory(token=token, buy_time=buy_time,
+                                                                 sell_time=None, buy_price=start_price,
+                                                                 sell_price=None))
         await sleep(10)
 
         while True:
@@ -59,7 +61,7 @@ async def watch_trade(token: str):
                         "Failed token because of time",
                         extra={"start_price": start_price, "last_price": last_price, "token": token, "profit": profit}
                     )
-                    update_sell_price(token, last_price)
+                    await update_sell_price_async(token, last_price)
                     return
 
                 if last_price >= start_price * 2.10:  # 110% of start price
@@ -73,7 +75,7 @@ async def watch_trade(token: str):
                         f"Price increased by 110%",
                         extra={"start_price": start_price, "last_price": last_price, "token": token, "profit": profit}
                     )
-                    update_sell_price(token, last_price)
+                    await update_sell_price_async(token, last_price)
                     return
 
                 if last_price <= start_price * 0.50:  # 50% of start price
@@ -84,7 +86,7 @@ async def watch_trade(token: str):
                         f"Price decreased by 50%: {last_price} < {start_price * 0.50}",
                         extra={"start_price": start_price, "last_price": last_price, "token": token, "profit": profit}
                     )
-                    update_sell_price(token, last_price)
+                    await update_sell_price_async(token, last_price)
                     return
             except Exception as e:
                 logger.exception("Error in trade watch", extra={"token": token})
@@ -92,3 +94,6 @@ async def watch_trade(token: str):
                 await sleep(10)
     except Exception as e:
         logger.exception("Failed to watch trade", extra={"token": token})
+    finally:
+        await close_http_session()
+        await close_solana_clients()
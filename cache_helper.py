@@ -1,38 +1,31 @@
 import os
-import pickle
-from typing import Union, Optional
+from typing import Union, Optional, Any
 
 import pandas as pd
 
 from constants import CACHE_FOLDER
+from data.data_cache import get_data_cache
 
 
-def get_cache_file_data(query_id: Union[int, str]) -> Optional[pd.DataFrame]:
-    if cache_exists(str(query_id)):
-        return get_cache_data(str(query_id))
-    return None
+def get_cache_file_data(query_id: Union[int, str], read_only: bool = False) -> Optional[pd.DataFrame]:
+    return get_data_cache().get(str(query_id), read_only=read_only)
 
 
-def write_data_to_cache(name, data):
-    """Write data to a pickle file in the cache directory."""
-    os.makedirs(CACHE_FOLDER, exist_ok=True)
-    with open(get_cache_file_path(name), 'wb') as f:  # Use 'wb' for binary write
-        pickle.dump(data, f)
+def write_data_to_cache(name, data, source: Optional[str] = None):
+    """Write data to the data cache, DataFrames are stored as Arrow files."""
+    get_data_cache().put(str(name), data, source)
 
 
 def get_cache_file_path(name):
+    """Path of the pickle file of the previous cache, it is still read if the data cache has no entry."""
     return os.path.join(CACHE_FOLDER, f'{name}.pkl')
 
 
 def cache_exists(name):
-    """Check if a cache file exists."""
-    return os.path.exists(get_cache_file_path(name))  # Change to .pkl extension
+    """Check if a cache entry exists."""
+    return get_data_cache().contains(str(name))
 
 
-def get_cache_data(name):
-    """Read data from a cache file."""
-    try:
-        with open(get_cache_file_path(name), 'rb') as f:  # Use 'rb' for binary read
-            return pickle.load(f)
-    except FileNotFoundError:
-        return None
+def get_cache_data(name, read_only: bool = False) -> Optional[Any]:
+    """Read data from the cache, read only DataFrames are memory mapped."""
+    return get_data_cache().get(str(name), read_only=read_only)
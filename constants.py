@@ -14,17 +14,35 @@ SOLANA_PRICE = "SOLANA_PRICE"
 TRAIN_VAL_TEST_FILE = "train_val_test"
 VALIDATION_FILE = "validation"
 SUBSCRIPTION_MAP = "SUBSCRIPTION_MAP"
+SUBSCRIPTION_MAP_VERSION = "SUBSCRIPTION_MAP_VERSION"
+SEEN_SIGNATURE = "SEEN_SIGNATURE"
+TOKEN_CREATION_INFO = "TOKEN_CREATION_INFO"
+SUBSCRIPTION_MODE = "SUBSCRIPTION_MODE"
+ACCOUNT_SUBSCRIPTION_MODE = "account"
+LOGS_SUBSCRIPTION_MODE = "logs"
+TRANSACTION_SUBSCRIPTION_MODE = "transaction"
+SUBSCRIPTION_CONNECTIONS = "SUBSCRIPTION_CONNECTIONS"
+SUBSCRIPTION_RATE = "SUBSCRIPTION_RATE"
 RANDOM_SEED = 42
 INVESTMENT_AMOUNT = 10
 DATABASE_NAME = "bigdatabot"
 POSTGRES_USER = "POSTGRES_USER"
 POSTGRES_PASSWORD = "POSTGRES_PASSWORD"
+DB_POOL_MIN_SIZE = "DB_POOL_MIN_SIZE"
+DB_POOL_MAX_SIZE = "DB_POOL_MAX_SIZE"
+BULK_INSERT_BATCH_SIZE = 1000
 PRE_SPLIT_DATA = "PRE_SPLIT_DATA"
 
 TRADE_QUEUE = "TRADE_QUEUE"
 EVENT_QUEUE = "EVENT_QUEUE"
 TOKEN_QUEUE = "TOKEN_QUEUE"
-BIRD_EYE_COUNTER = "BIRD_EYE_COUNTER"
+TOKEN_WATCH_REQUESTS = "TOKEN_WATCH_REQUESTS"
+TOKEN_SCHEDULER_WATCHES = "TOKEN_SCHEDULER_WATCHES"
+TOKEN_SCHEDULER_MODE = "TOKEN_SCHEDULER_MODE"
+EVENT_PIPELINE_MODE = "EVENT_PIPELINE_MODE"
+EVENT_PIPELINE_CONSUMERS = "EVENT_PIPELINE_CONSUMERS"
+BIRDEYE_QUOTA = "BIRDEYE_QUOTA"
+MODEL_VERSION = "MODEL_VERSION"
 
 WIN_PERCENTAGE = 100
 DRAW_DOWN_PERCENTAGE = 50
@@ -72,6 +90,7 @@ PERCENTAGE_OF_1_MILLION_MARKET_CAP = 'percentage_of_1_million_market_cap'
 ROOT_DIR = os.path.dirname(os.path.abspath(__file__))
 CACHE_FOLDER = os.path.join(ROOT_DIR, "cache")
 MODEL_FOLDER = os.path.join(ROOT_DIR, "save_models")
+MIGRATIONS_FOLDER = os.path.join(ROOT_DIR, "database", "migrations")
 CONFIG_2_FILE = os.path.join(ROOT_DIR, "pipeline", "config", "2_prepare_data_sets.yaml")
 
 PUMP_DOT_FUN_ID = "6EF8rrecthR5Dkzon8Nwu78hRvfCKubJ14M5uBEwF6P"
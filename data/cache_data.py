@@ -1,30 +1,23 @@
-import os
+from typing import Optional
 
 from config.config_reader import hash_config
-from constants import CACHE_FOLDER
-from data.pickle_files import load_from_pickle, save_to_pickle
+from data.data_cache import get_data_cache
 
 
-def read_cache_data_with_config(file_name_base: str, config: dict):
+def read_cache_data_with_config(file_name_base: str, config: dict, read_only: bool = False):
     file_name = file_name_base + hash_config(config)
-    return read_cache_data(file_name)
+    return read_cache_data(file_name, read_only)
 
 
-def read_cache_data(file_name_base: str):
-    if os.path.exists(os.path.join(CACHE_FOLDER, file_name_base + ".pkl")):
-        return load_from_pickle(os.path.join(CACHE_FOLDER, file_name_base + ".pkl"))
-    return None
+def read_cache_data(file_name_base: str, read_only: bool = False):
+    return get_data_cache().get(file_name_base, read_only=read_only)
 
 
-def save_cache_data_with_config(file_name_base: str, config: dict, data):
+def save_cache_data_with_config(file_name_base: str, config: dict, data, source: Optional[str] = None):
     # Generate the filename based on the config hash
     file_name = file_name_base + hash_config(config)
-    save_cache_data(file_name, data)
+    save_cache_data(file_name, data, source)
 
 
-def save_cache_data(file_name_base: str, data):
-    # Define the full file path
-    file_path = os.path.join(CACHE_FOLDER, file_name_base + ".pkl")
-
-    # Save the data to the pickle file
-    save_to_pickle(data, file_path)
+def save_cache_data(file_name_base: str, data, source: Optional[str] = None):
+    get_data_cache().put(file_name_base, data, source)
@@ -0,0 +1,151 @@
+import fcntl
+import json
+import logging
+import os
+import time
+from contextlib import contextmanager
+from typing import List, Tuple, Optional
+
+import numpy as np
+import pandas as pd
+
+from constants import CACHE_FOLDER, TOKEN_COLUMN, TRADING_MINUTE_COLUMN, TOTAL_VOLUME_COLUMN, PRICE_COLUMN
+
+logger = logging.getLogger(__name__)
+
+CANDLE_STORE_FOLDER = os.path.join(CACHE_FOLDER, "candles")
+CANDLE_SECONDS = 60
+# candles of the last minutes can still change, they are returned but not stored
+CANDLE_SETTLE_SECONDS = 2 * 60
+
+# one record per candle instead of a file per column, see CandleStore
+CANDLE_DTYPE = np.dtype([("timestamp", "<i8"), ("close", "<f8"), ("volume", "<f8")])
+
+Range = Tuple[int, int]
+
+
+def merge_ranges(ranges: List[Range]) -> List[Range]:
+    merged = list()
+    for start, end in sorted(ranges):
+        if len(merged) > 0 and start <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+
+    return merged
+
+
+def subtract_ranges(start: int, end: int, covered: List[Range]) -> List[Range]:
+    missing = list()
+    for covered_start, covered_end in covered:
+        if covered_end <= start:
+            continue
+        if covered_start >= end:
+            break
+        if covered_start > start:
+            missing.append((start, covered_start))
+        start = max(start, covered_end)
+
+    if start < end:
+        missing.append((start, end))
+
+    return missing
+
+
+def deduplicate_candles(candles: np.ndarray) -> np.ndarray:
+    """Sorts the candles by time and keeps the last one of every timestamp."""
+    _, last = np.unique(candles["timestamp"][::-1], return_index=True)
+    return candles[len(candles) - 1 - last]
+
+
+def candles_to_dataframe(token: str, candles: np.ndarray) -> pd.DataFrame:
+    return pd.DataFrame({TOKEN_COLUMN: token,
+                         TRADING_MINUTE_COLUMN: pd.to_datetime(candles["timestamp"], unit='s'),
+                         TOTAL_VOLUME_COLUMN: candles["volume"],
+                         PRICE_COLUMN: candles["close"]},
+                        columns=[TOKEN_COLUMN, TRADING_MINUTE_COLUMN, TOTAL_VOLUME_COLUMN, PRICE_COLUMN])
+
+
+class CandleStore:
+    """
+    On disk store of 1m candles (timestamp, close, volume) per token.
+
+    Every token has an append-only file of fixed size records that is read with a memory map, and an index file with
+    the time ranges already fetched, so only missing ranges have to be requested. Ranges are half-open [start, end)
+    in unix seconds. Appends of several processes are serialized with a file lock per token, records of a timestamp
+    stored twice are returned once (the latest).
+
+    Candles are stored as interleaved fixed size records, not as a file per column. An append is a single write, so
+    a crashed append leaves at most one partial record at the end, which is ignored, while separate column files could
+    end up with different lengths. Every read needs all three fields of the selected minutes anyway.
+    """
+
+    def __init__(self, directory: str = CANDLE_STORE_FOLDER):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def candles_path(self, token: str) -> str:
+        return os.path.join(self.directory, f"{token}.candles")
+
+    def index_path(self, token: str) -> str:
+        return os.path.join(self.directory, f"{token}.json")
+
+    @contextmanager
+    def lock(self, token: str):
+        with open(os.path.join(self.directory, f"{token}.lock"), "w") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def get_covered(self, token: str) -> List[Range]:
+        try:
+            with open(self.index_path(token)) as f:
+                return [(start, end) for start, end in json.load(f)["covered"]]
+        except FileNotFoundError:
+            return list()
+
+    def tokens(self) -> List[str]:
+        return sorted(name[:-len(".json")] for name in os.listdir(self.directory) if name.endswith(".json"))
+
+    def missing_ranges(self, token: str, start: int, end: int) -> List[Range]:
+        return subtract_ranges(start, end, self.get_covered(token))
+
+    def append(self, token: str, candles: np.ndarray, start: int, end: int, now: Optional[float] = None):
+        """
+        Stores the candles fetched for [start, end) and marks the range as covered.
+
+        Candles that are not settled yet are skipped and their range stays missing.
+        """
+        settled = int(now if now is not None else time.time()) - CANDLE_SETTLE_SECONDS
+        end = min(end, settled - settled % CANDLE_SECONDS)
+        if end <= start:
+            return
+
+        candles = candles[(candles["timestamp"] >= start) & (candles["timestamp"] < end)]
+        with self.lock(token):
+            if len(candles) > 0:
+                with open(self.candles_path(token), "ab") as f:
+                    f.write(np.ascontiguousarray(candles, dtype=CANDLE_DTYPE).tobytes())
+
+            covered = merge_ranges(self.get_covered(token) + [(start, end)])
+            index_path = self.index_path(token)
+            with open(index_path + ".tmp", "w") as f:
+                json.dump({"covered": covered}, f)
+            os.replace(index_path + ".tmp", index_path)
+
+    def read(self, token: str, start: int, end: int) -> np.ndarray:
+        """Returns the stored candles of [start, end) sorted by time."""
+        path = self.candles_path(token)
+        if not os.path.exists(path) or os.path.getsize(path) < CANDLE_DTYPE.itemsize:
+            return np.empty(0, dtype=CANDLE_DTYPE)
+
+        # a partly written record of a concurrent append is ignored
+        count = os.path.getsize(path) // CANDLE_DTYPE.itemsize
+        candles = np.memmap(path, dtype=CANDLE_DTYPE, mode="r", shape=(count,))
+        timestamps = candles["timestamp"]
+        return deduplicate_candles(np.array(candles[(timestamps >= start) & (timestamps < end)]))
+
+    def read_dataframe(self, token: str, start: int, end: int) -> pd.DataFrame:
+        return candles_to_dataframe(token, self.read(token, start, end))
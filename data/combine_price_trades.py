@@ -350,3 +350,198 @@ def add_trader_info_to_price_data(
     result = filter_rows_before_first_action(result)
 
     return result
+
+
+def calculate_trader_minute_positions(trades: pd.DataFrame) -> pd.DataFrame:
+    """
+    Calculate net positions for each trader, token and minute in one groupby.
+
+    Columnar counterpart of calculate_minute_positions for all traders at once. The result is sorted by
+    trader, token and minute so that every (trader, token) group is contiguous and in time order.
+    """
+    buy = trades['buy'].to_numpy()
+    positions = pd.DataFrame({
+        TRADER_COLUMN: trades[TRADER_COLUMN].to_numpy(),
+        TOKEN_COLUMN: trades[TOKEN_COLUMN].to_numpy(),
+        TRADING_MINUTE_COLUMN: trades[TRADING_MINUTE_COLUMN].to_numpy(),
+        'buys': np.where(buy == 1, trades['token_sold_amount'].to_numpy(dtype=float), 0.0),
+        'sells': np.where(buy == 0, trades['token_bought_amount'].to_numpy(dtype=float), 0.0),
+    })
+
+    positions = positions.groupby(
+        [TRADER_COLUMN, TOKEN_COLUMN, TRADING_MINUTE_COLUMN], as_index=False, sort=True
+    )[['buys', 'sells']].sum()
+    positions['net_position'] = positions['buys'] - positions['sells']
+
+    return positions.drop(columns=['buys', 'sells'])
+
+
+def determine_trader_states(positions: pd.DataFrame) -> pd.DataFrame:
+    """
+    Vectorized determine_trader_state over all (trader, token) position rows.
+
+    Adds the columns 'state' (state in the minute of the position) and 'carry_state' (state of the following
+    minutes without a position, NaN if the position does not change the state of later minutes). The carry state
+    is forward filled within each (trader, token) group.
+
+    Raises:
+        InvalidPositionError: If a net position is NaN or Infinite
+    """
+    net_position = positions['net_position'].to_numpy(dtype=float)
+    invalid = ~np.isfinite(net_position)
+    if invalid.any():
+        value = net_position[invalid][0]
+        raise InvalidPositionError("net_position", "NaN" if np.isnan(value) else "Infinite")
+
+    group = positions.groupby([TRADER_COLUMN, TOKEN_COLUMN], sort=False)
+    cumulative_position = group['net_position'].cumsum()
+    previous_position = cumulative_position.groupby(
+        [positions[TRADER_COLUMN], positions[TOKEN_COLUMN]], sort=False
+    ).shift(1).fillna(0).to_numpy()
+    # update_trader_states compares against the sum of the cumulative positions seen so far, keep that behaviour
+    current_position = cumulative_position.groupby(
+        [positions[TRADER_COLUMN], positions[TOKEN_COLUMN]], sort=False
+    ).cumsum().to_numpy()
+
+    state = np.select(
+        [
+            net_position > 0,
+            (net_position < 0) & (np.abs(net_position) >= previous_position),
+            net_position < 0,
+            current_position > 0
+        ],
+        [TraderState.JUST_BOUGHT, TraderState.NUKED, TraderState.JUST_SOLD, TraderState.STILL_HOLDS],
+        default=TraderState.NO_ACTION
+    )
+    carry_state = np.select(
+        [
+            (state == TraderState.JUST_BOUGHT) | (state == TraderState.JUST_SOLD),
+            state == TraderState.NUKED
+        ],
+        [TraderState.STILL_HOLDS, TraderState.SOLD_ALL],
+        default=np.nan
+    )
+
+    positions = positions.copy()
+    positions['state'] = state
+    positions['carry_state'] = carry_state
+    positions['carry_state'] = positions.groupby([TRADER_COLUMN, TOKEN_COLUMN], sort=False)['carry_state'].ffill()
+
+    return positions
+
+
+def get_trader_state_matrix(
+        result: pd.DataFrame,
+        trader_ids: np.ndarray,
+        positions: pd.DataFrame
+) -> np.ndarray:
+    """
+    Map (trader, token) position states onto the rows of result.
+
+    For every (trader, token) group only the rows of that token are looked at. A searchsorted on a combined
+    (group, minute) key finds the latest position at or before each row: an exact minute match takes the state of
+    the position, later minutes take the forward filled carry state and rows before the first position stay
+    NO_ACTION.
+
+    Returns:
+        np.ndarray: Matrix of shape (len(result), len(trader_ids)) with the trader states
+    """
+    states = np.full((len(result), len(trader_ids)), TraderState.NO_ACTION, dtype=np.int64)
+    if positions.empty or len(result) == 0:
+        return states
+
+    # Dense minute ranks keep the combined keys small
+    result_minutes = result[TRADING_MINUTE_COLUMN].to_numpy(dtype='datetime64[ns]')
+    position_minutes = positions[TRADING_MINUTE_COLUMN].to_numpy(dtype='datetime64[ns]')
+    minutes, minute_rank = np.unique(np.concatenate([result_minutes, position_minutes]), return_inverse=True)
+    result_rank = minute_rank[:len(result_minutes)]
+    position_rank = minute_rank[len(result_minutes):]
+    minute_count = len(minutes)
+
+    # Row indices of result grouped by token and ordered by minute
+    result_tokens = pd.Categorical(result[TOKEN_COLUMN])
+    token_codes = result_tokens.codes.astype(np.int64)
+    row_order = np.lexsort((result_rank, token_codes))
+    token_starts = np.searchsorted(token_codes[row_order], np.arange(len(result_tokens.categories)), side='left')
+    token_ends = np.searchsorted(token_codes[row_order], np.arange(len(result_tokens.categories)), side='right')
+
+    # Drop positions of tokens not contained in result, they never show up in the output
+    position_token_codes = pd.Categorical(positions[TOKEN_COLUMN], categories=result_tokens.categories).codes
+    known = position_token_codes >= 0
+    if not known.any():
+        return states
+    position_token_codes = position_token_codes[known].astype(np.int64)
+    position_rank = position_rank[known]
+    position_state = positions['state'].to_numpy()[known]
+    position_carry = positions['carry_state'].to_numpy()[known]
+    position_trader = pd.Categorical(positions[TRADER_COLUMN].to_numpy()[known], categories=trader_ids).codes
+
+    # Positions are sorted by (trader, token, minute), so group ids increase monotonically
+    new_group = np.ones(len(position_rank), dtype=bool)
+    new_group[1:] = (position_trader[1:] != position_trader[:-1]) | (
+            position_token_codes[1:] != position_token_codes[:-1])
+    group_id = np.cumsum(new_group) - 1
+    group_starts = np.flatnonzero(new_group)
+    group_token = position_token_codes[group_starts]
+    group_trader = position_trader[group_starts]
+    position_keys = group_id * minute_count + position_rank
+
+    # Expand every group to the result rows of its token
+    row_counts = token_ends[group_token] - token_starts[group_token]
+    query_group = np.repeat(np.arange(len(group_starts)), row_counts)
+    offsets = np.arange(len(query_group)) - np.repeat(np.cumsum(row_counts) - row_counts, row_counts)
+    query_rows = row_order[np.repeat(token_starts[group_token], row_counts) + offsets]
+    query_keys = query_group * minute_count + result_rank[query_rows]
+
+    last_position = np.searchsorted(position_keys, query_keys, side='right') - 1
+    has_position = (last_position >= 0) & (last_position >= group_starts[query_group])
+    last_position = np.where(has_position, last_position, 0)
+    exact_minute = has_position & (position_rank[last_position] == result_rank[query_rows])
+
+    carry = position_carry[last_position]
+    carry = np.where(np.isnan(carry), TraderState.NO_ACTION, carry).astype(np.int64)
+    values = np.where(exact_minute, position_state[last_position], np.where(has_position, carry, TraderState.NO_ACTION))
+
+    states[query_rows, group_trader[query_group]] = values
+    return states
+
+
+def add_trader_info_to_price_data_vectorized(
+        price_data: pd.DataFrame,
+        trader: pd.DataFrame,
+        trades: pd.DataFrame
+) -> pd.DataFrame:
+    """
+    Columnar version of add_trader_info_to_price_data.
+
+    Computes all trader state columns in one pass instead of looping over traders, tokens and position rows, the
+    output is identical to add_trader_info_to_price_data.
+
+    Parameters:
+    price_data (pd.DataFrame): DataFrame with trading_minute, token, buy_volume, sell_volume, latest_price
+    trader (pd.DataFrame): DataFrame with trader IDs
+    trades (pd.DataFrame): DataFrame with individual trades (trader_id, token, block_time, buy, token_sold_amount/token_bought_amount)
+
+    Returns:
+    pd.DataFrame: Original price data with additional columns for each trader's state
+    """
+    # Prepare data
+    result, trades = prepare_timestamps(price_data, trades)
+    prepare_data_types(trades)
+
+    trader_ids = trader['trader'].unique()
+    trades = trades[trades[TRADER_COLUMN].isin(trader_ids)]
+
+    positions = calculate_trader_minute_positions(trades)
+    positions = determine_trader_states(positions)
+    states = get_trader_state_matrix(result, trader_ids, positions)
+
+    state_columns = pd.DataFrame(
+        states,
+        columns=[f'trader_{trader_id}_state' for trader_id in trader_ids],
+        index=result.index
+    )
+    result = pd.concat([result, state_columns], axis=1)
+    result = filter_rows_before_first_action(result)
+
+    return result
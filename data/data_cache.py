@@ -0,0 +1,297 @@
+import hashlib
+import json
+import logging
+import os
+import pickle
+import time
+import uuid
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.feather as feather
+
+from constants import CACHE_FOLDER
+
+logger = logging.getLogger(__name__)
+
+DATA_CACHE_FOLDER = os.path.join(CACHE_FOLDER, "data_cache")
+DATA_CACHE_MAX_BYTES = 50 * 1024 ** 3
+# objects younger than this are never garbage collected, another process could be about to index them
+ORPHAN_GRACE_SECONDS = 60 * 60
+HASH_CHUNK_BYTES = 8 * 1024 ** 2
+
+ARROW_KIND = "arrow"
+PICKLE_KIND = "pickle"
+TUPLE_KIND = "tuple"
+
+
+def get_key_hash(key: str) -> str:
+    return hashlib.sha256(key.encode()).hexdigest()
+
+
+def get_file_hash(path: str) -> str:
+    file_hash = hashlib.sha256()
+    with open(path, "rb") as f:
+        while chunk := f.read(HASH_CHUNK_BYTES):
+            file_hash.update(chunk)
+
+    return file_hash.hexdigest()
+
+
+class DataCache:
+    """
+    Content addressed cache of DataFrames and other objects shared by all processes.
+
+    DataFrames are stored as uncompressed Feather (Arrow IPC) files and read with a memory map, read only DataFrames
+    keep pointing into the mapped file, so a read only touches the pages (and columns) that are used. Objects Arrow can
+    not store are pickled, tuples are stored element by element so the DataFrames in them are memory mapped too. Every
+    object file is named by the hash of its content, an index file per key holds the metadata (source, created_at,
+    schema, size) and references the objects, so equal data is stored once. All files are written to a temporary name
+    and renamed, a reader never sees a partial file.
+
+    The modification time of the index file is the last access, when the cache exceeds max_bytes the least recently
+    used keys are evicted. Keys that only exist as pickle of the previous cache (CACHE_FOLDER/<key>.pkl) are
+    copied into the cache on their first read.
+    """
+
+    def __init__(self, directory: str = DATA_CACHE_FOLDER, max_bytes: Optional[int] = DATA_CACHE_MAX_BYTES,
+                 legacy_folder: Optional[str] = CACHE_FOLDER):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.legacy_folder = legacy_folder
+        self.objects_folder = os.path.join(directory, "objects")
+        self.index_folder = os.path.join(directory, "index")
+        os.makedirs(self.objects_folder, exist_ok=True)
+        os.makedirs(self.index_folder, exist_ok=True)
+
+    def get_index_path(self, key: str) -> str:
+        return os.path.join(self.index_folder, f"{get_key_hash(key)}.json")
+
+    def get_object_path(self, object_id: str) -> str:
+        return os.path.join(self.objects_folder, object_id)
+
+    def get_legacy_path(self, key: str) -> Optional[str]:
+        if self.legacy_folder is None:
+            return None
+
+        return os.path.join(self.legacy_folder, f"{key}.pkl")
+
+    def get_temp_path(self) -> str:
+        return os.path.join(self.objects_folder, f".tmp-{uuid.uuid4().hex}")
+
+    def store_file(self, temp_path: str, extension: str) -> str:
+        object_id = f"{get_file_hash(temp_path)}.{extension}"
+        path = self.get_object_path(object_id)
+        if os.path.exists(path):
+            os.remove(temp_path)
+            os.utime(path)
+        else:
+            os.replace(temp_path, path)
+
+        return object_id
+
+    def write_object(self, data: Any) -> dict:
+        if isinstance(data, tuple):
+            items = [self.write_object(item) for item in data]
+            return {"kind": TUPLE_KIND, "items": items, "size": sum(item["size"] for item in items)}
+
+        temp_path = self.get_temp_path()
+        try:
+            if isinstance(data, pd.DataFrame) and all(isinstance(column, str) for column in data.columns):
+                try:
+                    # one record batch, so read only columns map the file without a copy
+                    table = pa.Table.from_pandas(data).combine_chunks()
+                    feather.write_feather(table, temp_path, compression="uncompressed", chunksize=max(len(table), 1))
+                    object_id = self.store_file(temp_path, "arrow")
+                    return {"kind": ARROW_KIND, "object": object_id, "size": os.path.getsize(
+                        self.get_object_path(object_id)), "rows": len(data),
+                            "schema": {field.name: str(field.type) for field in table.schema}}
+                except (pa.ArrowInvalid, pa.ArrowTypeError, pa.ArrowNotImplementedError) as e:
+                    logger.info(f"DataFrame not storable as Arrow, use pickle: {str(e)}")
+
+            with open(temp_path, "wb") as f:
+                pickle.dump(data, f, protocol=pickle.HIGHEST_PROTOCOL)
+            object_id = self.store_file(temp_path, "pkl")
+            return {"kind": PICKLE_KIND, "object": object_id, "type": type(data).__name__,
+                    "size": os.path.getsize(self.get_object_path(object_id))}
+        finally:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+
+    def read_object(self, entry: dict, columns: Optional[List[str]] = None, read_only: bool = False) -> Any:
+        if entry["kind"] == TUPLE_KIND:
+            return tuple(self.read_object(item, columns, read_only) for item in entry["items"])
+
+        path = self.get_object_path(entry["object"])
+        if entry["kind"] == ARROW_KIND:
+            # without split_blocks pandas consolidates the columns into writable copies
+            table = feather.read_table(path, columns=columns, memory_map=True)
+            return table.to_pandas(split_blocks=read_only)
+
+        with open(path, "rb") as f:
+            return pickle.load(f)
+
+    def put(self, key: str, data: Any, source: Optional[str] = None) -> dict:
+        """
+        Stores data under key, replacing a previous entry.
+
+        Args:
+            key: Name of the entry, e.g. a query id or a file name with config hash.
+            data: DataFrame or any picklable object.
+            source: Where the data came from, stored in the metadata.
+
+        Returns:
+            dict: Metadata of the entry.
+        """
+        metadata = {"key": key, "source": source, "created_at": datetime.utcnow().isoformat(),
+                    "entry": self.write_object(data)}
+        metadata["size"] = metadata["entry"]["size"]
+        index_path = self.get_index_path(key)
+        temp_path = index_path + f".tmp-{uuid.uuid4().hex}"
+        with open(temp_path, "w") as f:
+            json.dump(metadata, f)
+        os.replace(temp_path, index_path)
+
+        self.evict()
+        return metadata
+
+    def metadata(self, key: str) -> Optional[dict]:
+        try:
+            with open(self.get_index_path(key)) as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+
+    def contains(self, key: str) -> bool:
+        if os.path.exists(self.get_index_path(key)):
+            return True
+
+        legacy_path = self.get_legacy_path(key)
+        return legacy_path is not None and os.path.exists(legacy_path)
+
+    def get(self, key: str, columns: Optional[List[str]] = None, read_only: bool = False) -> Optional[Any]:
+        """
+        Returns the data stored under key or None.
+
+        Args:
+            key: Name of the entry.
+            columns: Only read these columns of stored DataFrames.
+            read_only: Return DataFrames backed by the memory mapped file instead of a copy. Reading is almost free,
+                new columns can be added but existing values can not be changed in place.
+        """
+        metadata = self.metadata(key)
+        if metadata is None:
+            return self.migrate_legacy(key)
+
+        try:
+            data = self.read_object(metadata["entry"], columns, read_only)
+        except FileNotFoundError:
+            logger.warning("Cache object missing, entry removed", extra={"key": key})
+            self.delete(key)
+            return None
+
+        os.utime(self.get_index_path(key))
+        return data
+
+    def migrate_legacy(self, key: str) -> Optional[Any]:
+        legacy_path = self.get_legacy_path(key)
+        if legacy_path is None or not os.path.exists(legacy_path):
+            return None
+
+        with open(legacy_path, "rb") as f:
+            data = pickle.load(f)
+
+        try:
+            self.put(key, data, source="legacy pickle")
+        except Exception:
+            logger.exception("Failed to migrate pickle cache", extra={"key": key})
+
+        return data
+
+    def delete(self, key: str):
+        index_path = self.get_index_path(key)
+        if os.path.exists(index_path):
+            os.remove(index_path)
+
+    def list_entries(self) -> List[dict]:
+        entries = list()
+        for name in os.listdir(self.index_folder):
+            if not name.endswith(".json"):
+                continue
+
+            path = os.path.join(self.index_folder, name)
+            try:
+                with open(path) as f:
+                    metadata = json.load(f)
+                metadata["last_access"] = os.path.getmtime(path)
+                metadata["index_path"] = path
+                entries.append(metadata)
+            except (FileNotFoundError, json.JSONDecodeError):
+                continue
+
+        return entries
+
+    def evict(self):
+        """Removes the least recently used entries above max_bytes and objects no entry references anymore."""
+        entries = sorted(self.list_entries(), key=lambda entry: entry["last_access"])
+        object_sizes = self.get_object_sizes()
+        referenced = get_referenced_objects(entries)
+
+        if self.max_bytes is not None:
+            total = sum(object_sizes.get(object_id, 0) for object_id in referenced)
+            while total > self.max_bytes and len(entries) > 1:
+                entry = entries.pop(0)
+                logger.info("Evict cache entry", extra={"key": entry["key"], "size": entry["size"]})
+                os.remove(entry["index_path"])
+                referenced = get_referenced_objects(entries)
+                total = sum(object_sizes.get(object_id, 0) for object_id in referenced)
+
+        now = time.time()
+        for object_id in object_sizes.keys() - referenced:
+            path = self.get_object_path(object_id)
+            try:
+                if now - os.path.getmtime(path) > ORPHAN_GRACE_SECONDS:
+                    os.remove(path)
+            except FileNotFoundError:
+                continue
+
+    def get_object_sizes(self) -> Dict[str, int]:
+        sizes = dict()
+        for name in os.listdir(self.objects_folder):
+            if name.startswith(".tmp-"):
+                continue
+            try:
+                sizes[name] = os.path.getsize(self.get_object_path(name))
+            except FileNotFoundError:
+                continue
+
+        return sizes
+
+
+def get_referenced_objects(entries: List[dict]) -> set:
+    referenced = set()
+
+    def add(entry: dict):
+        if entry["kind"] == TUPLE_KIND:
+            for item in entry["items"]:
+                add(item)
+        else:
+            referenced.add(entry["object"])
+
+    for metadata in entries:
+        add(metadata["entry"])
+
+    return referenced
+
+
+_data_cache: Optional[DataCache] = None
+
+
+def get_data_cache() -> DataCache:
+    global _data_cache
+    if _data_cache is None:
+        _data_cache = DataCache()
+
+    return _data_cache
@@ -1,6 +1,9 @@
+import asyncio
 import logging
+import weakref
 
 import redis
+import redis.asyncio
 
 from constants import REDIS_URL
 from env_data.get_env_value import get_env_value
@@ -22,3 +25,34 @@ def get_async_redis() -> redis.asyncio.Redis:
 
 def get_sync_redis() -> redis.Redis:
     return redis.Redis(host=get_redis_url(), port=6379, db=0)
+
+
+_shared_async_redis: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, redis.asyncio.Redis] = \
+    weakref.WeakKeyDictionary()
+
+
+def get_shared_async_redis() -> redis.asyncio.Redis:
+    """
+    Redis client of the running event loop, reused by all callers of the loop.
+
+    The connections of a client are bound to the loop they were opened in and RQ runs every job in a new loop, so
+    close_shared_async_redis() has to be called before the loop ends.
+    """
+    loop = asyncio.get_running_loop()
+    r = _shared_async_redis.get(loop)
+    if r is None:
+        r = get_async_redis()
+        _shared_async_redis[loop] = r
+
+    return r
+
+
+async def close_shared_async_redis():
+    r = _shared_async_redis.pop(asyncio.get_running_loop(), None)
+    if r is None:
+        return
+
+    try:
+        await r.aclose()
+    except Exception as e:
+        logger.exception("Failed to close redis client")
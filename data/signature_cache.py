@@ -0,0 +1,89 @@
+import logging
+import time
+from collections import OrderedDict
+from typing import Callable
+
+import redis.asyncio
+
+from constants import SEEN_SIGNATURE
+from data.redis_helper import get_shared_async_redis
+
+logger = logging.getLogger(__name__)
+
+SIGNATURE_CACHE_MAX_SIZE = 100_000
+SIGNATURE_TTL_SECONDS = 24 * 60 * 60
+
+
+class SignatureCache:
+    """
+    De-duplication of transaction signatures shared by all event workers.
+
+    A process local LRU answers repeats without any round-trip, otherwise the signature is claimed with an atomic
+    SET NX EX in redis, so only the first worker that sees a signature processes it. Entries expire after ttl seconds
+    locally and in redis. If redis is not reachable only the local LRU is used. A signature whose transaction could
+    not be loaded is released again, so a redelivery of the notification is processed.
+    """
+
+    def __init__(self, max_size: int = SIGNATURE_CACHE_MAX_SIZE, ttl: int = SIGNATURE_TTL_SECONDS,
+                 redis_factory: Callable[[], redis.asyncio.Redis] = get_shared_async_redis):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.redis_factory = redis_factory
+        self._local: OrderedDict[str, float] = OrderedDict()
+
+    def seen_locally(self, signature: str) -> bool:
+        expires_at = self._local.get(signature)
+        if expires_at is None:
+            return False
+
+        if expires_at < time.monotonic():
+            del self._local[signature]
+            return False
+
+        self._local.move_to_end(signature)
+        return True
+
+    def remember(self, signature: str):
+        self._local[signature] = time.monotonic() + self.ttl
+        self._local.move_to_end(signature)
+        while len(self._local) > self.max_size:
+            self._local.popitem(last=False)
+
+    async def claim(self, signature: str) -> bool:
+        """
+        Marks a signature as seen.
+
+        Args:
+            signature: Transaction signature or any other key of a notification.
+
+        Returns:
+            bool: True if the signature was not seen before and should be processed.
+        """
+        if self.seen_locally(signature):
+            return False
+
+        self.remember(signature)
+        try:
+            return bool(await self.redis_factory().set(f"{SEEN_SIGNATURE}:{signature}", 1, nx=True, ex=self.ttl))
+        except Exception as e:
+            logger.exception("Failed to claim signature in redis", extra={"signature": signature})
+            return True
+
+    async def release(self, signature: str):
+        """Removes a claimed signature locally and in redis."""
+        self._local.pop(signature, None)
+        try:
+            await self.redis_factory().delete(f"{SEEN_SIGNATURE}:{signature}")
+        except Exception as e:
+            logger.exception("Failed to release signature in redis", extra={"signature": signature})
+
+
+signature_cache = SignatureCache()
+
+
+async def claim_signature(signature: str) -> bool:
+    return await signature_cache.claim(signature)
+
+
+async def release_signature(signature: str):
+    await signature_cache.release(signature)
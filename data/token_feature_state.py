@@ -0,0 +1,172 @@
+import logging
+from datetime import datetime, timedelta
+from typing import List, Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+from constants import TOKEN_COLUMN, TRADING_MINUTE_COLUMN, PRICE_COLUMN, TOTAL_VOLUME_COLUMN, MARKET_CAP_USD, \
+    CUMULATIVE_VOLUME, PRICE_PCT_CHANGE, TOTAL_VOLUME_PCT_CHANGE, PERCENTAGE_OF_1_MILLION_MARKET_CAP, \
+    AGE_IN_MINUTES_COLUMN, CHANGE_FROM_ATL, CHANGE_FROM_ATH, LAUNCH_DATE_COLUMN
+from data.feature_engineering import calculate_market_cap_in_usd
+from data.trade_data import get_end_of_current_minute
+from dto.trade_model import Trade
+
+logger = logging.getLogger(__name__)
+
+
+def get_traders_from_columns(columns: List[str]) -> List[str]:
+    traders = list()
+    for col in columns:
+        if "_sol_" in col:
+            trader = col.split("_")[0]
+            if trader not in traders:
+                traders.append(trader)
+
+    return traders
+
+
+def calculate_single_pct_change(previous_value: Optional[float], current_value: float) -> float:
+    """Percentage change between two values with the same zero/inf handling as calculate_pct_change."""
+    if previous_value is None or previous_value == 0 or current_value == 0:
+        return 0.0
+
+    pct_change = (current_value - previous_value) / previous_value
+    if np.isinf(pct_change) or np.isnan(pct_change):
+        return 0.0
+
+    return float(pct_change)
+
+
+def calculate_change_from_extreme(price: float, extreme: float) -> float:
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return float((np.float64(price) - extreme) / np.float64(extreme) * 100)
+
+
+class TokenFeatureState:
+    """
+    Incrementally maintained feature row of a watched token.
+
+    Keeps the cumulative sol spent/received per trader, the running ATH/ATL, the cumulative volume and the previous
+    price/volume of the token. Every minute only the new trades and the new candles are applied, the resulting row
+    contains the same feature columns as the training data.
+    """
+
+    def __init__(self, token: str, launch_time: datetime, traders: List[str]):
+        self.token = token
+        self.launch_time = launch_time
+        self.last_trade_id = 0
+        self.last_trading_minute: Optional[datetime] = None
+        self.last_candle_minute: Optional[datetime] = None
+
+        self.sol_amount_spent: Dict[str, float] = {trader: 0.0 for trader in traders}
+        self.sol_amount_received: Dict[str, float] = {trader: 0.0 for trader in traders}
+        self.active_traders = set()
+        self.pending_trades: List[Trade] = list()
+
+        self.cumulative_volume = 0.0
+        self.running_ath: Optional[float] = None
+        self.running_atl: Optional[float] = None
+        self.previous_price: Optional[float] = None
+        self.previous_volume: Optional[float] = None
+        self.price: Optional[float] = None
+        self.volume: Optional[float] = None
+
+    def add_trades(self, trades: List[Trade], last_trade_id: int):
+        """Queue new trades, they are applied once their trading minute is reached."""
+        self.last_trade_id = max(self.last_trade_id, last_trade_id)
+        self.pending_trades.extend(trades)
+
+    def apply_trades(self, trading_minute: datetime):
+        end_of_minute = get_end_of_current_minute(trading_minute)
+        pending_trades = list()
+
+        for trade in self.pending_trades:
+            if trade.get_time() > end_of_minute:
+                pending_trades.append(trade)
+                continue
+
+            self.active_traders.add(trade.trader)
+            self.sol_amount_spent.setdefault(trade.trader, 0.0)
+            self.sol_amount_received.setdefault(trade.trader, 0.0)
+            if trade.buy:
+                self.sol_amount_spent[trade.trader] += trade.sol_amount
+            else:
+                self.sol_amount_received[trade.trader] += trade.sol_amount
+
+        self.pending_trades = pending_trades
+
+    def has_valid_trades(self, trading_minute: datetime) -> bool:
+        end_of_minute = get_end_of_current_minute(trading_minute)
+        return len(self.active_traders) > 0 or any(trade.get_time() <= end_of_minute for trade in self.pending_trades)
+
+    def get_missing_minutes(self, trading_minute: datetime) -> int:
+        """Amount of 1m candles needed to bring the state up to the trading minute (including it)."""
+        first_minute = self.launch_time.replace(second=0, microsecond=0) if self.last_candle_minute is None \
+            else self.last_candle_minute + timedelta(minutes=1)
+
+        return max(int((trading_minute - first_minute).total_seconds() // 60) + 1, 1)
+
+    def add_candle(self, price: float, volume: float):
+        self.previous_price = self.price
+        self.previous_volume = self.volume
+        self.price = price
+        self.volume = volume
+
+        self.cumulative_volume += volume
+        self.running_ath = price if self.running_ath is None else max(self.running_ath, price)
+        self.running_atl = price if self.running_atl is None else min(self.running_atl, price)
+
+    def add_candles(self, candles: pd.DataFrame):
+        for trading_minute, price, volume in zip(pd.to_datetime(candles[TRADING_MINUTE_COLUMN]),
+                                                 pd.to_numeric(candles[PRICE_COLUMN], errors='coerce'),
+                                                 pd.to_numeric(candles[TOTAL_VOLUME_COLUMN], errors='coerce')):
+            if self.last_candle_minute is not None and trading_minute <= self.last_candle_minute:
+                continue
+
+            self.add_candle(float(price), float(volume))
+            self.last_candle_minute = trading_minute.to_pydatetime()
+
+    def get_feature_row(self, trading_minute: datetime) -> pd.DataFrame:
+        market_cap = calculate_market_cap_in_usd(float(self.price))
+        row = {TRADING_MINUTE_COLUMN: trading_minute}
+
+        for trader in self.sol_amount_spent.keys():
+            row[f"{trader}_sol_amount_spent"] = self.sol_amount_spent[trader]
+            row[f"{trader}_sol_amount_received"] = self.sol_amount_received[trader]
+
+        row.update({
+            TOKEN_COLUMN: self.token,
+            TOTAL_VOLUME_COLUMN: self.volume,
+            PRICE_COLUMN: self.price,
+            LAUNCH_DATE_COLUMN: self.launch_time,
+            MARKET_CAP_USD: market_cap,
+            CUMULATIVE_VOLUME: self.cumulative_volume,
+            PRICE_PCT_CHANGE: calculate_single_pct_change(self.previous_price, self.price),
+            TOTAL_VOLUME_PCT_CHANGE: calculate_single_pct_change(self.previous_volume, self.volume),
+            PERCENTAGE_OF_1_MILLION_MARKET_CAP: market_cap / 1_000_000,
+            AGE_IN_MINUTES_COLUMN: (trading_minute - self.launch_time).total_seconds() / 60,
+            CHANGE_FROM_ATL: calculate_change_from_extreme(self.price, self.running_atl),
+            CHANGE_FROM_ATH: calculate_change_from_extreme(self.price, self.running_ath),
+        })
+
+        return pd.DataFrame([row])
+
+    def update(self, trading_minute: datetime, candles: Optional[pd.DataFrame]) -> Optional[pd.DataFrame]:
+        """
+        Apply the trades and candles up to the trading minute and return the feature row.
+
+        Returns:
+            Optional[pd.DataFrame]: One row feature DataFrame or None if there is no candle for the trading minute.
+        """
+        self.apply_trades(trading_minute)
+        if candles is not None and len(candles) > 0:
+            self.add_candles(candles)
+
+        if self.last_candle_minute is None or self.last_candle_minute < trading_minute:
+            logger.error("Missing candle for trading minute",
+                         extra={"token": self.token, "trading_minute": trading_minute})
+            return None
+
+        self.last_trading_minute = trading_minute
+        return self.get_feature_row(trading_minute)
@@ -0,0 +1,68 @@
+import logging
+import pickle
+from typing import List, Tuple
+
+import pandas as pd
+import pyarrow as pa
+
+logger = logging.getLogger(__name__)
+
+PICKLE_FORMAT = "pickle"
+ARROW_FORMAT = "arrow"
+
+
+def serialize_dataframe(df: pd.DataFrame) -> Tuple[bytes, str]:
+    """
+    Serializes a DataFrame for a BYTEA column as Arrow IPC stream.
+
+    DataFrames Arrow can not represent (e.g. object columns with mixed types) are pickled instead.
+
+    Returns:
+        Tuple[bytes, str]: Serialized data and its format, stored next to it in the data_format column.
+    """
+    try:
+        table = pa.Table.from_pandas(df)
+    except (pa.ArrowInvalid, pa.ArrowTypeError, pa.ArrowNotImplementedError) as e:
+        logger.warning("DataFrame not convertible to arrow, store as pickle", extra={"error": str(e)})
+        return pickle.dumps(df), PICKLE_FORMAT
+
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+
+    return sink.getvalue().to_pybytes(), ARROW_FORMAT
+
+
+def deserialize_table(data, data_format: str) -> pa.Table:
+    if data_format == ARROW_FORMAT:
+        # reads the buffer returned by psycopg2 without copying it
+        return pa.ipc.open_stream(pa.py_buffer(data)).read_all()
+
+    return pa.Table.from_pandas(pickle.loads(data))
+
+
+def deserialize_dataframe(data, data_format: str) -> pd.DataFrame:
+    if data_format == ARROW_FORMAT:
+        return deserialize_table(data, data_format).to_pandas()
+
+    return pickle.loads(data)
+
+
+def concat_tables(tables: List[pa.Table]) -> pa.Table:
+    """
+    Concatenates the tables of many rows into one table.
+
+    The chunks of the tables are referenced instead of copied. Columns missing in some tables (e.g. traders of other
+    tokens) are filled with nulls and numeric columns are widened to a common type (int64 sums of legacy rows, float64
+    of new rows), the pandas index metadata of the single rows is dropped.
+    """
+    if len(tables) == 0:
+        return pa.table({})
+
+    tables = [drop_index_columns(table) for table in tables]
+    return pa.concat_tables(tables, promote_options="permissive")
+
+
+def drop_index_columns(table: pa.Table) -> pa.Table:
+    index_columns = [name for name in table.column_names if name.startswith("__index_level_")]
+    return table.drop_columns(index_columns).replace_schema_metadata(None)
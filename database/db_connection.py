@@ -1,12 +1,34 @@
+import asyncio
+import logging
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from functools import partial
+from typing import Callable, Deque, Dict, Iterator, List, Optional, Tuple, TypeVar
+
 import psycopg2
+from psycopg2 import extensions
 from psycopg2.extensions import connection
+from psycopg2.pool import PoolError
 
 from config.docker_helper import is_docker_container
-from constants import DATABASE_NAME, POSTGRES_USER, POSTGRES_PASSWORD
+from constants import DATABASE_NAME, POSTGRES_USER, POSTGRES_PASSWORD, DB_POOL_MIN_SIZE, DB_POOL_MAX_SIZE
 from env_data.get_env_value import get_env_value
 
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+DEFAULT_POOL_MIN_SIZE = 1
+DEFAULT_POOL_MAX_SIZE = 10
+HEALTH_CHECK_INTERVAL_SECONDS = 30
+CHECKOUT_TIMEOUT_SECONDS = 30
+
 
-def get_db_connection() -> connection:
+def create_db_connection() -> connection:
     return psycopg2.connect(
         dbname=DATABASE_NAME,
         user=get_env_value(POSTGRES_USER),
@@ -17,3 +39,222 @@ def get_db_connection() -> connection:
 
 def get_pg_url() -> str:
     return 'postgres' if is_docker_container() else '194.164.77.162'
+
+
+class DatabasePool:
+    """
+    Thread safe pool of psycopg2 connections.
+
+    Keeps up to max_idle open connections between calls and never hands out more than max_size at once, a checkout
+    waits for a free connection instead. Connections that were idle for longer than the health check interval are
+    tested with SELECT 1 before they are handed out and replaced if they are broken.
+    """
+
+    def __init__(self, min_size: int, max_size: int, max_idle: Optional[int] = None,
+                 health_check_interval: float = HEALTH_CHECK_INTERVAL_SECONDS,
+                 checkout_timeout: float = CHECKOUT_TIMEOUT_SECONDS,
+                 connect: Callable[[], connection] = create_db_connection):
+        self.min_size = min_size
+        self.max_size = max_size
+        self.max_idle = max_size if max_idle is None else max_idle
+        self.health_check_interval = health_check_interval
+        self.checkout_timeout = checkout_timeout
+        self.connect = connect
+        self.created_connections = 0
+
+        self._idle: Deque[Tuple[connection, float]] = deque()
+        self._slots = threading.BoundedSemaphore(max_size)
+        self._lock = threading.Lock()
+
+        for _ in range(min_size):
+            self._idle.append((self._connect(), time.monotonic()))
+
+    def _connect(self) -> connection:
+        conn = self.connect()
+        with self._lock:
+            self.created_connections += 1
+        return conn
+
+    def is_healthy(self, conn: connection, last_used: float) -> bool:
+        if conn.closed:
+            return False
+
+        if time.monotonic() - last_used < self.health_check_interval:
+            return True
+
+        try:
+            with conn.cursor() as cursor:
+                cursor.execute("SELECT 1")
+            conn.rollback()
+            return True
+        except Exception as e:
+            logger.warning("Database connection failed health check")
+            return False
+
+    def checkout(self) -> connection:
+        if not self._slots.acquire(timeout=self.checkout_timeout):
+            raise PoolError("Timed out waiting for a database connection")
+
+        try:
+            while True:
+                with self._lock:
+                    item = self._idle.pop() if self._idle else None
+
+                if item is None:
+                    return self._connect()
+
+                conn, last_used = item
+                if self.is_healthy(conn, last_used):
+                    return conn
+
+                self._close(conn)
+        except Exception:
+            self._slots.release()
+            raise
+
+    def checkin(self, conn: connection):
+        try:
+            if not conn.closed:
+                status = conn.info.transaction_status
+                if status == extensions.TRANSACTION_STATUS_UNKNOWN:
+                    self._close(conn)
+                    return
+
+                if status != extensions.TRANSACTION_STATUS_IDLE:
+                    conn.rollback()
+
+                with self._lock:
+                    if len(self._idle) < self.max_idle:
+                        self._idle.append((conn, time.monotonic()))
+                        return
+
+                self._close(conn)
+        except Exception as e:
+            logger.warning("Failed to return database connection to pool")
+            self._close(conn)
+        finally:
+            self._slots.release()
+
+    @staticmethod
+    def _close(conn: connection):
+        try:
+            conn.close()
+        except Exception:
+            pass
+
+    @contextmanager
+    def connection(self) -> Iterator[connection]:
+        """Check out a connection for one call, commits on success and rolls back on errors."""
+        conn = self.checkout()
+        try:
+            with conn:
+                yield conn
+        finally:
+            self.checkin(conn)
+
+    def close(self):
+        with self._lock:
+            idle = list(self._idle)
+            self._idle.clear()
+
+        for conn, _ in idle:
+            self._close(conn)
+
+
+class AsyncDatabasePool:
+    """
+    asyncio front of a DatabasePool.
+
+    Every call checks out a connection on a thread pool with one thread per pool connection, so waiting for a
+    connection or a database round trip never blocks the event loop.
+    """
+
+    def __init__(self, pool: DatabasePool):
+        self.pool = pool
+        self.executor = ThreadPoolExecutor(max_workers=pool.max_size, thread_name_prefix="db_pool")
+
+    def _run_with_connection(self, function: Callable[..., T], *args) -> T:
+        with self.pool.connection() as conn:
+            return function(conn, *args)
+
+    async def run(self, function: Callable[..., T], *args) -> T:
+        """Run function(conn, *args) with a pooled connection."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, partial(self._run_with_connection, function, *args))
+
+    async def run_sync(self, function: Callable[..., T], *args) -> T:
+        """Run a function that checks out its own connection (the database/*_table.py API) on the pool threads."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, partial(function, *args))
+
+
+# Pools are kept per process, a forked worker must not reuse the sockets of its parent
+_pools: Dict[int, DatabasePool] = dict()
+_async_pools: Dict[int, AsyncDatabasePool] = dict()
+# pools inherited from the parent are never closed or freed, psycopg2 would send Terminate on the parent's connections
+_inherited_pools: List[DatabasePool] = list()
+_pool_lock = threading.Lock()
+
+
+def get_pool_size(key: str, default: int) -> int:
+    value = get_env_value(key)
+    return default if value is None else int(value)
+
+
+def detach_inherited_pools(pid: int):
+    for other_pid in [other_pid for other_pid in _pools.keys() if other_pid != pid]:
+        _inherited_pools.append(_pools.pop(other_pid))
+        _async_pools.pop(other_pid, None)
+
+
+def get_db_pool() -> DatabasePool:
+    pid = os.getpid()
+    pool = _pools.get(pid)
+    if pool is not None:
+        return pool
+
+    with _pool_lock:
+        if pid not in _pools:
+            detach_inherited_pools(pid)
+            _pools[pid] = DatabasePool(get_pool_size(DB_POOL_MIN_SIZE, DEFAULT_POOL_MIN_SIZE),
+                                       get_pool_size(DB_POOL_MAX_SIZE, DEFAULT_POOL_MAX_SIZE))
+        return _pools[pid]
+
+
+def set_db_pool(pool: DatabasePool):
+    pid = os.getpid()
+    with _pool_lock:
+        detach_inherited_pools(pid)
+        _async_pools.pop(pid, None)
+        _pools[pid] = pool
+
+
+def get_async_db_pool() -> AsyncDatabasePool:
+    pool = get_db_pool()
+    pid = os.getpid()
+    with _pool_lock:
+        if pid not in _async_pools or _async_pools[pid].pool is not pool:
+            _async_pools[pid] = AsyncDatabasePool(pool)
+        return _async_pools[pid]
+
+
+async def run_in_db_pool(function: Callable[..., T], *args) -> T:
+    """
+    Runs a function of the database/*_table.py API on the pool threads.
+
+    If the pool can not be created (e.g. the database is down), the function runs on the default executor instead.
+    It fails to get its connection there, logs and returns its fallback value like a sync call.
+    """
+    try:
+        async_pool = get_async_db_pool()
+    except Exception as e:
+        logger.exception("Failed to create database pool", extra={"function": function.__name__})
+        return await asyncio.to_thread(function, *args)
+
+    return await async_pool.run_sync(function, *args)
+
+
+@contextmanager
+def get_db_connection() -> Iterator[connection]:
+    with get_db_pool().connection() as conn:
+        yield conn
@@ -1,7 +1,7 @@
 import logging
 from datetime import datetime
 
-from database.db_connection import get_db_connection
+from database.db_connection import get_db_connection, run_in_db_pool
 
 logger = logging.getLogger(__name__)
 
@@ -67,3 +67,11 @@ def signature_exists(signature: str) -> bool:
     except Exception as e:
         logger.exception("Failed to check if signature exists", extra={"signature": signature})
         return False
+
+
+async def insert_event_async(wallet: str, time: datetime, signature: str):
+    return await run_in_db_pool(insert_event, wallet, time, signature)
+
+
+async def signature_exists_async(signature: str) -> bool:
+    return await run_in_db_pool(signature_exists, signature)
@@ -0,0 +1,23 @@
+-- Indexes for the lookups of the live bot, all of them were sequential scans before.
+
+-- get_trades_by_token, get_new_trades_by_token(s): token = %s AND id > %s ORDER BY id
+CREATE INDEX IF NOT EXISTS trades_token_id_idx ON trades (token, id);
+
+-- signature_exists
+CREATE INDEX IF NOT EXISTS event_signature_idx ON event (signature);
+
+-- token_watch_exists, get_token_watch, set_end_time
+CREATE INDEX IF NOT EXISTS token_watch_token_idx ON token_watch (token);
+
+-- get_token_datasets_by_token: token = %s ORDER BY trading_minute
+CREATE INDEX IF NOT EXISTS token_dataset_token_minute_idx ON token_dataset (token, trading_minute);
+
+-- get_token_datasets_by_daterange: trading_minute BETWEEN %s AND %s
+CREATE INDEX IF NOT EXISTS token_dataset_minute_idx ON token_dataset (trading_minute);
+
+-- get_token_samples_by_token: token = %s ORDER BY id
+CREATE INDEX IF NOT EXISTS token_sample_token_id_idx ON token_sample (token, id);
+
+-- update_sell_price and the open trades of get_open_trades
+CREATE INDEX IF NOT EXISTS token_trade_history_token_idx ON token_trade_history (token);
+CREATE INDEX IF NOT EXISTS token_trade_history_open_idx ON token_trade_history (buy_time) WHERE sell_price IS NULL;
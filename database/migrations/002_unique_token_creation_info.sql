@@ -0,0 +1,7 @@
+-- One creation info per token, concurrent event workers could insert the same token twice.
+DELETE FROM token_creation_info a
+    USING token_creation_info b
+WHERE a.token = b.token
+  AND a.id > b.id;
+
+CREATE UNIQUE INDEX IF NOT EXISTS token_creation_info_token_key ON token_creation_info (token);
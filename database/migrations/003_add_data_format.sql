@@ -0,0 +1,6 @@
+-- Format of the serialized DataFrame in raw_data/raw, rows written before are pickles.
+ALTER TABLE token_dataset
+    ADD COLUMN IF NOT EXISTS data_format VARCHAR(16) NOT NULL DEFAULT 'pickle';
+
+ALTER TABLE token_sample
+    ADD COLUMN IF NOT EXISTS data_format VARCHAR(16) NOT NULL DEFAULT 'pickle';
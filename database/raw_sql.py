@@ -1,9 +1,17 @@
 import logging
+import os
+import re
+from typing import List, Tuple
 
+from constants import ROOT_DIR, MIGRATIONS_FOLDER
 from database.db_connection import get_db_connection
 
 logger = logging.getLogger(__name__)
 
+MIGRATION_FILE_PATTERN = re.compile(r"^(\d+)_(\w+)\.sql$")
+# pg_advisory_xact_lock key, serializes migrations of bots started at the same time
+MIGRATION_LOCK_ID = 7_141_983
+
 
 def run_sql_file(sql_file_path: str):
     try:
@@ -20,3 +28,68 @@ def run_sql_file(sql_file_path: str):
 
     except Exception as e:
         logger.exception("Failed to execute SQL script", extra={"file": sql_file_path})
+
+
+def get_migrations(migrations_dir: str) -> List[Tuple[int, str, str]]:
+    """
+    Lists the migration files of a folder.
+
+    Migration files are named <version>_<name>.sql and are applied in the order of their version.
+
+    Returns:
+        List[Tuple[int, str, str]]: (version, name, path) of every migration sorted by version.
+    """
+    migrations = list()
+    for file_name in os.listdir(migrations_dir):
+        match = MIGRATION_FILE_PATTERN.match(file_name)
+        if match is None:
+            continue
+
+        migrations.append((int(match.group(1)), match.group(2), os.path.join(migrations_dir, file_name)))
+
+    migrations.sort()
+    versions = [version for version, _, _ in migrations]
+    if len(versions) != len(set(versions)):
+        raise ValueError(f"Duplicate migration version in {migrations_dir}")
+
+    return migrations
+
+
+def run_migrations(migrations_dir: str = MIGRATIONS_FOLDER) -> List[int]:
+    """
+    Applies the migrations that are not yet recorded in schema_migrations.
+
+    Every migration runs in its own transaction together with its schema_migrations row, so a failed migration leaves
+    no partial changes behind and is retried on the next start. Later migrations are skipped after a failure.
+
+    Returns:
+        List[int]: Versions applied by this call.
+    """
+    applied = list()
+    for version, name, path in get_migrations(migrations_dir):
+        try:
+            with get_db_connection() as conn:
+                with conn.cursor() as cursor:
+                    cursor.execute("SELECT pg_advisory_xact_lock(%s)", (MIGRATION_LOCK_ID,))
+                    cursor.execute("SELECT 1 FROM schema_migrations WHERE version = %s", (version,))
+                    if cursor.fetchone() is not None:
+                        continue
+
+                    logger.info("Apply database migration", extra={"version": version, "migration": name})
+                    with open(path, 'r') as file:
+                        cursor.execute(file.read())
+
+                    cursor.execute("INSERT INTO schema_migrations (version, name) VALUES (%s, %s)", (version, name))
+                    conn.commit()
+                    applied.append(version)
+        except Exception as e:
+            logger.exception("Failed to apply database migration", extra={"version": version, "migration": name})
+            break
+
+    return applied
+
+
+def setup_database():
+    """Creates the tables and applies all pending migrations."""
+    run_sql_file(os.path.join(ROOT_DIR, "database/tables.sql"))
+    run_migrations()
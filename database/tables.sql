@@ -59,3 +59,10 @@ CREATE TABLE IF NOT EXISTS token_sample
     token VARCHAR(255) NOT NULL,
     raw   BYTEA        NOT NULL
 );
+
+CREATE TABLE IF NOT EXISTS schema_migrations
+(
+    version    INTEGER PRIMARY KEY,
+    name       VARCHAR(255) NOT NULL,
+    applied_at TIMESTAMP    NOT NULL DEFAULT (NOW() AT TIME ZONE 'utc')
+);
@@ -2,7 +2,10 @@ import logging
 from datetime import datetime
 from typing import Optional, Tuple, List, Dict
 
-from database.db_connection import get_db_connection
+from psycopg2.extras import execute_values
+
+from constants import BULK_INSERT_BATCH_SIZE
+from database.db_connection import get_db_connection, run_in_db_pool
 
 logger = logging.getLogger(__name__)
 
@@ -23,6 +26,7 @@ def insert_token_creation_info(token: str, creator: str, timestamp: datetime):
                 insert_query = """
                 INSERT INTO token_creation_info (token, creator, timestamp)
                 VALUES (%s, %s, %s)
+                ON CONFLICT DO NOTHING
                 """
 
                 # Execute the INSERT query with the token creation data
@@ -38,6 +42,41 @@ def insert_token_creation_info(token: str, creator: str, timestamp: datetime):
         })
 
 
+def insert_token_creation_infos(token_creation_infos: List[Tuple[str, str, datetime]],
+                                batch_size: int = BULK_INSERT_BATCH_SIZE) -> int:
+    """
+    Inserts many token creation infos in one transaction with multi row INSERT statements.
+
+    Tokens that already have a creation info are skipped. The conflict has no target, so the insert also works on a
+    database without the unique token index of migration 002 (entry points that do not run setup_database), it then
+    behaves like a plain insert.
+
+    Args:
+        token_creation_infos (List[Tuple[str, str, datetime]]): (token, creator, timestamp) of every token.
+        batch_size (int): Rows per INSERT statement.
+
+    Returns:
+        int: Number of rows passed to the database, 0 on failure.
+    """
+    if len(token_creation_infos) == 0:
+        return 0
+
+    try:
+        with get_db_connection() as conn:
+            with conn.cursor() as cursor:
+                insert_query = """
+                INSERT INTO token_creation_info (token, creator, timestamp)
+                VALUES %s
+                ON CONFLICT DO NOTHING
+                """
+                execute_values(cursor, insert_query, token_creation_infos, page_size=batch_size)
+                conn.commit()
+                return len(token_creation_infos)
+    except Exception as e:
+        logger.exception("Failed to insert token creation infos", extra={"tokens": len(token_creation_infos)})
+        return 0
+
+
 def select_token_creation_info(token: str) -> Optional[Tuple[datetime, str]]:
     """
     Selects token creation information from the token_creation_info table.
@@ -106,3 +145,20 @@ def select_token_creation_info_for_list(tokens: List[str]) -> Optional[Dict[str,
     except Exception as e:
         logger.exception("Failed to retrieve token creation info", extra={"token": tokens})
         return None
+
+
+async def insert_token_creation_info_async(token: str, creator: str, timestamp: datetime):
+    return await run_in_db_pool(insert_token_creation_info, token, creator, timestamp)
+
+
+async def select_token_creation_info_async(token: str) -> Optional[Tuple[datetime, str]]:
+    return await run_in_db_pool(select_token_creation_info, token)
+
+
+async def select_token_creation_info_for_list_async(tokens: List[str]) -> Optional[Dict[str, Tuple[datetime, str]]]:
+    return await run_in_db_pool(select_token_creation_info_for_list, tokens)
+
+
+async def insert_token_creation_infos_async(token_creation_infos: List[Tuple[str, str, datetime]],
+                                            batch_size: int = BULK_INSERT_BATCH_SIZE) -> int:
+    return await run_in_db_pool(insert_token_creation_infos, token_creation_infos, batch_size)
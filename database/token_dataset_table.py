@@ -1,7 +1,12 @@
 import logging
-import pickle
+from typing import Optional, List
 
-from database.db_connection import get_db_connection
+import pyarrow as pa
+from psycopg2.extras import execute_values
+
+from constants import BULK_INSERT_BATCH_SIZE
+from database.dataframe_blob import serialize_dataframe, deserialize_dataframe, deserialize_table, concat_tables
+from database.db_connection import get_db_connection, run_in_db_pool
 from dto.token_dataset_model import TokenDataset
 
 logger = logging.getLogger(__name__)
@@ -13,15 +18,17 @@ def insert_token_dataset(token_dataset: TokenDataset):
             with conn.cursor() as cursor:
                 # Prepare the SQL INSERT statement
                 insert_query = """
-                INSERT INTO token_dataset (token, trading_minute, raw_data)
-                VALUES (%s, %s, %s)
+                INSERT INTO token_dataset (token, trading_minute, raw_data, data_format)
+                VALUES (%s, %s, %s, %s)
                 """
 
                 # Execute the INSERT query with the token dataset data
+                raw_data, data_format = serialize_dataframe(token_dataset.raw_data)
                 cursor.execute(insert_query, (
                     token_dataset.token,
                     token_dataset.trading_minute,
-                    pickle.dumps(token_dataset.raw_data)
+                    raw_data,
+                    data_format
                 ))
 
                 # Commit the transaction
@@ -30,6 +37,38 @@ def insert_token_dataset(token_dataset: TokenDataset):
         logger.exception("Failed to insert token dataset", extra={"token": token_dataset.token})
 
 
+def insert_token_datasets(token_datasets: List[TokenDataset], batch_size: int = BULK_INSERT_BATCH_SIZE) -> int:
+    """
+    Inserts many token datasets in one transaction with multi row INSERT statements.
+
+    Args:
+        token_datasets (List[TokenDataset]): Datasets to insert.
+        batch_size (int): Rows per INSERT statement.
+
+    Returns:
+        int: Number of inserted datasets, 0 on failure.
+    """
+    if len(token_datasets) == 0:
+        return 0
+
+    try:
+        with get_db_connection() as conn:
+            with conn.cursor() as cursor:
+                insert_query = """
+                INSERT INTO token_dataset (token, trading_minute, raw_data, data_format)
+                VALUES %s
+                """
+                execute_values(cursor, insert_query, [
+                    (token_dataset.token, token_dataset.trading_minute, *serialize_dataframe(token_dataset.raw_data))
+                    for token_dataset in token_datasets
+                ], page_size=batch_size)
+                conn.commit()
+                return len(token_datasets)
+    except Exception as e:
+        logger.exception("Failed to insert token datasets", extra={"datasets": len(token_datasets)})
+        return 0
+
+
 def get_token_datasets_by_token(token: str) -> list[TokenDataset]:
     """
     Fetches all token datasets for a given token.
@@ -46,7 +85,7 @@ def get_token_datasets_by_token(token: str) -> list[TokenDataset]:
             with conn.cursor() as cursor:
                 # Prepare the SQL SELECT statement
                 select_query = """
-                SELECT token, trading_minute, raw_data
+                SELECT token, trading_minute, raw_data, data_format
                 FROM token_dataset
                 WHERE token = %s
                 ORDER BY trading_minute
@@ -61,7 +100,7 @@ def get_token_datasets_by_token(token: str) -> list[TokenDataset]:
                     datasets.append(TokenDataset(
                         token=row[0],
                         trading_minute=row[1],
-                        raw_data=pickle.loads(row[2])
+                        raw_data=deserialize_dataframe(row[2], row[3])
                     ))
     except Exception as e:
         logger.exception("Failed to fetch token datasets", extra={"token": token})
@@ -87,7 +126,7 @@ def get_token_datasets_by_daterange(from_date, to_date) -> dict[str, list[TokenD
             with conn.cursor() as cursor:
                 # Prepare the SQL SELECT statement
                 select_query = """
-                SELECT token, trading_minute, raw_data
+                SELECT token, trading_minute, raw_data, data_format
                 FROM token_dataset
                 WHERE trading_minute BETWEEN %s AND %s
                 ORDER BY token, trading_minute
@@ -103,7 +142,7 @@ def get_token_datasets_by_daterange(from_date, to_date) -> dict[str, list[TokenD
                     dataset = TokenDataset(
                         token=row[0],
                         trading_minute=row[1],
-                        raw_data=pickle.loads(row[2])
+                        raw_data=deserialize_dataframe(row[2], row[3])
                     )
                     if token not in token_datasets:
                         token_datasets[token] = []
@@ -113,3 +152,55 @@ def get_token_datasets_by_daterange(from_date, to_date) -> dict[str, list[TokenD
                          extra={"from_date": from_date, "to_date": to_date})
 
     return token_datasets
+
+
+def get_token_dataset_table_by_daterange(from_date, to_date) -> Optional[pa.Table]:
+    """
+    Fetches all token datasets within a date range as one Arrow table.
+
+    The rows are concatenated without copying their data, use .to_pandas() for a single DataFrame.
+
+    Args:
+        from_date (datetime): The start of the date range.
+        to_date (datetime): The end of the date range.
+
+    Returns:
+        Optional[pa.Table]: Rows of all datasets ordered by token and trading minute, None on failure.
+    """
+    try:
+        with get_db_connection() as conn:
+            with conn.cursor() as cursor:
+                select_query = """
+                SELECT raw_data, data_format
+                FROM token_dataset
+                WHERE trading_minute BETWEEN %s AND %s
+                ORDER BY token, trading_minute
+                """
+                cursor.execute(select_query, (from_date, to_date))
+                return concat_tables([deserialize_table(row[0], row[1]) for row in cursor.fetchall()])
+    except Exception as e:
+        logger.exception("Failed to fetch token dataset table by date range",
+                         extra={"from_date": from_date, "to_date": to_date})
+
+    return None
+
+
+async def insert_token_dataset_async(token_dataset: TokenDataset):
+    return await run_in_db_pool(insert_token_dataset, token_dataset)
+
+
+async def get_token_datasets_by_token_async(token: str) -> list[TokenDataset]:
+    return await run_in_db_pool(get_token_datasets_by_token, token)
+
+
+async def get_token_datasets_by_daterange_async(from_date, to_date) -> dict[str, list[TokenDataset]]:
+    return await run_in_db_pool(get_token_datasets_by_daterange, from_date, to_date)
+
+
+async def get_token_dataset_table_by_daterange_async(from_date, to_date) -> Optional[pa.Table]:
+    return await run_in_db_pool(get_token_dataset_table_by_daterange, from_date, to_date)
+
+
+async def insert_token_datasets_async(token_datasets: List[TokenDataset],
+                                      batch_size: int = BULK_INSERT_BATCH_SIZE) -> int:
+    return await run_in_db_pool(insert_token_datasets, token_datasets, batch_size)
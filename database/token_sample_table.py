@@ -1,8 +1,12 @@
 import logging
-import pickle
 from typing import Optional, List
 
-from database.db_connection import get_db_connection
+import pyarrow as pa
+from psycopg2.extras import execute_values
+
+from constants import BULK_INSERT_BATCH_SIZE
+from database.dataframe_blob import serialize_dataframe, deserialize_dataframe, deserialize_table, concat_tables
+from database.db_connection import get_db_connection, run_in_db_pool
 from dto.token_sample_model import TokenSample
 
 logger = logging.getLogger(__name__)
@@ -13,24 +17,58 @@ def insert_token_sample(token_sample: TokenSample):
         with get_db_connection() as conn:
             with conn.cursor() as cursor:
                 insert_query = """
-                INSERT INTO token_sample (token, raw)
-                VALUES (%s, %s)
+                INSERT INTO token_sample (token, raw, data_format)
+                VALUES (%s, %s, %s)
                 """
+                raw_data, data_format = serialize_dataframe(token_sample.raw_data)
                 cursor.execute(insert_query, (
                     token_sample.token,
-                    pickle.dumps(token_sample.raw_data)
+                    raw_data,
+                    data_format
                 ))
                 conn.commit()
     except Exception as e:
         logger.exception("Failed to insert token sample", extra={"token": token_sample.token})
 
 
+def insert_token_samples(token_samples: List[TokenSample], batch_size: int = BULK_INSERT_BATCH_SIZE) -> int:
+    """
+    Inserts many token samples in one transaction with multi row INSERT statements.
+
+    Args:
+        token_samples (List[TokenSample]): Samples to insert.
+        batch_size (int): Rows per INSERT statement, keep it small for large samples.
+
+    Returns:
+        int: Number of inserted samples, 0 on failure.
+    """
+    if len(token_samples) == 0:
+        return 0
+
+    try:
+        with get_db_connection() as conn:
+            with conn.cursor() as cursor:
+                insert_query = """
+                INSERT INTO token_sample (token, raw, data_format)
+                VALUES %s
+                """
+                execute_values(cursor, insert_query, [
+                    (token_sample.token, *serialize_dataframe(token_sample.raw_data))
+                    for token_sample in token_samples
+                ], page_size=batch_size)
+                conn.commit()
+                return len(token_samples)
+    except Exception as e:
+        logger.exception("Failed to insert token samples", extra={"samples": len(token_samples)})
+        return 0
+
+
 def get_all_samples() -> List[TokenSample]:
     try:
         with get_db_connection() as conn:
             with conn.cursor() as cursor:
                 select_query = """
-                SELECT id, token, raw
+                SELECT id, token, raw, data_format
                 FROM token_sample
                 """
                 cursor.execute(select_query)
@@ -39,7 +77,7 @@ def get_all_samples() -> List[TokenSample]:
                 for row in rows:
                     samples.append(TokenSample(
                         token=row[1],
-                        raw_data=pickle.loads(row[2])
+                        raw_data=deserialize_dataframe(row[2], row[3])
                     ))
                 return samples
     except Exception as e:
@@ -62,7 +100,7 @@ def get_token_samples_by_token(token: str) -> Optional[TokenSample]:
         with get_db_connection() as conn:
             with conn.cursor() as cursor:
                 select_query = """
-                SELECT id, token, raw
+                SELECT id, token, raw, data_format
                 FROM token_sample
                 WHERE token = %s
                 ORDER BY id
@@ -72,8 +110,53 @@ def get_token_samples_by_token(token: str) -> Optional[TokenSample]:
                 for row in rows:
                     return TokenSample(
                         token=row[1],
-                        raw_data=pickle.loads(row[2])
+                        raw_data=deserialize_dataframe(row[2], row[3])
                     )
     except Exception as e:
         logger.exception("Failed to fetch token samples", extra={"token": token})
     return None
+
+
+def get_all_samples_table() -> Optional[pa.Table]:
+    """
+    Fetches all token samples as one Arrow table.
+
+    The samples are concatenated without copying their data, columns missing in a sample are null.
+
+    Returns:
+        Optional[pa.Table]: Rows of all samples in insert order, None on failure.
+    """
+    try:
+        with get_db_connection() as conn:
+            with conn.cursor() as cursor:
+                select_query = """
+                SELECT raw, data_format
+                FROM token_sample
+                ORDER BY id
+                """
+                cursor.execute(select_query)
+                return concat_tables([deserialize_table(row[0], row[1]) for row in cursor.fetchall()])
+    except Exception as e:
+        logger.exception("Failed to fetch token sample table")
+    return None
+
+
+async def insert_token_sample_async(token_sample: TokenSample):
+    return await run_in_db_pool(insert_token_sample, token_sample)
+
+
+async def get_all_samples_async() -> List[TokenSample]:
+    return await run_in_db_pool(get_all_samples)
+
+
+async def get_token_samples_by_token_async(token: str) -> Optional[TokenSample]:
+    return await run_in_db_pool(get_token_samples_by_token, token)
+
+
+async def get_all_samples_table_async() -> Optional[pa.Table]:
+    return await run_in_db_pool(get_all_samples_table)
+
+
+async def insert_token_samples_async(token_samples: List[TokenSample],
+                                     batch_size: int = BULK_INSERT_BATCH_SIZE) -> int:
+    return await run_in_db_pool(insert_token_samples, token_samples, batch_size)
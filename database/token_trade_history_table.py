@@ -3,7 +3,7 @@ from datetime import datetime
 from typing import Dict
 
 from constants import INVESTMENT_AMOUNT
-from database.db_connection import get_db_connection
+from database.db_connection import get_db_connection, run_in_db_pool
 from dto.token_trade_history_model import TokenTradeHistory
 
 logger = logging.getLogger(__name__)
@@ -132,3 +132,19 @@ def update_sell_price(token: str, sell_price: float):
     except Exception as e:
         logger.exception("Failed to update sell price", extra={"token": token, "sell_price": sell_price})
         return False
+
+
+async def insert_token_trade_history_async(token_trade_history: TokenTradeHistory):
+    return await run_in_db_pool(insert_token_trade_history, token_trade_history)
+
+
+async def get_trade_stats_async() -> Dict[str, float]:
+    return await run_in_db_pool(get_trade_stats)
+
+
+async def get_open_trades_async() -> int:
+    return await run_in_db_pool(get_open_trades)
+
+
+async def update_sell_price_async(token: str, sell_price: float):
+    return await run_in_db_pool(update_sell_price, token, sell_price)
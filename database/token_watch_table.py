@@ -1,8 +1,8 @@
 import logging
 from datetime import datetime
-from typing import Optional, Tuple, Dict
+from typing import Optional, Tuple, Dict, List
 
-from database.db_connection import get_db_connection
+from database.db_connection import get_db_connection, run_in_db_pool
 
 logger = logging.getLogger(__name__)
 
@@ -187,3 +187,50 @@ def get_current_token_watch_stats() -> Dict[str, int]:
     except Exception as e:
         logger.exception("Failed to fetch token watch statistics")
         return {"total_watched": 0, "currently_watched": 0}
+
+
+def get_open_token_watches() -> List[str]:
+    """
+    Fetches the tokens that are still watched (no end time), e.g. to continue watching them after a restart.
+
+    Returns:
+        List[str]: Tokens ordered by the start of their watch, empty on failure.
+    """
+    try:
+        with get_db_connection() as conn:
+            with conn.cursor() as cursor:
+                select_query = """
+                SELECT token
+                FROM token_watch
+                WHERE end_time IS NULL
+                ORDER BY start_time
+                """
+                cursor.execute(select_query)
+                return [row[0] for row in cursor.fetchall()]
+    except Exception as e:
+        logger.exception("Failed to fetch open token watches")
+        return list()
+
+
+async def set_end_time_async(token: str, end_time: datetime) -> bool:
+    return await run_in_db_pool(set_end_time, token, end_time)
+
+
+async def insert_token_watch_async(token: str, start_time: datetime, end_time: Optional[datetime]) -> int:
+    return await run_in_db_pool(insert_token_watch, token, start_time, end_time)
+
+
+async def token_watch_exists_async(token: str) -> bool:
+    return await run_in_db_pool(token_watch_exists, token)
+
+
+async def get_token_watch_async(token: str) -> Optional[Tuple[int, str, datetime, Optional[datetime]]]:
+    return await run_in_db_pool(get_token_watch, token)
+
+
+async def get_current_token_watch_stats_async() -> Dict[str, int]:
+    return await run_in_db_pool(get_current_token_watch_stats)
+
+
+async def get_open_token_watches_async() -> List[str]:
+    return await run_in_db_pool(get_open_token_watches)
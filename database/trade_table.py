@@ -1,7 +1,10 @@
 import logging
-from typing import List
+from typing import List, Tuple, Dict
 
-from database.db_connection import get_db_connection
+from psycopg2.extras import execute_values
+
+from constants import BULK_INSERT_BATCH_SIZE
+from database.db_connection import get_db_connection, run_in_db_pool
 from dto.trade_model import Trade
 
 logger = logging.getLogger(__name__)
@@ -35,6 +38,45 @@ def insert_trade(trade: Trade):
         logger.exception("Failed to insert trade", extra={"trade": trade.to_dict()})
 
 
+def insert_trades(trades: List[Trade], batch_size: int = BULK_INSERT_BATCH_SIZE) -> int:
+    """
+    Inserts many trades in one transaction with multi row INSERT statements.
+
+    Args:
+        trades (List[Trade]): Trades to insert.
+        batch_size (int): Rows per INSERT statement.
+
+    Returns:
+        int: Number of inserted trades, 0 on failure.
+    """
+    if len(trades) == 0:
+        return 0
+
+    try:
+        with get_db_connection() as conn:
+            with conn.cursor() as cursor:
+                insert_query = """
+                INSERT INTO trades (trader, token, token_amount, sol_amount, buy, token_holding_after, trade_time,
+                                    tx_signature)
+                VALUES %s
+                """
+                execute_values(cursor, insert_query, [(
+                    trade.trader,
+                    trade.token,
+                    trade.token_amount,
+                    trade.sol_amount,
+                    trade.buy,
+                    trade.token_holding_after,
+                    trade.get_time(),
+                    trade.tx_signature
+                ) for trade in trades], page_size=batch_size)
+                conn.commit()
+                return len(trades)
+    except Exception as e:
+        logger.exception("Failed to insert trades", extra={"trades": len(trades)})
+        return 0
+
+
 def get_trades_by_token(token: str) -> List[Trade]:
     """
     Retrieves all trades for a given token.
@@ -81,3 +123,118 @@ def get_trades_by_token(token: str) -> List[Trade]:
     except Exception as e:
         logger.exception(f"Failed to fetch trades for token {token}")
         return []
+
+
+def get_new_trades_by_token(token: str, last_trade_id: int) -> Tuple[List[Trade], int]:
+    """
+    Retrieves the trades of a token that were inserted after the given trade id.
+
+    Args:
+        token (str): The token for which trades need to be fetched.
+        last_trade_id (int): The highest trade id already seen, 0 to fetch all trades.
+
+    Returns:
+        Tuple[List[Trade], int]: The new trades and the highest trade id seen so far.
+    """
+    try:
+        with get_db_connection() as conn:
+            with conn.cursor() as cursor:
+                select_query = """
+                SELECT id, trader, token, token_amount, sol_amount, buy, token_holding_after, trade_time, tx_signature
+                FROM trades
+                WHERE token = %s AND id > %s
+                ORDER BY id
+                """
+
+                cursor.execute(select_query, (token, last_trade_id))
+                rows = cursor.fetchall()
+
+                trades = [
+                    Trade(
+                        trader=row[1],
+                        token=row[2],
+                        token_amount=row[3],
+                        sol_amount=row[4],
+                        buy=row[5],
+                        token_holding_after=row[6],
+                        trade_time=row[7].isoformat(),
+                        tx_signature=row[8]
+                    )
+                    for row in rows
+                ]
+
+                return trades, rows[-1][0] if rows else last_trade_id
+
+    except Exception as e:
+        logger.exception(f"Failed to fetch new trades for token {token}")
+        return [], last_trade_id
+
+
+def get_new_trades_by_tokens(last_trade_ids: Dict[str, int]) -> Dict[str, Tuple[List[Trade], int]]:
+    """
+    Retrieves the new trades of several tokens in one query.
+
+    Args:
+        last_trade_ids (Dict[str, int]): The highest trade id already seen per token.
+
+    Returns:
+        Dict[str, Tuple[List[Trade], int]]: The new trades and the highest trade id seen so far per token.
+    """
+    result = {token: ([], last_trade_id) for token, last_trade_id in last_trade_ids.items()}
+    if len(last_trade_ids) == 0:
+        return result
+
+    try:
+        with get_db_connection() as conn:
+            with conn.cursor() as cursor:
+                select_query = """
+                SELECT t.id, t.trader, t.token, t.token_amount, t.sol_amount, t.buy, t.token_holding_after,
+                       t.trade_time, t.tx_signature
+                FROM trades t
+                JOIN unnest(%s::varchar[], %s::int[]) AS c(token, last_id)
+                ON t.token = c.token AND t.id > c.last_id
+                ORDER BY t.id
+                """
+
+                cursor.execute(select_query, (list(last_trade_ids.keys()), list(last_trade_ids.values())))
+                rows = cursor.fetchall()
+
+                for row in rows:
+                    trades, _ = result[row[2]]
+                    trades.append(Trade(
+                        trader=row[1],
+                        token=row[2],
+                        token_amount=row[3],
+                        sol_amount=row[4],
+                        buy=row[5],
+                        token_holding_after=row[6],
+                        trade_time=row[7].isoformat(),
+                        tx_signature=row[8]
+                    ))
+                    result[row[2]] = (trades, row[0])
+
+                return result
+
+    except Exception as e:
+        logger.exception("Failed to fetch new trades for tokens", extra={"tokens": list(last_trade_ids.keys())})
+        return result
+
+
+async def insert_trade_async(trade: Trade):
+    return await run_in_db_pool(insert_trade, trade)
+
+
+async def get_trades_by_token_async(token: str) -> List[Trade]:
+    return await run_in_db_pool(get_trades_by_token, token)
+
+
+async def get_new_trades_by_token_async(token: str, last_trade_id: int) -> Tuple[List[Trade], int]:
+    return await run_in_db_pool(get_new_trades_by_token, token, last_trade_id)
+
+
+async def get_new_trades_by_tokens_async(last_trade_ids: Dict[str, int]) -> Dict[str, Tuple[List[Trade], int]]:
+    return await run_in_db_pool(get_new_trades_by_tokens, last_trade_ids)
+
+
+async def insert_trades_async(trades: List[Trade], batch_size: int = BULK_INSERT_BATCH_SIZE) -> int:
+    return await run_in_db_pool(insert_trades, trades, batch_size)
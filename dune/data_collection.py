@@ -1,27 +1,27 @@
+import asyncio
 import logging
 from datetime import timedelta, datetime
 from typing import Tuple, List, Dict
 
 import pandas as pd
 
-from birdeye_api.ohlcv_endpoint import get_ohlcv, ohlcv_to_dataframe
+from birdeye_api.ohlcv_endpoint import get_candles_for_tokens
 from birdeye_api.token_creation_endpoint import get_token_create_info_bird_eye
 from birdeye_api.trades_endpoint import get_top_trader_trades_from_birdeye
 from cache_helper import write_data_to_cache, get_cache_file_data
 from constants import PRODUCTION_TEST_TRADES, PRODUCTION_TEST_PRICE, TOKEN_CLOSE_VOLUME_1M_QUERY, \
     CURRENT_CLOSE_VOLUME_1M_QUERY
 from dune.dune_queries import get_current_trade_list_query, get_top_traders
-from dune.query_request import get_query_result_with_params
+from dune.execution_manager import get_dune_query_result
 
 logger = logging.getLogger(__name__)
 
 
 async def collect_test_data(token: str, use_cache: bool) -> Tuple[pd.DataFrame, pd.DataFrame]:
-    top_trader_trades = get_query_result_with_params(PRODUCTION_TEST_TRADES,
-                                                     {"min_token_age_h": 2,
-                                                      "token": token},
-                                                     use_cache)
-    launch_time, _ = await get_token_create_info_bird_eye(token, api_limit=True)
+    # the Dune query runs for minutes, load the token creation info in the meantime
+    top_trader_trades, (launch_time, _) = await asyncio.gather(
+        get_dune_query_result(PRODUCTION_TEST_TRADES, {"min_token_age_h": 2, "token": token}, use_cache),
+        get_token_create_info_bird_eye(token, api_limit=True))
     volume_close_1m = await get_close_volume_1m([token],
                                                 {token: launch_time},
                                                 use_cache,
@@ -31,13 +31,9 @@ async def collect_test_data(token: str, use_cache: bool) -> Tuple[pd.DataFrame,
 
 
 async def load_volume_1m_data_form_brideye(tokens: List[str], launch_times: Dict[str, datetime]) -> pd.DataFrame:
-    all_volume_data = []
-    for index, token in enumerate(tokens):
-        logger.info(f"Collecting data for token {index + 1} of {len(tokens)}")
-        end_time = launch_times[token] + timedelta(hours=10)
-        ohlcv_data = await get_ohlcv(token, launch_times[token], end_time, "1m", api_limit=False)
-        volume_data = ohlcv_to_dataframe(ohlcv_data)
-        all_volume_data.append(volume_data)
+    logger.info(f"Collecting candles of {len(tokens)} tokens")
+    all_volume_data = await get_candles_for_tokens(
+        {token: (launch_times[token], launch_times[token] + timedelta(hours=10)) for token in tokens})
 
     volume_close_1m = pd.concat(all_volume_data, ignore_index=True)
     return volume_close_1m
@@ -51,7 +47,7 @@ async def get_close_volume_1m(tokens: List[str], launch_times: Dict[str, datetim
             return result_data  # Return cached data if available
 
     result = await load_volume_1m_data_form_brideye(tokens, launch_times)
-    write_data_to_cache(query_name, result)
+    write_data_to_cache(query_name, result, source="birdeye")
     return result
 
 
@@ -66,7 +62,7 @@ async def collect_all_data(use_cache: bool) -> Tuple[pd.DataFrame, pd.DataFrame]
     end_date = datetime.utcnow() - timedelta(hours=10)
     start_date = end_date - timedelta(days=40)
 
-    top_traders = get_top_traders(use_cache)
+    top_traders = await get_top_traders(use_cache)
 
     top_trader_trades = await get_top_trader_trades_from_birdeye(top_traders["trader_id"], start_date, end_date)
 
@@ -77,7 +73,7 @@ async def collect_all_data(use_cache: bool) -> Tuple[pd.DataFrame, pd.DataFrame]
 
 
 async def collect_validation_data(use_cache: bool) -> Tuple[pd.DataFrame, pd.DataFrame]:
-    top_trader_trades = get_current_trade_list_query(use_cache)
+    top_trader_trades = await get_current_trade_list_query(use_cache)
 
     tokens, launch_times = get_tokens_and_launch_dict(top_trader_trades)
     volume_close_1m = await get_close_volume_1m(tokens, launch_times, use_cache, CURRENT_CLOSE_VOLUME_1M_QUERY)
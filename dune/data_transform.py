@@ -1,8 +1,17 @@
-from typing import Optional
+import json
+from typing import Optional, List, Iterable
 
 import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
 from dune_client.models import ResultsResponse
 
+from constants import TOKEN_COLUMN
+
+CATEGORICAL_COLUMNS = (TOKEN_COLUMN, "trader_id")
+INTEGER_TYPES = {"tinyint", "smallint", "integer", "bigint"}
+FLOAT_TYPES = {"double", "real"}
+
 
 def transform_dune_result_to_pandas(query_result: ResultsResponse) -> Optional[pd.DataFrame]:
     try:
@@ -38,3 +47,71 @@ def transform_dune_result_to_pandas(query_result: ResultsResponse) -> Optional[p
 
     except Exception as e:
         raise ValueError(f"Failed to convert Dune response to DataFrame: {str(e)}")
+
+
+def get_arrow_type(dune_type: str) -> pa.DataType:
+    if dune_type in INTEGER_TYPES:
+        return pa.int64()
+    if dune_type in FLOAT_TYPES or dune_type.startswith("decimal"):
+        return pa.float64()
+    if dune_type == "boolean":
+        return pa.bool_()
+    if dune_type.startswith("timestamp") or dune_type == "date":
+        return pa.timestamp("ns")
+
+    # varchar, uint256 and everything else is kept as text like in the JSON response
+    return pa.string()
+
+
+def to_arrow_array(values: Iterable, dune_type: str) -> pa.Array:
+    """Builds one typed column, Dune timestamps ("2024-01-01 00:00:00.000 UTC") become naive UTC timestamps."""
+    arrow_type = get_arrow_type(dune_type)
+    if arrow_type == pa.timestamp("ns"):
+        strings = pc.replace_substring(pa.array(values, type=pa.string()), " UTC", "")
+        try:
+            return pc.cast(strings, arrow_type)
+        except pa.ArrowInvalid:
+            timestamps = pd.to_datetime(strings.to_pandas(), format="mixed", utc=True).dt.tz_localize(None)
+            return pa.array(timestamps, type=arrow_type)
+
+    if arrow_type == pa.string():
+        values = [value if value is None or isinstance(value, str) else json.dumps(value) for value in values]
+
+    return pa.array(values, type=arrow_type)
+
+
+def rows_to_arrow_table(rows: List[dict], column_names: List[str], column_types: List[str],
+                        categorical_columns: Iterable[str] = ()) -> pa.Table:
+    """
+    Builds the typed table column by column from the Dune rows.
+
+    Only one column of Python objects exists at a time, categorical columns are dictionary encoded.
+    """
+    categorical_columns = set(categorical_columns)
+    columns = list()
+    for name, dune_type in zip(column_names, column_types):
+        column = to_arrow_array([row.get(name) for row in rows], dune_type)
+        if name in categorical_columns and column.type == pa.string():
+            column = column.dictionary_encode()
+        columns.append(column)
+
+    return pa.Table.from_arrays(columns, names=list(column_names))
+
+
+def transform_dune_result_typed(query_result: ResultsResponse,
+                                categorical_columns: Iterable[str] = CATEGORICAL_COLUMNS) -> pd.DataFrame:
+    """
+    Converts a Dune result into a DataFrame typed by the result metadata.
+
+    Integers become int64 (float64 with missing values), doubles and decimals float64, timestamps datetime64 and the
+    categorical columns (token and trader_id by default) pandas categoricals. Unlike transform_dune_result_to_pandas
+    no object DataFrame of the row dicts is created, the result of a trade list needs about a sixth of the memory
+    (see testbed/benchmark_dune_transform.py).
+    """
+    rows = query_result.result.rows
+    if not rows:
+        return pd.DataFrame()
+
+    metadata = query_result.result.metadata
+    table = rows_to_arrow_table(rows, metadata.column_names, metadata.column_types, categorical_columns)
+    return table.to_pandas(self_destruct=True, split_blocks=True)
@@ -0,0 +1,265 @@
+import asyncio
+import json
+import logging
+import os
+import shutil
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+import aiohttp
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from config.config_reader import hash_config
+from constants import CACHE_FOLDER, DUNE_API_KEY
+from dune.data_transform import rows_to_arrow_table
+from env_data.get_env_value import get_env_value
+from solana_api.http_client import get_http_session
+
+logger = logging.getLogger(__name__)
+
+DUNE_API_URL = "https://api.dune.com/api/v1"
+DUNE_RESULT_FOLDER = os.path.join(CACHE_FOLDER, "dune")
+DUNE_CONCURRENCY = 3
+DUNE_PAGE_SIZE = 32_000
+DUNE_PERFORMANCE = "medium"
+POLL_BASE_DELAY_SECONDS = 1
+POLL_MAX_DELAY_SECONDS = 30
+MAX_RETRIES = 5
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+STATE_FILE = "_state.json"
+
+COMPLETED_STATE = "QUERY_STATE_COMPLETED"
+FAILED_STATES = {"QUERY_STATE_FAILED", "QUERY_STATE_CANCELLED", "QUERY_STATE_EXPIRED"}
+
+
+class DuneQueryError(Exception):
+    pass
+
+
+@dataclass
+class DuneQuery:
+    query_id: int
+    params: Optional[Dict[str, Any]] = None
+
+    @property
+    def cache_id(self) -> str:
+        if self.params is None:
+            return str(self.query_id)
+
+        return str(self.query_id) + "_" + hash_config(self.params)
+
+
+class DuneExecutionManager:
+    """
+    Runs Dune queries concurrently and streams their results into Parquet files below CACHE_FOLDER.
+
+    Queries with parameters are executed, queries without parameters return their latest result. Results are
+    downloaded page by page, every page is written as its own Parquet part next to a state file with the execution id
+    and the next offset, so an interrupted download continues with the missing pages of the same execution.
+    Executions are polled with exponential backoff.
+    """
+
+    def __init__(self, api_key: Optional[str] = None, base_url: str = DUNE_API_URL,
+                 directory: str = DUNE_RESULT_FOLDER, concurrency: int = DUNE_CONCURRENCY,
+                 page_size: int = DUNE_PAGE_SIZE, poll_base_delay: float = POLL_BASE_DELAY_SECONDS,
+                 poll_max_delay: float = POLL_MAX_DELAY_SECONDS, performance: str = DUNE_PERFORMANCE):
+        self.api_key = api_key if api_key is not None else get_env_value(DUNE_API_KEY)
+        self.base_url = base_url
+        self.directory = directory
+        self.concurrency = concurrency
+        self.page_size = page_size
+        self.poll_base_delay = poll_base_delay
+        self.poll_max_delay = poll_max_delay
+        self.performance = performance
+
+    async def request(self, method: str, path: str, **kwargs) -> dict:
+        attempt = 0
+        while True:
+            try:
+                async with get_http_session().request(method, self.base_url + path,
+                                                      headers={"X-DUNE-API-KEY": self.api_key},
+                                                      **kwargs) as response:
+                    response.raise_for_status()
+                    return await response.json()
+            except aiohttp.ClientResponseError as e:
+                if e.status not in RETRY_STATUS_CODES or attempt >= MAX_RETRIES:
+                    raise
+
+                delay = min(self.poll_max_delay, self.poll_base_delay * 2 ** attempt)
+                logger.warning("Dune request failed, retry", extra={"path": path, "status": e.status, "delay": delay})
+                attempt += 1
+                await asyncio.sleep(delay)
+
+    async def execute(self, query: DuneQuery) -> str:
+        response = await self.request("POST", f"/query/{query.query_id}/execute",
+                                      json={"query_parameters": query.params or {}, "performance": self.performance})
+        logger.info("Dune query submitted", extra={"query_id": query.query_id,
+                                                   "execution_id": response["execution_id"]})
+        return response["execution_id"]
+
+    async def wait_for_execution(self, execution_id: str) -> dict:
+        attempt = 0
+        while True:
+            status = await self.request("GET", f"/execution/{execution_id}/status")
+            state = status["state"]
+            if state == COMPLETED_STATE:
+                return status
+            if state in FAILED_STATES:
+                raise DuneQueryError(f"Execution {execution_id} ended with {state}")
+
+            delay = min(self.poll_max_delay, self.poll_base_delay * 2 ** attempt)
+            logger.info("Dune query execution in progress", extra={"execution_id": execution_id, "state": state,
+                                                                   "delay": delay})
+            attempt += 1
+            await asyncio.sleep(delay)
+
+    def get_result_path(self, query: DuneQuery) -> str:
+        return os.path.join(self.directory, query.cache_id)
+
+    def load_state(self, query: DuneQuery) -> Optional[dict]:
+        try:
+            with open(os.path.join(self.get_result_path(query), STATE_FILE)) as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+
+    def save_state(self, query: DuneQuery, state: dict):
+        path = os.path.join(self.get_result_path(query), STATE_FILE)
+        with open(path + ".tmp", "w") as f:
+            json.dump(state, f)
+        os.replace(path + ".tmp", path)
+
+    def reset(self, query: DuneQuery) -> dict:
+        path = self.get_result_path(query)
+        shutil.rmtree(path, ignore_errors=True)
+        os.makedirs(path)
+        state = {"query_id": query.query_id, "execution_id": None, "next_offset": 0, "parts": 0,
+                 "column_names": None, "column_types": None, "complete": False}
+        self.save_state(query, state)
+        return state
+
+    def write_page(self, query: DuneQuery, state: dict, response: dict):
+        result = response["result"]
+        metadata = result["metadata"]
+        state["execution_id"] = response["execution_id"]
+        state["column_names"] = metadata["column_names"]
+        state["column_types"] = metadata["column_types"]
+        if len(result["rows"]) > 0:
+            table = rows_to_arrow_table(result["rows"], state["column_names"], state["column_types"])
+            pq.write_table(table, os.path.join(self.get_result_path(query), f"part-{state['parts']:05d}.parquet"))
+            state["parts"] += 1
+
+        # the part is written before the state, a crash in between rewrites the same part on resume
+        state["next_offset"] = response.get("next_offset")
+        state["complete"] = state["next_offset"] is None
+        self.save_state(query, state)
+
+    async def download(self, query: DuneQuery, state: dict):
+        if state["execution_id"] is None:
+            if query.params is None:
+                response = await self.request("GET", f"/query/{query.query_id}/results",
+                                              params={"limit": self.page_size, "offset": 0})
+                self.write_page(query, state, response)
+            else:
+                state["execution_id"] = await self.execute(query)
+                self.save_state(query, state)
+
+        if not state["complete"] and state["next_offset"] == 0:
+            await self.wait_for_execution(state["execution_id"])
+
+        while not state["complete"]:
+            response = await self.request("GET", f"/execution/{state['execution_id']}/results",
+                                          params={"limit": self.page_size, "offset": state["next_offset"]})
+            self.write_page(query, state, response)
+            logger.info("Dune result page stored", extra={"query_id": query.query_id, "parts": state["parts"],
+                                                          "next_offset": state["next_offset"]})
+
+    async def fetch(self, query: DuneQuery, use_cache: bool = True) -> str:
+        """
+        Downloads the result of a query if it is not cached yet.
+
+        Args:
+            query: Query id and parameters.
+            use_cache: Use or resume the stored result, otherwise the query is fetched again.
+
+        Returns:
+            str: Directory with the Parquet parts of the result.
+        """
+        state = self.load_state(query) if use_cache else None
+        if state is not None and state["complete"]:
+            return self.get_result_path(query)
+
+        if state is None:
+            state = self.reset(query)
+
+        resumed = state["execution_id"] is not None
+        if resumed:
+            logger.info("Resume Dune result download", extra={"query_id": query.query_id,
+                                                             "next_offset": state["next_offset"]})
+
+        try:
+            await self.download(query, state)
+        except (DuneQueryError, aiohttp.ClientResponseError) as e:
+            if not resumed:
+                raise
+
+            # the stored execution is not available anymore, start again
+            logger.warning("Failed to resume Dune result, fetch again", extra={"query_id": query.query_id,
+                                                                              "error": str(e)})
+            await self.download(query, self.reset(query))
+
+        return self.get_result_path(query)
+
+    def read_result(self, query: DuneQuery) -> pd.DataFrame:
+        state = self.load_state(query)
+        if state is None or not state["complete"]:
+            raise DuneQueryError(f"No complete result for query {query.query_id}")
+
+        if state["parts"] == 0:
+            return pd.DataFrame()
+
+        path = self.get_result_path(query)
+        tables = [pq.read_table(os.path.join(path, f"part-{part:05d}.parquet"), memory_map=True)
+                  for part in range(state["parts"])]
+        return pa.concat_tables(tables).to_pandas()
+
+    async def get_result(self, query: DuneQuery, use_cache: bool = True) -> Optional[pd.DataFrame]:
+        if self.api_key is None and (not use_cache or self.load_state(query) is None):
+            logger.error("Failed to get Dune client.")
+            return None
+
+        try:
+            await self.fetch(query, use_cache)
+            return self.read_result(query)
+        except Exception as e:
+            logger.exception("Failed to get Dune query result", extra={"query_id": query.query_id,
+                                                                       "params": query.params})
+            return None
+
+    async def get_results(self, queries: List[DuneQuery], use_cache: bool = True) -> List[Optional[pd.DataFrame]]:
+        """Runs up to concurrency queries at the same time, results are in the order of the queries."""
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def get_result(query: DuneQuery) -> Optional[pd.DataFrame]:
+            async with semaphore:
+                return await self.get_result(query, use_cache)
+
+        return await asyncio.gather(*[get_result(query) for query in queries])
+
+
+_execution_manager: Optional[DuneExecutionManager] = None
+
+
+def get_execution_manager() -> DuneExecutionManager:
+    global _execution_manager
+    if _execution_manager is None:
+        _execution_manager = DuneExecutionManager()
+
+    return _execution_manager
+
+
+async def get_dune_query_result(query_id: int, params: Optional[Dict[str, Any]] = None,
+                                use_cache: bool = True) -> Optional[pd.DataFrame]:
+    return await get_execution_manager().get_result(DuneQuery(query_id, params), use_cache)
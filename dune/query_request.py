@@ -52,7 +52,7 @@ def get_from_api(query_id: int) -> Optional[ResultsResponse]:
     try:
         # Fetch the latest result from Dune
         query_result = dune_client.get_latest_result(query_id)
-        write_data_to_cache(query_id, query_result)
+        write_data_to_cache(query_id, query_result, source="dune")
         return query_result
     except Exception as e:
         logger.exception("An unexpected error occurred while fetching query result.")
@@ -127,7 +127,7 @@ def get_from_api_with_params(query_id: int, params: Optional[Dict[str, Any]]) ->
         query_result = dune_client.get_latest_result(query)
 
         cache_id = get_cache_id(query_id, params)
-        write_data_to_cache(cache_id, query_result)
+        write_data_to_cache(cache_id, query_result, source="dune")
         return query_result
     except Exception as e:
         logger.exception("An unexpected error occurred while fetching query result with params.")
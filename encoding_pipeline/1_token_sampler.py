@@ -4,14 +4,18 @@ import pandas as pd
 from flask.cli import load_dotenv
 
 from constants import TOKEN_COLUMN, LAUNCH_DATE_COLUMN
-from database.token_sample_table import insert_token_sample, get_token_samples_by_token
+from database.raw_sql import setup_database
+from database.token_sample_table import insert_token_samples, get_token_samples_by_token
 from dto.token_sample_model import TokenSample
 from dune.data_collection import get_close_volume_1m
 from dune.dune_queries import get_token_sample
 
+# samples hold up to a few hundred candles each, keep the INSERT statements small
+SAMPLE_INSERT_BATCH_SIZE = 100
+
 
 async def main(use_cache: bool):
-    sampled = get_token_sample(use_cache)
+    sampled = await get_token_sample(use_cache)
     # sampled = sampled.head(10)
     sampled[LAUNCH_DATE_COLUMN] = pd.to_datetime(sampled[LAUNCH_DATE_COLUMN])
     launch_times = sampled.set_index(TOKEN_COLUMN)[LAUNCH_DATE_COLUMN].to_dict()
@@ -26,10 +30,13 @@ async def main(use_cache: bool):
     volume_close_1m = await get_close_volume_1m(new_token_list,
                                                 launch_times, use_cache, "SAMPLER")
 
-    for token_data in volume_close_1m.groupby(TOKEN_COLUMN):
-        insert_token_sample(TokenSample(str(token_data[0]), token_data[1]))
+    token_samples = [TokenSample(str(token_data[0]), token_data[1])
+                     for token_data in volume_close_1m.groupby(TOKEN_COLUMN)]
+    insert_token_samples(token_samples, batch_size=SAMPLE_INSERT_BATCH_SIZE)
 
 
 if __name__ == '__main__':
     load_dotenv()
+    # token_sample rows are written with the data_format column of migration 003
+    setup_database()
     asyncio.run(main(True))
@@ -13,6 +13,7 @@ from tqdm import tqdm
 from constants import TOKEN_COLUMN, PRICE_COLUMN, TRADING_MINUTE_COLUMN, PRICE_PCT_CHANGE
 from data.cache_data import read_cache_data, save_cache_data
 from data.data_split import get_index_of_similar_price
+from database.raw_sql import setup_database
 from database.token_sample_table import get_all_samples
 
 cum_change = 'cumulative_pct_change'
@@ -43,12 +44,12 @@ def plot_simulations(true_price_change, sample_cut):
 
 
 def prepare_data(min_price_reached):
-    prepared_data = read_cache_data('prep_full')
+    prepared_data = read_cache_data('prep_full', read_only=True)
     if prepared_data is not None:
         token_list, data, min_trading_minutes = prepared_data
         return token_list, data, min_trading_minutes
 
-    data = read_cache_data('token_samples_full')
+    data = read_cache_data('token_samples_full', read_only=True)
     if data is None:
         token_samples = get_all_samples()
         data = pd.DataFrame()
@@ -170,4 +171,5 @@ def main():
 
 if __name__ == '__main__':
     load_dotenv()
+    setup_database()
     main()
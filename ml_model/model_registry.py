@@ -0,0 +1,107 @@
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, Optional, Type
+
+from constants import MODEL_FOLDER, MODEL_VERSION
+from data.redis_helper import get_sync_redis
+from ml_model.base_model import BaseModelBuilder
+from ml_model.hist_gradient_model_builder import HistGradientBoostModelBuilder
+
+logger = logging.getLogger(__name__)
+
+RELOAD_CHECK_INTERVAL_SECONDS = 30
+
+
+@dataclass
+class RegisteredModel:
+    model: BaseModelBuilder
+    modified_time: float
+    version: Optional[str]
+    checked_at: float
+
+
+_models: Dict[str, RegisteredModel] = dict()
+_lock = threading.Lock()
+
+
+def get_model_file_path(model_name: str) -> str:
+    return os.path.join(MODEL_FOLDER, model_name + ".pkl")
+
+
+def get_model_version_key(model_name: str) -> str:
+    return f"{MODEL_VERSION}:{model_name}"
+
+
+def get_model_version(model_name: str) -> Optional[str]:
+    try:
+        version = get_sync_redis().get(get_model_version_key(model_name))
+        return version.decode() if isinstance(version, bytes) else version
+    except Exception as e:
+        logger.warning("Failed to read model version from redis", extra={"model_name": model_name})
+        return None
+
+
+def publish_model_version(model_name: str, version: str):
+    """Set the redis version key of a model, workers reload the pickle on their next check."""
+    get_sync_redis().set(get_model_version_key(model_name), version)
+
+
+def load_registered_model(model_name: str, builder_class: Type[BaseModelBuilder]) -> RegisteredModel:
+    modified_time = os.path.getmtime(get_model_file_path(model_name))
+    version = get_model_version(model_name)
+
+    logger.info("Load model", extra={"model_name": model_name, "version": version})
+    model = builder_class(dict())
+    model.load_model(model_name)
+
+    return RegisteredModel(model, modified_time, version, time.monotonic())
+
+
+def is_outdated(model_name: str, registered_model: RegisteredModel) -> bool:
+    if os.path.getmtime(get_model_file_path(model_name)) != registered_model.modified_time:
+        return True
+
+    return get_model_version(model_name) != registered_model.version
+
+
+def get_model(model_name: str = "hist_gradient",
+              builder_class: Type[BaseModelBuilder] = HistGradientBoostModelBuilder) -> BaseModelBuilder:
+    """
+    Returns the process wide instance of a model, the pickle is only loaded once per process.
+
+    Every RELOAD_CHECK_INTERVAL_SECONDS the mtime of the pickle and the redis version key are compared with the
+    loaded model and the model is reloaded if either changed. The returned model is shared by all coroutines and
+    jobs of the process and must be treated as read-only, a reload replaces it instead of changing it in place.
+    """
+    registered_model = _models.get(model_name)
+    if registered_model is not None and time.monotonic() - registered_model.checked_at < RELOAD_CHECK_INTERVAL_SECONDS:
+        return registered_model.model
+
+    with _lock:
+        registered_model = _models.get(model_name)
+        if registered_model is None:
+            registered_model = load_registered_model(model_name, builder_class)
+            _models[model_name] = registered_model
+            return registered_model.model
+
+        if time.monotonic() - registered_model.checked_at < RELOAD_CHECK_INTERVAL_SECONDS:
+            return registered_model.model
+
+        try:
+            if is_outdated(model_name, registered_model):
+                _models[model_name] = load_registered_model(model_name, builder_class)
+            else:
+                registered_model.checked_at = time.monotonic()
+        except Exception as e:
+            logger.exception("Failed to reload model, keep current version", extra={"model_name": model_name})
+            registered_model.checked_at = time.monotonic()
+
+        return _models[model_name].model
+
+
+def clear_models():
+    with _lock:
+        _models.clear()
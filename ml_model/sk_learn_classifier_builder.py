@@ -1,7 +1,9 @@
 import logging
 import os.path
-from typing import Dict, Tuple, List
+import warnings
+from typing import Dict, Tuple, List, Optional
 
+import numpy as np
 import pandas as pd
 
 from constants import BIN_AMOUNT_KEY, RANDOM_SEED, MODEL_FOLDER, TOKEN_COLUMN, STEP_SIZE_KEY, LABEL_COLUMN, \
@@ -35,6 +37,11 @@ class SKLearnClassifierBuilder(BaseModelBuilder):
         self.bin_edges = None
         self.model = None
         self.model_name = model_name
+        self.input_columns: Optional[List[str]] = None
+        self.column_index: Optional[np.ndarray] = None
+        self.missing_column_mask: Optional[np.ndarray] = None
+        self.binned_column_index: List[int] = list()
+        self.sorted_bin_edges: List[np.ndarray] = list()
         super().__init__(config)
 
     def get_model(self):
@@ -109,6 +116,67 @@ class SKLearnClassifierBuilder(BaseModelBuilder):
 
     def load_model(self, name):
         self.model, self.bin_edges, self.columns = load_model(name)
+        self.input_columns = None
 
     def predict(self, data):
         return self.model.predict(data)
+
+    def compile_prediction_columns(self, input_columns: List[str]):
+        """
+        Precompute the index arrays used by the batched prediction path.
+
+        Args:
+            input_columns (List[str]): Column order of the value matrices passed to prepare_prediction_matrix.
+                Model columns missing in the input are filled with 0 (inactive traders).
+        """
+        position = {column: index for index, column in enumerate(input_columns)}
+        column_index = np.array([position.get(column, -1) for column in self.columns], dtype=np.intp)
+
+        self.input_columns = list(input_columns)
+        self.missing_column_mask = column_index < 0
+        self.column_index = np.where(self.missing_column_mask, 0, column_index)
+        if self.missing_column_mask.any():
+            logger.warning("Model columns missing in prediction input, fill with 0",
+                           extra={"missing_columns": int(self.missing_column_mask.sum())})
+
+        self.binned_column_index = list()
+        self.sorted_bin_edges = list()
+        if self.binned_data and self.bin_edges is not None:
+            for index, column in enumerate(self.columns):
+                if column in self.binned_columns and column in self.bin_edges:
+                    self.binned_column_index.append(index)
+                    self.sorted_bin_edges.append(np.sort(np.asarray(self.bin_edges[column], dtype=np.float64)))
+
+    def prepare_prediction_matrix(self, values: np.ndarray, input_columns: List[str],
+                                  dtype=np.float32) -> np.ndarray:
+        """
+        Select, order and bin the model columns of a (N, len(input_columns)) value matrix.
+
+        Returns:
+            np.ndarray: (N, F) matrix in the column order of the model.
+        """
+        if self.input_columns != list(input_columns):
+            self.compile_prediction_columns(input_columns)
+
+        matrix = np.asarray(values, dtype=np.float64)[:, self.column_index]
+        matrix[:, self.missing_column_mask] = 0.0
+
+        # Same result as bin_data: np.digitize(right=False) is searchsorted(side='right')
+        for index, edges in zip(self.binned_column_index, self.sorted_bin_edges):
+            matrix[:, index] = np.searchsorted(edges, matrix[:, index], side='right').clip(1, len(edges))
+
+        return matrix.astype(dtype, copy=False)
+
+    def predict_proba_matrix(self, matrix: np.ndarray) -> np.ndarray:
+        with warnings.catch_warnings():
+            # The model was fitted with a DataFrame, the matrix columns are already in the same order
+            warnings.filterwarnings("ignore", message="X does not have valid feature names")
+            return self.model.predict_proba(matrix)
+
+    def predict_matrix(self, matrix: np.ndarray) -> np.ndarray:
+        probabilities = self.predict_proba_matrix(matrix)
+        return self.model.classes_[np.argmax(probabilities, axis=1)]
+
+    def predict_batch(self, values: np.ndarray, input_columns: List[str]) -> np.ndarray:
+        """Score many rows at once, values is a (N, len(input_columns)) matrix."""
+        return self.predict_matrix(self.prepare_prediction_matrix(values, input_columns))
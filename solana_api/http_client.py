@@ -0,0 +1,74 @@
+import asyncio
+import logging
+import weakref
+from typing import Optional
+
+import aiohttp
+
+logger = logging.getLogger(__name__)
+
+HTTP_CONNECTION_LIMIT = 100
+HTTP_CONNECTION_LIMIT_PER_HOST = 20
+DNS_CACHE_TTL_SECONDS = 300
+KEEPALIVE_TIMEOUT_SECONDS = 60
+REQUEST_TIMEOUT_SECONDS = 60
+
+
+class HttpClientManager:
+    """
+    Process wide aiohttp sessions for all outbound HTTP calls (Jupiter, Birdeye, RPC).
+
+    Sessions keep their TCP/TLS connections alive between requests, limit the connections per host and cache DNS
+    lookups. An aiohttp session is bound to the event loop it was created in and RQ runs every job in a new loop, so
+    there is one session per running loop. Call close() before the loop ends.
+    """
+
+    def __init__(self, limit: int = HTTP_CONNECTION_LIMIT, limit_per_host: int = HTTP_CONNECTION_LIMIT_PER_HOST,
+                 dns_cache_ttl: int = DNS_CACHE_TTL_SECONDS, keepalive_timeout: float = KEEPALIVE_TIMEOUT_SECONDS,
+                 request_timeout: float = REQUEST_TIMEOUT_SECONDS):
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.dns_cache_ttl = dns_cache_ttl
+        self.keepalive_timeout = keepalive_timeout
+        self.request_timeout = request_timeout
+        self._sessions: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, aiohttp.ClientSession] = \
+            weakref.WeakKeyDictionary()
+
+    def create_session(self) -> aiohttp.ClientSession:
+        connector = aiohttp.TCPConnector(limit=self.limit, limit_per_host=self.limit_per_host,
+                                         ttl_dns_cache=self.dns_cache_ttl, keepalive_timeout=self.keepalive_timeout,
+                                         enable_cleanup_closed=True)
+        return aiohttp.ClientSession(connector=connector,
+                                     timeout=aiohttp.ClientTimeout(total=self.request_timeout))
+
+    def get_session(self) -> aiohttp.ClientSession:
+        """Returns the session of the running event loop, do not close it or use it as context manager."""
+        loop = asyncio.get_running_loop()
+        session = self._sessions.get(loop)
+        if session is None or session.closed:
+            session = self.create_session()
+            self._sessions[loop] = session
+
+        return session
+
+    async def close(self):
+        """Closes the session of the running event loop and its connections."""
+        session: Optional[aiohttp.ClientSession] = self._sessions.pop(asyncio.get_running_loop(), None)
+        if session is None or session.closed:
+            return
+
+        try:
+            await session.close()
+        except Exception as e:
+            logger.exception("Failed to close http session")
+
+
+_http_client_manager = HttpClientManager()
+
+
+def get_http_session() -> aiohttp.ClientSession:
+    return _http_client_manager.get_session()
+
+
+async def close_http_session():
+    await _http_client_manager.close()
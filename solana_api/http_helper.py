@@ -2,19 +2,21 @@ import asyncio
 
 import aiohttp
 import logging
+
+from solana_api.http_client import get_http_session
+
 logger = logging.getLogger(__name__)
 
 
 async def make_http_request(method: str, url: str, **kwargs):
     """Generic function to handle HTTP requests with error handling."""
     try:
-        async with aiohttp.ClientSession() as session:
-            async with session.request(method, url, **kwargs) as response:
-                if response.status == 200:
-                    return await response.json()
-                else:
-                    logger.error("Request failed, status code: %d, response: %s", response.status, await response.text())
-                    return None
+        async with get_http_session().request(method, url, **kwargs) as response:
+            if response.status == 200:
+                return await response.json()
+            else:
+                logger.error("Request failed, status code: %d, response: %s", response.status, await response.text())
+                return None
     except aiohttp.ClientError as e:
         logger.error("Network error occurred: %s", str(e))
         return None
@@ -3,13 +3,13 @@ import logging
 from base64 import b64decode
 from typing import Optional, Any, Tuple
 
-import aiohttp
 from solana.rpc.async_api import AsyncClient
 from solana.rpc.types import TxOpts
 from solders.keypair import Keypair
 from solders.message import to_bytes_versioned
 from solders.transaction import VersionedTransaction
 
+from solana_api.http_client import get_http_session
 from solana_api.http_helper import make_http_request_with_retry
 
 logger = logging.getLogger(__name__)
@@ -28,12 +28,11 @@ async def get_token_price(token_address: str, show_extra_info: bool = False) ->
         'showExtraInfo': str(show_extra_info).lower()
     }
 
-    async with aiohttp.ClientSession() as session:
-        async with session.get(url, params=params) as response:
-            response.raise_for_status()  # Ensure the request was successful
-            data = await response.json()
-            logger.info("Price result data", extra={"data": data})
-            return float(data["data"][token_address]["price"])
+    async with get_http_session().get(url, params=params) as response:
+        response.raise_for_status()  # Ensure the request was successful
+        data = await response.json()
+        logger.info("Price result data", extra={"data": data})
+        return float(data["data"][token_address]["price"])
 
 
 async def get_token_price_by_quote(token: str, amount: int, buy: bool, sol_price: float) -> Optional[
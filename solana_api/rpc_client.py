@@ -0,0 +1,184 @@
+import asyncio
+import logging
+import time
+import weakref
+from collections import deque
+from typing import Deque, Dict, Optional, Tuple
+
+import httpx
+import numpy as np
+from solana.rpc.async_api import AsyncClient
+from solana.rpc.providers.async_http import AsyncHTTPProvider
+from solana.rpc.providers.core import _after_request_unparsed
+from solders.rpc.requests import Body
+
+from constants import SOL_RPC
+from env_data.get_env_value import get_env_value
+
+logger = logging.getLogger(__name__)
+
+RPC_TIMEOUT_SECONDS = 10
+RPC_MAX_CONNECTIONS = 50
+RPC_MAX_KEEPALIVE_CONNECTIONS = 20
+RPC_KEEPALIVE_EXPIRY_SECONDS = 60
+RPC_MAX_RETRIES = 3
+RPC_RETRY_BASE_DELAY_SECONDS = 0.25
+RPC_RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+RPC_LATENCY_SAMPLES = 1000
+RPC_STATS_LOG_INTERVAL_SECONDS = 60
+
+
+class RpcLatencyStats:
+    """Latency of the last RPC_LATENCY_SAMPLES calls per RPC method, logged once per log interval."""
+
+    def __init__(self, max_samples: int = RPC_LATENCY_SAMPLES,
+                 log_interval: float = RPC_STATS_LOG_INTERVAL_SECONDS):
+        self.max_samples = max_samples
+        self.log_interval = log_interval
+        self.samples: Dict[str, Deque[float]] = dict()
+        self.calls: Dict[str, int] = dict()
+        self.errors: Dict[str, int] = dict()
+        self.retries: Dict[str, int] = dict()
+        self.last_log = time.monotonic()
+
+    def record(self, method: str, seconds: float, success: bool, retries: int):
+        self.samples.setdefault(method, deque(maxlen=self.max_samples)).append(seconds)
+        self.calls[method] = self.calls.get(method, 0) + 1
+        self.retries[method] = self.retries.get(method, 0) + retries
+        if not success:
+            self.errors[method] = self.errors.get(method, 0) + 1
+
+        if time.monotonic() - self.last_log >= self.log_interval:
+            self.log()
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """Calls, errors, retries and p50/p99/max latency in ms per RPC method."""
+        result = dict()
+        for method, samples in self.samples.items():
+            latencies = np.array(samples) * 1000
+            result[method] = {
+                "calls": self.calls[method],
+                "errors": self.errors.get(method, 0),
+                "retries": self.retries.get(method, 0),
+                "p50_ms": float(np.percentile(latencies, 50)),
+                "p99_ms": float(np.percentile(latencies, 99)),
+                "max_ms": float(latencies.max()),
+            }
+
+        return result
+
+    def log(self):
+        self.last_log = time.monotonic()
+        if len(self.samples) > 0:
+            logger.info("RPC latency per method", extra={"rpc_latency": self.summary()})
+
+    def reset(self):
+        self.samples.clear()
+        self.calls.clear()
+        self.errors.clear()
+        self.retries.clear()
+
+
+rpc_latency_stats = RpcLatencyStats()
+
+
+def get_method_name(body: Body) -> str:
+    return type(body).__name__
+
+
+class PooledHTTPProvider(AsyncHTTPProvider):
+    """
+    RPC provider with a keep-alive connection pool, retries with exponential backoff and latency instrumentation.
+
+    Concurrent calls are multiplexed over up to max_connections kept-alive connections. Transport errors, timeouts and
+    HTTP 429/5xx responses are retried, every attempt is timed per RPC method in rpc_latency_stats.
+    """
+
+    def __init__(self, endpoint: str, timeout: float = RPC_TIMEOUT_SECONDS,
+                 max_connections: int = RPC_MAX_CONNECTIONS,
+                 max_keepalive_connections: int = RPC_MAX_KEEPALIVE_CONNECTIONS,
+                 max_retries: int = RPC_MAX_RETRIES, retry_base_delay: float = RPC_RETRY_BASE_DELAY_SECONDS,
+                 stats: RpcLatencyStats = rpc_latency_stats):
+        super().__init__(endpoint, timeout=timeout)
+        self.session = httpx.AsyncClient(timeout=timeout, limits=httpx.Limits(
+            max_connections=max_connections, max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=RPC_KEEPALIVE_EXPIRY_SECONDS))
+        self.max_retries = max_retries
+        self.retry_base_delay = retry_base_delay
+        self.stats = stats
+
+    async def post_with_retry(self, method: str, request_kwargs: dict) -> str:
+        attempt = 0
+        start = time.perf_counter()
+        while True:
+            try:
+                response = await self.session.post(**request_kwargs)
+                if response.status_code not in RPC_RETRY_STATUS_CODES or attempt >= self.max_retries:
+                    result = _after_request_unparsed(response)
+                    self.stats.record(method, time.perf_counter() - start, True, attempt)
+                    return result
+
+                logger.warning("RPC call failed with status, retry",
+                               extra={"method": method, "status": response.status_code, "attempt": attempt})
+            except httpx.TransportError as e:
+                if attempt >= self.max_retries:
+                    self.stats.record(method, time.perf_counter() - start, False, attempt)
+                    raise
+
+                logger.warning("RPC call failed, retry", extra={"method": method, "error": str(e), "attempt": attempt})
+            except httpx.HTTPStatusError:
+                self.stats.record(method, time.perf_counter() - start, False, attempt)
+                raise
+
+            await asyncio.sleep(self.retry_base_delay * 2 ** attempt)
+            attempt += 1
+
+    async def make_request_unparsed(self, body: Body) -> str:
+        return await self.post_with_retry(get_method_name(body), self._before_request(body=body))
+
+    async def make_batch_request_unparsed(self, reqs: Tuple[Body, ...]) -> str:
+        methods = sorted({get_method_name(body) for body in reqs})
+        return await self.post_with_retry(f"batch[{','.join(methods)}]", self._before_batch_request(reqs))
+
+
+class SolanaClientPool:
+    """
+    Long-lived Solana RPC clients keyed by endpoint.
+
+    The underlying httpx client is bound to the event loop it was first used in and RQ runs every job in a new loop,
+    so clients are kept per running loop. Call close() before the loop ends.
+    """
+
+    def __init__(self):
+        self._clients: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, AsyncClient]] = \
+            weakref.WeakKeyDictionary()
+
+    def get_client(self, endpoint: str) -> AsyncClient:
+        clients = self._clients.setdefault(asyncio.get_running_loop(), dict())
+        client = clients.get(endpoint)
+        if client is None:
+            client = AsyncClient(endpoint, timeout=RPC_TIMEOUT_SECONDS)
+            client._provider = PooledHTTPProvider(endpoint)
+            clients[endpoint] = client
+
+        return client
+
+    async def close(self):
+        clients = self._clients.pop(asyncio.get_running_loop(), dict())
+        for endpoint, client in clients.items():
+            try:
+                await client.close()
+            except Exception as e:
+                logger.exception("Failed to close solana client", extra={"endpoint": endpoint})
+
+
+_solana_client_pool = SolanaClientPool()
+
+
+def get_solana_client(rpc: Optional[str] = None) -> AsyncClient:
+    """Shared client of an RPC endpoint (SOL_RPC by default), do not close it or use it as context manager."""
+    return _solana_client_pool.get_client(get_env_value(SOL_RPC) if rpc is None else rpc)
+
+
+async def close_solana_clients():
+    await _solana_client_pool.close()
@@ -1,25 +1,135 @@
+import asyncio
+import itertools
+import json
 import logging
+import time
+import weakref
 from asyncio import sleep
 from datetime import datetime
-from typing import Optional, Tuple, List
+from typing import Optional, Tuple, List, Callable, Type, Set
 
 from solana.rpc.async_api import AsyncClient
-from solana.rpc.commitment import Finalized
+from solana.rpc.core import RPCNoResultException
+from solana.rpc.providers.core import _parse_raw
+from solders.commitment_config import CommitmentLevel
 from solders.pubkey import Pubkey
-from solders.rpc.responses import GetTransactionResp, RpcConfirmedTransactionStatusWithSignature
+from solders.rpc.config import RpcSignaturesForAddressConfig, RpcTransactionConfig
+from solders.rpc.requests import Body, GetSignaturesForAddress, GetTransaction
+from solders.rpc.responses import GetTransactionResp, RpcConfirmedTransactionStatusWithSignature, \
+    GetSignaturesForAddressResp
 from solders.signature import Signature
-from solders.transaction_status import EncodedTransactionWithStatusMeta, EncodedConfirmedTransactionWithStatusMeta
+from solders.transaction_status import EncodedTransactionWithStatusMeta, EncodedConfirmedTransactionWithStatusMeta, \
+    UiTransactionEncoding
 
 from constants import PUMP_DOT_FUN_ID
-from database.event_table import signature_exists
+from data.signature_cache import claim_signature, release_signature
 from dto.trade_model import Trade
+from solana_api.rpc_client import get_solana_client
 
 logger = logging.getLogger(__name__)
 
+# 0 flushes on the next loop tick, so a single request is not delayed, a window only pays off in pipelines that issue
+# many requests close to each other
+RPC_BATCH_WINDOW_SECONDS = 0
+RPC_MAX_BATCH_SIZE = 100
+
+
+class RpcBatchCoalescer:
+    """
+    Collects the RPC requests made within a short window and sends them as one JSON-RPC batch.
+
+    The first pending request schedules a flush after window seconds, with a window of 0 on the next loop tick, so
+    requests started in the same tick (e.g. by asyncio.gather) share a batch. A full batch is flushed immediately.
+    Responses are matched to the awaiting coroutines by request id, an error response only fails its own request.
+    """
+
+    def __init__(self, client: AsyncClient, window: float = RPC_BATCH_WINDOW_SECONDS,
+                 max_batch_size: int = RPC_MAX_BATCH_SIZE):
+        self.client = client
+        self.window = window
+        self.max_batch_size = max_batch_size
+        self._ids = itertools.count(1)
+        self._pending: List[Tuple[Body, Type, asyncio.Future]] = list()
+        self._flush_handle: Optional[asyncio.Handle] = None
+        self._tasks: Set[asyncio.Task] = set()
+
+    async def request(self, create_body: Callable[[int], Body], parser: Type):
+        """
+        Adds a request to the next batch and waits for its parsed response.
+
+        Args:
+            create_body: Creates the request body for the given request id.
+            parser: Response type used to parse the result, e.g. GetTransactionResp.
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((create_body(next(self._ids)), parser, future))
+        if len(self._pending) >= self.max_batch_size:
+            self.flush()
+        elif self._flush_handle is None and self.window > 0:
+            self._flush_handle = loop.call_later(self.window, self.flush)
+        elif self._flush_handle is None:
+            self._flush_handle = loop.call_soon(self.flush)
+
+        return await future
+
+    def flush(self):
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+
+        pending, self._pending = self._pending, list()
+        if len(pending) == 0:
+            return
+
+        task = asyncio.get_running_loop().create_task(self.send_batch(pending))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def send_batch(self, pending: List[Tuple[Body, Type, asyncio.Future]]):
+        try:
+            raw = await self.client._provider.make_batch_request_unparsed(tuple(body for body, _, _ in pending))
+            items = json.loads(raw)
+            if not isinstance(items, list):
+                raise RPCNoResultException(f"Invalid batch response: {raw[:200]}")
+            responses = {item.get("id"): item for item in items}
+        except Exception as e:
+            logger.exception("Failed to send rpc batch", extra={"size": len(pending)})
+            for _, _, future in pending:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for body, parser, future in pending:
+            if future.done():
+                continue
+
+            response = responses.get(body.id)
+            try:
+                if response is None:
+                    raise RPCNoResultException(f"Missing response for request id {body.id}")
+                future.set_result(_parse_raw(json.dumps(response), parser))
+            except Exception as e:
+                future.set_exception(e)
+
+
+_batch_coalescers: weakref.WeakKeyDictionary[AsyncClient, RpcBatchCoalescer] = weakref.WeakKeyDictionary()
+
+
+def get_batch_coalescer(client: AsyncClient) -> RpcBatchCoalescer:
+    coalescer = _batch_coalescers.get(client)
+    if coalescer is None:
+        coalescer = RpcBatchCoalescer(client)
+        _batch_coalescers[client] = coalescer
+
+    return coalescer
+
 
 async def get_recent_signature(client: AsyncClient, account: Pubkey) -> RpcConfirmedTransactionStatusWithSignature:
     try:
-        response = await client.get_signatures_for_address(account, limit=1, commitment=Finalized)
+        config = RpcSignaturesForAddressConfig(limit=1, commitment=CommitmentLevel.Finalized)
+        response = await get_batch_coalescer(client).request(
+            lambda request_id: GetSignaturesForAddress(account, config, request_id), GetSignaturesForAddressResp)
         return response.value[0]
     except Exception as e:
         logger.exception("Failed to get recent signature", extra={"trader": str(account)})
@@ -28,9 +138,10 @@ async def get_recent_signature(client: AsyncClient, account: Pubkey) -> RpcConfi
 async def get_transaction(client: AsyncClient,
                           signature: Signature) -> EncodedConfirmedTransactionWithStatusMeta:
     try:
-        response = await client.get_transaction(signature,
-                                                max_supported_transaction_version=0,
-                                                commitment=Finalized)
+        config = RpcTransactionConfig(encoding=UiTransactionEncoding.Json, commitment=CommitmentLevel.Finalized,
+                                      max_supported_transaction_version=0)
+        response = await get_batch_coalescer(client).request(
+            lambda request_id: GetTransaction(signature, config, request_id), GetTransactionResp)
         return response.value
     except Exception as e:
         logger.exception("Failed to get recent signature", extra={"signature": str(signature)})
@@ -71,48 +182,102 @@ async def get_block_transactions(client: AsyncClient, slot: int) -> Optional[
     return 0, []
 
 
-async def get_latest_user_trade(user: Pubkey, rpc: str) -> Optional[Trade]:
+async def get_latest_user_trade(user: Pubkey, rpc: str, claimed_key: Optional[str] = None) -> Optional[Trade]:
+    """
+    Loads the trade of the latest signature of a user.
+
+    The signature is claimed, see data.signature_cache. If the transaction can not be loaded the claim and the
+    claimed_key of the caller are released, so a redelivered notification is checked again.
+    """
+    claimed = [claimed_key] if claimed_key is not None else list()
     try:
-        async with AsyncClient(rpc) as client:
-            latest_signature = await get_recent_signature(client, user)
-            logger.info("Check latest signature of trader", extra={"trader": str(user),
+        client = get_solana_client(rpc)
+        latest_signature = await get_recent_signature(client, user)
+        logger.info("Check latest signature of trader", extra={"trader": str(user),
+                                                               "signature": str(latest_signature.signature)})
+        if latest_signature.err is not None:
+            logger.info("Skip failed transaction", extra={"trader": str(user),
+                                                          "signature": str(latest_signature.signature)})
+            return None
+
+        if not await claim_signature(str(latest_signature.signature)):
+            logger.info("Latest signature already checked", extra={"trader": str(user),
                                                                    "signature": str(latest_signature.signature)})
-            if latest_signature.err is not None:
-                logger.info("Skip failed transaction", extra={"trader": str(user),
-                                                              "signature": str(latest_signature.signature)})
-                return None
-
-            already_done = signature_exists(str(latest_signature.signature))
-            if already_done == str(latest_signature.signature):
-                logger.info("Latest signature already checked", extra={"trader": str(user),
-                                                                       "signature": str(latest_signature.signature)})
-                return None
-
-            logger.info("Get tx for signature", extra={"signature": str(latest_signature.signature)})
-            tx = await get_transaction(client, latest_signature.signature)
-            if tx is None:
-                logger.warning("Failed to load tx data", extra={"signature": str(latest_signature.signature)})
-
-            logger.info("Check tx for trades", extra={"signature": str(latest_signature.signature)})
-            trade = get_user_trade(user, tx.transaction, tx.block_time)
-
-            return trade
+            return None
+        claimed.append(str(latest_signature.signature))
+
+        logger.info("Get tx for signature", extra={"signature": str(latest_signature.signature)})
+        tx = await get_transaction(client, latest_signature.signature)
+        if tx is None:
+            logger.warning("Failed to load tx data", extra={"signature": str(latest_signature.signature)})
+            for key in claimed:
+                await release_signature(key)
+            return None
+
+        logger.info("Check tx for trades", extra={"signature": str(latest_signature.signature)})
+        trade = get_user_trade(user, tx.transaction, tx.block_time)
+
+        return trade
     except Exception as e:
         logger.exception("Failed to load latest user trade")
+        for key in claimed:
+            await release_signature(key)
+
+
+async def get_user_trade_by_signature(user: Pubkey, signature: Signature, rpc: str) -> Optional[Trade]:
+    """
+    Loads the trade of a signature pushed by logsSubscribe, no getSignaturesForAddress round-trip needed.
+
+    The signature has to be claimed by the caller, see data.signature_cache. It is released again if the transaction
+    can not be loaded.
+    """
+    try:
+        tx = await get_transaction(get_solana_client(rpc), signature)
+        if tx is None:
+            logger.warning("Failed to load tx data", extra={"signature": str(signature)})
+            await release_signature(str(signature))
+            return None
+
+        return get_user_trade(user, tx.transaction, tx.block_time)
+    except Exception as e:
+        logger.exception("Failed to load user trade", extra={"trader": str(user), "signature": str(signature)})
+        await release_signature(str(signature))
+
+
+def get_user_trade_from_notification(user: Pubkey, notification: dict) -> Optional[Trade]:
+    """
+    Parses the trade straight from a transactionSubscribe notification without any RPC call.
+
+    Args:
+        user: Tracked wallet of the subscription.
+        notification: Result of the notification, holds the transaction with its meta in json encoding.
+    """
+    try:
+        tx = EncodedTransactionWithStatusMeta.from_json(json.dumps(notification["transaction"]))
+        if tx.meta is None or tx.meta.err is not None:
+            logger.info("Skip failed transaction", extra={"trader": str(user),
+                                                          "signature": notification.get("signature")})
+            return None
+
+        # notifications carry no block time, they are pushed as soon as the transaction reached the commitment
+        block_time = notification.get("blockTime") or int(time.time())
+        return get_user_trade(user, tx, block_time)
+    except Exception as e:
+        logger.exception("Failed to parse transaction notification", extra={"trader": str(user)})
 
 
 async def get_user_trades_in_block(user: Pubkey, slot: int, rpc: str) -> List[Trade]:
     trades = list()
     try:
-        async with AsyncClient(rpc) as client:
-            block_time, tx_list = await get_block_transactions(client, slot)
-            logger.info("Loaded block details", extra={"slot": slot})
-            for tx in tx_list:
-                trade = get_user_trade(user, tx, block_time)
-                if trade is not None:
-                    trades.append(trade)
-                    logger.info("found trades in block", extra={"slot": slot})
-            return trades
+        client = get_solana_client(rpc)
+        block_time, tx_list = await get_block_transactions(client, slot)
+        logger.info("Loaded block details", extra={"slot": slot})
+        for tx in tx_list:
+            trade = get_user_trade(user, tx, block_time)
+            if trade is not None:
+                trades.append(trade)
+                logger.info("found trades in block", extra={"slot": slot})
+        return trades
     except Exception as e:
         logger.exception("Failed to load trades", extra={"trader": str(user)})
         return trades
@@ -14,6 +14,7 @@ from data.data_format import get_sol_price
 from data.redis_helper import get_async_redis
 from env_data.get_env_value import get_env_value
 from solana_api.jupiter_api import get_quote, get_token_price, swap_from_quote, get_price_in_usd_buy
+from solana_api.rpc_client import get_solana_client
 from solana_api.solana_data import get_transaction
 from solana_api.spl_token import get_token_balance
 
@@ -48,7 +49,7 @@ async def wait_for_tx_confirmed(client: AsyncClient, tx_id: str, max_wait_time:
 
 def setup_buy() -> Tuple[AsyncClient, Keypair, redis.asyncio.Redis]:
     rpc = get_env_value(SOL_RPC)
-    sol_client = AsyncClient(rpc)
+    sol_client = get_solana_client(rpc)
     private_key = get_env_value(PRIVATE_KEY)
     private_key = base58.b58decode(private_key)
     wallet = Keypair.from_bytes(private_key)
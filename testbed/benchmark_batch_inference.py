@@ -0,0 +1,68 @@
+import time
+
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import HistGradientBoostingClassifier
+
+from constants import RANDOM_SEED, TOKEN_COLUMN, TRADING_MINUTE_COLUMN
+from ml_model.hist_gradient_model_builder import HistGradientBoostModelBuilder
+
+FEATURE_COUNT = 120
+TRAIN_ROWS = 5000
+BATCH_SIZES = [1, 100, 10000]
+MAX_SINGLE_ROW_CALLS = 1000
+
+
+def create_model(feature_count: int, train_rows: int) -> HistGradientBoostModelBuilder:
+    rng = np.random.default_rng(RANDOM_SEED)
+    columns = [f"trader{i}_sol_amount_spent" for i in range(feature_count)]
+    train_x = pd.DataFrame(rng.random((train_rows, feature_count)), columns=columns)
+    train_y = train_x.iloc[:, :5].sum(axis=1) > 2.5
+
+    model = HistGradientBoostModelBuilder(dict())
+    model.columns = columns
+    model.model = HistGradientBoostingClassifier(random_state=RANDOM_SEED).fit(train_x, train_y)
+    return model
+
+
+def create_rows(model: HistGradientBoostModelBuilder, row_count: int) -> pd.DataFrame:
+    rng = np.random.default_rng(RANDOM_SEED + row_count)
+    data = pd.DataFrame(rng.random((row_count, len(model.columns))), columns=model.columns)
+    data[TOKEN_COLUMN] = [f"token_{i}" for i in range(row_count)]
+    data[TRADING_MINUTE_COLUMN] = pd.Timestamp("2024-12-01")
+    return data
+
+
+def time_single_row_predictions(model: HistGradientBoostModelBuilder, data: pd.DataFrame) -> float:
+    rows = [data.iloc[[i]] for i in range(min(len(data), MAX_SINGLE_ROW_CALLS))]
+    start = time.perf_counter()
+    for row in rows:
+        prediction_data, _ = model.prepare_prediction_data(row.copy(), False)
+        model.predict(prediction_data)
+    return (time.perf_counter() - start) / len(rows)
+
+
+def time_batch_prediction(model: HistGradientBoostModelBuilder, data: pd.DataFrame) -> float:
+    values = data.drop(columns=[TOKEN_COLUMN, TRADING_MINUTE_COLUMN])
+    columns = list(values.columns)
+    values = values.to_numpy()
+    model.predict_batch(values[:1], columns)  # compile the column index arrays
+
+    start = time.perf_counter()
+    model.predict_batch(values, columns)
+    return (time.perf_counter() - start) / len(data)
+
+
+def run_benchmark():
+    model = create_model(FEATURE_COUNT, TRAIN_ROWS)
+    print(f"{FEATURE_COUNT} features")
+    for batch_size in BATCH_SIZES:
+        data = create_rows(model, batch_size)
+        single_row = time_single_row_predictions(model, data)
+        batch = time_batch_prediction(model, data)
+        print(f"N={batch_size:>6}: one-row calls {single_row * 1e6:10.1f} us/row, "
+              f"batched {batch * 1e6:10.1f} us/row ({single_row / batch:.0f}x)")
+
+
+if __name__ == '__main__':
+    run_benchmark()
@@ -0,0 +1,88 @@
+import os
+import time
+from datetime import datetime, timedelta
+from functools import partial
+from typing import Callable, List
+
+import pandas as pd
+import psycopg2
+from dotenv import load_dotenv
+
+from constants import DATABASE_NAME, POSTGRES_USER, POSTGRES_PASSWORD, ROOT_DIR
+from database.db_connection import DatabasePool, set_db_pool
+from database.raw_sql import run_sql_file, run_migrations
+from database.token_creation_info_table import insert_token_creation_info, insert_token_creation_infos
+from database.token_sample_table import insert_token_sample, insert_token_samples
+from database.trade_table import insert_trade, insert_trades
+from dto.token_sample_model import TokenSample
+from dto.trade_model import Trade
+from env_data.get_env_value import get_env_value
+
+PG_HOST = "localhost"
+TRADE_COUNT = 20_000
+CREATION_INFO_COUNT = 20_000
+SAMPLE_COUNT = 500
+BATCH_SIZES = [100, 1000, 5000]
+
+
+def create_trades(count: int) -> List[Trade]:
+    start = datetime(2025, 1, 1)
+    return [Trade(f"trader_{i % 500}", f"token_{i % 1000}", 1000, 1_000_000, i % 2 == 0, 1000,
+                  (start + timedelta(seconds=i)).isoformat(), f"signature_{i}") for i in range(count)]
+
+
+def create_samples(count: int) -> List[TokenSample]:
+    candles = pd.DataFrame({"trading_minute": pd.date_range(datetime(2025, 1, 1), periods=120, freq="min"),
+                            "price": 1.0, "volume": 2.0})
+    return [TokenSample(f"token_{i}", candles) for i in range(count)]
+
+
+def measure(name: str, rows: int, function: Callable[[], object]):
+    start = time.perf_counter()
+    function()
+    duration = time.perf_counter() - start
+    print(f"{name:>40}: {rows / duration:10.0f} rows/s")
+
+
+def truncate(connect: Callable):
+    conn = connect()
+    with conn.cursor() as cursor:
+        cursor.execute("TRUNCATE trades, token_sample, token_creation_info")
+    conn.commit()
+    conn.close()
+
+
+def run_benchmark():
+    connect = partial(psycopg2.connect, dbname=DATABASE_NAME, user=get_env_value(POSTGRES_USER),
+                      password=get_env_value(POSTGRES_PASSWORD), host=PG_HOST)
+    set_db_pool(DatabasePool(1, 1, connect=connect))
+    run_sql_file(os.path.join(ROOT_DIR, "database/tables.sql"))
+    run_migrations()
+
+    trades = create_trades(TRADE_COUNT)
+    infos = [(f"token_{i}", "creator", datetime(2025, 1, 1)) for i in range(CREATION_INFO_COUNT)]
+    samples = create_samples(SAMPLE_COUNT)
+
+    truncate(connect)
+    measure("trades, one insert per row", TRADE_COUNT, lambda: [insert_trade(trade) for trade in trades])
+    for batch_size in BATCH_SIZES:
+        truncate(connect)
+        measure(f"trades, bulk batch {batch_size}", TRADE_COUNT, lambda: insert_trades(trades, batch_size))
+
+    truncate(connect)
+    measure("creation info, one insert per row", CREATION_INFO_COUNT,
+            lambda: [insert_token_creation_info(*info) for info in infos])
+    for batch_size in BATCH_SIZES:
+        truncate(connect)
+        measure(f"creation info, bulk batch {batch_size}", CREATION_INFO_COUNT,
+                lambda: insert_token_creation_infos(infos, batch_size))
+
+    truncate(connect)
+    measure("samples, one insert per row", SAMPLE_COUNT, lambda: [insert_token_sample(sample) for sample in samples])
+    truncate(connect)
+    measure("samples, bulk batch 100", SAMPLE_COUNT, lambda: insert_token_samples(samples, 100))
+
+
+if __name__ == '__main__':
+    load_dotenv()
+    run_benchmark()
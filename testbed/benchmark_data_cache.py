@@ -0,0 +1,62 @@
+import os
+import pickle
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from constants import RANDOM_SEED
+from data.data_cache import DataCache
+
+ROW_COUNT = 10_000_000
+TOKEN_COUNT = 5000
+FEATURE_COUNT = 20
+
+
+def create_token_samples(row_count: int, seed: int = RANDOM_SEED) -> pd.DataFrame:
+    """Frame shaped like token_samples_full, a token column, the trading minute and float features."""
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({f"feature_{index}": rng.random(row_count) for index in range(FEATURE_COUNT)})
+    df.insert(0, "token", pd.Categorical.from_codes(rng.integers(0, TOKEN_COUNT, row_count),
+                                                    [f"token_{index}" for index in range(TOKEN_COUNT)]))
+    df.insert(1, "trading_minute", pd.Timestamp("2024-11-01") + pd.to_timedelta(np.arange(row_count), unit="min"))
+    return df
+
+
+def run_benchmark(row_count: int):
+    df = create_token_samples(row_count)
+    print(f"{row_count} rows, {df.memory_usage(deep=True).sum() / 1024 ** 2:.0f} MB")
+    with tempfile.TemporaryDirectory() as directory:
+        pickle_path = os.path.join(directory, "token_samples_full.pkl")
+        start = time.perf_counter()
+        with open(pickle_path, "wb") as f:
+            pickle.dump(df, f)
+        print(f"pickle write: {time.perf_counter() - start:.2f}s")
+
+        cache = DataCache(os.path.join(directory, "cache"), max_bytes=None, legacy_folder=None)
+        start = time.perf_counter()
+        cache.put("token_samples_full", df)
+        print(f"cache write: {time.perf_counter() - start:.2f}s")
+        del df
+
+        start = time.perf_counter()
+        with open(pickle_path, "rb") as f:
+            pickle.load(f)
+        print(f"pickle read: {time.perf_counter() - start:.2f}s")
+
+        start = time.perf_counter()
+        cache.get("token_samples_full")
+        print(f"cache read: {time.perf_counter() - start:.2f}s")
+
+        start = time.perf_counter()
+        cache.get("token_samples_full", read_only=True)
+        print(f"cache read only (memory mapped): {time.perf_counter() - start:.2f}s")
+
+        start = time.perf_counter()
+        cache.get("token_samples_full", columns=["token", "feature_0"])
+        print(f"cache read of 2 columns: {time.perf_counter() - start:.2f}s")
+
+
+if __name__ == '__main__':
+    run_benchmark(ROW_COUNT)
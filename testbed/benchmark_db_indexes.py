@@ -0,0 +1,155 @@
+import os
+import random
+import time
+from datetime import datetime, timedelta
+from functools import partial
+from typing import Callable, Dict
+
+import numpy as np
+import psycopg2
+from dotenv import load_dotenv
+from psycopg2 import sql
+
+from constants import POSTGRES_USER, POSTGRES_PASSWORD, ROOT_DIR
+from database.db_connection import DatabasePool, set_db_pool
+from database.event_table import signature_exists
+from database.raw_sql import run_sql_file, run_migrations
+from database.token_creation_info_table import select_token_creation_info
+from database.token_dataset_table import get_token_datasets_by_daterange
+from database.token_watch_table import token_watch_exists, get_token_watch
+from database.trade_table import get_trades_by_token, get_new_trades_by_token
+from env_data.get_env_value import get_env_value
+
+PG_HOST = "localhost"
+BENCHMARK_DATABASE = "index_benchmark"
+TRADE_COUNT = 10_000_000
+TOKEN_COUNT = 100_000
+EVENT_COUNT = 1_000_000
+DATASET_COUNT = 1_000_000
+QUERY_REPEATS = 50
+START_TIME = datetime(2025, 1, 1)
+
+
+def connect_admin():
+    conn = psycopg2.connect(dbname="postgres", user=get_env_value(POSTGRES_USER),
+                            password=get_env_value(POSTGRES_PASSWORD), host=PG_HOST)
+    conn.autocommit = True
+    return conn
+
+
+def recreate_database():
+    conn = connect_admin()
+    with conn.cursor() as cursor:
+        cursor.execute(sql.SQL("DROP DATABASE IF EXISTS {}").format(sql.Identifier(BENCHMARK_DATABASE)))
+        cursor.execute(sql.SQL("CREATE DATABASE {}").format(sql.Identifier(BENCHMARK_DATABASE)))
+    conn.close()
+
+
+def seed_tables(conn):
+    """Seeds the tables server side with generate_series, tokens are spread uniformly."""
+    with conn.cursor() as cursor:
+        cursor.execute("""
+        INSERT INTO trades (trader, token, token_amount, sol_amount, buy, token_holding_after, trade_time, tx_signature)
+        SELECT 'trader_' || (i %% 5000), 'token_' || (i %% %(tokens)s), 1000, 1000000, i %% 2 = 0, 1000,
+               %(start)s + i * INTERVAL '1 second', 'signature_' || i
+        FROM generate_series(1, %(trades)s) AS i
+        """, {"tokens": TOKEN_COUNT, "start": START_TIME, "trades": TRADE_COUNT})
+
+        cursor.execute("""
+        INSERT INTO event (wallet, time, signature)
+        SELECT 'wallet_' || (i %% 5000), %(start)s + i * INTERVAL '1 second', 'signature_' || i
+        FROM generate_series(1, %(events)s) AS i
+        """, {"start": START_TIME, "events": EVENT_COUNT})
+
+        cursor.execute("""
+        INSERT INTO token_watch (token, start_time, end_time)
+        SELECT 'token_' || i, %(start)s, %(start)s + INTERVAL '2 hours'
+        FROM generate_series(1, %(tokens)s) AS i
+        """, {"start": START_TIME, "tokens": TOKEN_COUNT})
+
+        cursor.execute("""
+        INSERT INTO token_creation_info (token, creator, timestamp)
+        SELECT 'token_' || i, 'creator', %(start)s
+        FROM generate_series(1, %(tokens)s) AS i
+        """, {"start": START_TIME, "tokens": TOKEN_COUNT})
+
+        cursor.execute("""
+        INSERT INTO token_dataset (token, trading_minute, raw_data)
+        SELECT 'token_' || (i %% %(tokens)s), %(start)s + i * INTERVAL '1 minute', '\\x00'::bytea
+        FROM generate_series(1, %(datasets)s) AS i
+        """, {"tokens": TOKEN_COUNT, "start": START_TIME, "datasets": DATASET_COUNT})
+    conn.commit()
+
+    conn.autocommit = True
+    with conn.cursor() as cursor:
+        cursor.execute("VACUUM ANALYZE")
+    conn.autocommit = False
+
+
+def get_queries() -> Dict[str, Callable[[], object]]:
+    def random_token() -> str:
+        return f"token_{random.randrange(TOKEN_COUNT)}"
+
+    def random_minute() -> datetime:
+        return START_TIME + timedelta(minutes=random.randrange(DATASET_COUNT))
+
+    return {
+        "get_trades_by_token": lambda: get_trades_by_token(random_token()),
+        "get_new_trades_by_token": lambda: get_new_trades_by_token(random_token(), TRADE_COUNT // 2),
+        "signature_exists": lambda: signature_exists(f"signature_{random.randrange(EVENT_COUNT)}"),
+        "token_watch_exists": lambda: token_watch_exists(random_token()),
+        "get_token_watch": lambda: get_token_watch(random_token()),
+        "select_token_creation_info": lambda: select_token_creation_info(random_token()),
+        "get_token_datasets_by_daterange": lambda: (lambda start: get_token_datasets_by_daterange(
+            start, start + timedelta(minutes=60)))(random_minute()),
+    }
+
+
+def measure_queries() -> Dict[str, float]:
+    """Median latency in ms of every query over QUERY_REPEATS random lookups."""
+    latencies = dict()
+    for name, query in get_queries().items():
+        timings = list()
+        for _ in range(QUERY_REPEATS):
+            start = time.perf_counter()
+            query()
+            timings.append(time.perf_counter() - start)
+
+        latencies[name] = float(np.median(timings)) * 1000
+
+    return latencies
+
+
+def run_benchmark():
+    recreate_database()
+    connect = partial(psycopg2.connect, dbname=BENCHMARK_DATABASE, user=get_env_value(POSTGRES_USER),
+                      password=get_env_value(POSTGRES_PASSWORD), host=PG_HOST)
+    set_db_pool(DatabasePool(1, 1, connect=connect))
+    run_sql_file(os.path.join(ROOT_DIR, "database/tables.sql"))
+
+    print(f"Seed {TRADE_COUNT} trades")
+    start = time.perf_counter()
+    conn = connect()
+    seed_tables(conn)
+    print(f"Seeded in {time.perf_counter() - start:.1f} s")
+
+    before = measure_queries()
+
+    start = time.perf_counter()
+    applied = run_migrations()
+    print(f"Applied migrations {applied} in {time.perf_counter() - start:.1f} s")
+    conn.autocommit = True
+    with conn.cursor() as cursor:
+        cursor.execute("ANALYZE")
+    conn.close()
+
+    after = measure_queries()
+
+    print(f"{'query':>32} {'before ms':>10} {'after ms':>10} {'speedup':>8}")
+    for name in before.keys():
+        print(f"{name:>32} {before[name]:10.2f} {after[name]:10.2f} {before[name] / after[name]:7.1f}x")
+
+
+if __name__ == '__main__':
+    load_dotenv()
+    run_benchmark()
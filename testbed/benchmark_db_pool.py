@@ -0,0 +1,70 @@
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from functools import partial
+
+import numpy as np
+import psycopg2
+from dotenv import load_dotenv
+
+from constants import DATABASE_NAME, POSTGRES_USER, POSTGRES_PASSWORD, ROOT_DIR
+from database.db_connection import DatabasePool, set_db_pool
+from database.event_table import insert_event, signature_exists
+from database.raw_sql import run_sql_file
+from database.token_creation_info_table import select_token_creation_info
+from database.token_watch_table import token_watch_exists
+from database.trade_table import insert_trade
+from dto.trade_model import Trade
+from env_data.get_env_value import get_env_value
+
+EVENT_COUNT = 1000
+EVENT_WORKERS = 5
+POOL_SIZE = 5
+PG_HOST = "localhost"
+
+
+def handle_event_database_calls(i: int) -> float:
+    """The database calls handle_user_event makes for one wallet event."""
+    start = time.perf_counter()
+    signature = f"signature_{i}"
+    token = f"token_{i % 50}"
+
+    insert_event("wallet", datetime.utcnow(), signature)
+    signature_exists(signature)
+    token_watch_exists(token)
+    select_token_creation_info(token)
+    insert_trade(Trade("wallet", token, 1, 1, True, 1, datetime.utcnow().isoformat(), signature))
+
+    return time.perf_counter() - start
+
+
+def run_burst(pool: DatabasePool, name: str):
+    set_db_pool(pool)
+    with ThreadPoolExecutor(max_workers=EVENT_WORKERS) as executor:
+        start = time.perf_counter()
+        latencies = list(executor.map(handle_event_database_calls, range(EVENT_COUNT)))
+        duration = time.perf_counter() - start
+
+    pool.close()
+    print(f"{name:>16}: {pool.created_connections:5d} connections, "
+          f"p50 {np.percentile(latencies, 50) * 1000:7.2f} ms, p99 {np.percentile(latencies, 99) * 1000:7.2f} ms, "
+          f"{EVENT_COUNT / duration:7.1f} events/s")
+
+
+def run_benchmark():
+    connect = partial(psycopg2.connect, dbname=DATABASE_NAME, user=get_env_value(POSTGRES_USER),
+                      password=get_env_value(POSTGRES_PASSWORD), host=PG_HOST)
+
+    set_db_pool(DatabasePool(0, 1, connect=connect))
+    run_sql_file(os.path.join(ROOT_DIR, "database/tables.sql"))
+
+    print(f"{EVENT_COUNT} events, {EVENT_WORKERS} concurrent workers")
+    # max_idle=0 closes every connection after its call, like the previous connect per call
+    run_burst(DatabasePool(0, EVENT_WORKERS, max_idle=0, connect=connect), "connect per call")
+    run_burst(DatabasePool(1, POOL_SIZE, connect=connect), "pooled")
+
+
+if __name__ == '__main__':
+    load_dotenv()
+    run_benchmark()
@@ -0,0 +1,75 @@
+import multiprocessing
+import resource
+import time
+
+from dune_client.models import ResultsResponse
+
+from constants import RANDOM_SEED
+from dune.data_transform import transform_dune_result_to_pandas, transform_dune_result_typed
+
+ROW_COUNT = 5_000_000
+TOKEN_COUNT = 5000
+TRADER_COUNT = 20000
+COLUMN_NAMES = ["trader_id", "token", "block_time", "token_sold_amount", "token_bought_amount", "buy",
+                "block_slot"]
+COLUMN_TYPES = ["varchar", "varchar", "timestamp(3) with time zone", "double", "double", "boolean", "bigint"]
+
+
+def create_synthetic_result(row_count: int, seed: int = RANDOM_SEED) -> ResultsResponse:
+    """Rows shaped like the JSON rows of the trade list queries, strings are shared like after JSON decoding."""
+    import random
+    rng = random.Random(seed)
+    tokens = [f"token_{index}" for index in range(TOKEN_COUNT)]
+    traders = [f"trader_{index}" for index in range(TRADER_COUNT)]
+    times = [f"2024-11-{1 + minute // 1440:02d} {minute // 60 % 24:02d}:{minute % 60:02d}:00.000 UTC"
+             for minute in range(30 * 1440)]
+    rows = [{"trader_id": traders[rng.randrange(TRADER_COUNT)], "token": tokens[rng.randrange(TOKEN_COUNT)],
+             "block_time": times[rng.randrange(len(times))], "token_sold_amount": rng.random() * 1000,
+             "token_bought_amount": rng.random(), "buy": rng.random() < 0.6, "block_slot": 300_000_000 + index}
+            for index in range(row_count)]
+
+    return ResultsResponse.from_dict({
+        "execution_id": "benchmark", "query_id": 1, "state": "QUERY_STATE_COMPLETED",
+        "submitted_at": "2024-01-01T00:00:00Z",
+        "result": {"rows": rows,
+                   "metadata": {"column_names": COLUMN_NAMES, "column_types": COLUMN_TYPES,
+                                "total_row_count": row_count, "result_set_bytes": 0, "datapoint_count": 0,
+                                "execution_time_millis": 0}}})
+
+
+def get_peak_rss_mb() -> float:
+    # ru_maxrss is in KiB on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def measure(name: str, row_count: int, results: dict):
+    """Runs in its own process, so the peak RSS belongs to one transform only."""
+    query_result = create_synthetic_result(row_count)
+    rss_before = get_peak_rss_mb()
+    transform = transform_dune_result_typed if name == "typed" else transform_dune_result_to_pandas
+    start = time.perf_counter()
+    df = transform(query_result)
+    seconds = time.perf_counter() - start
+    results[name] = {"seconds": seconds, "rows_rss_mb": rss_before, "peak_rss_mb": get_peak_rss_mb(),
+                     "frame_mb": df.memory_usage(deep=True).sum() / 1024 ** 2}
+
+
+def run_benchmark(row_count: int):
+    print(f"{row_count} rows")
+    results = multiprocessing.Manager().dict()
+    for name in ["legacy", "typed"]:
+        process = multiprocessing.Process(target=measure, args=(name, row_count, results))
+        process.start()
+        process.join()
+        if name not in results:
+            print(f"{name}: failed (exit code {process.exitcode})")
+            continue
+
+        result = results[name]
+        print(f"{name}: {result['seconds']:.1f}s, peak RSS {result['peak_rss_mb']:.0f} MB "
+              f"(+{result['peak_rss_mb'] - result['rows_rss_mb']:.0f} MB over the decoded rows), "
+              f"DataFrame {result['frame_mb']:.0f} MB")
+
+
+if __name__ == '__main__':
+    run_benchmark(ROW_COUNT)
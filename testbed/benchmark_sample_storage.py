@@ -0,0 +1,70 @@
+import pickle
+import time
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from constants import TOKEN_COLUMN, TRADING_MINUTE_COLUMN, PRICE_COLUMN, TOTAL_VOLUME_COLUMN
+from database.dataframe_blob import serialize_dataframe, deserialize_table, concat_tables
+
+SAMPLE_COUNTS = [500, 1000, 2000]
+ROWS_PER_SAMPLE = 120
+TRADERS_PER_SAMPLE = 5
+
+
+def create_samples(count: int) -> list[pd.DataFrame]:
+    """Token samples with 1m candles and the sol columns of a few traders each, like the encoder input."""
+    rng = np.random.default_rng(42)
+    samples = list()
+    for i in range(count):
+        sample = pd.DataFrame({
+            TOKEN_COLUMN: f"token_{i}",
+            TRADING_MINUTE_COLUMN: pd.date_range(datetime(2025, 1, 1), periods=ROWS_PER_SAMPLE, freq="min"),
+            PRICE_COLUMN: rng.random(ROWS_PER_SAMPLE),
+            TOTAL_VOLUME_COLUMN: rng.random(ROWS_PER_SAMPLE),
+        })
+        for trader in rng.choice(200, TRADERS_PER_SAMPLE, replace=False):
+            sample[f"trader{trader}_sol_amount_spent"] = rng.random(ROWS_PER_SAMPLE)
+
+        samples.append(sample)
+
+    return samples
+
+
+def read_pickled(rows: list[bytes]) -> pd.DataFrame:
+    """Previous read path of the encoder, unpickle every row and concat in a loop."""
+    full_data = pd.DataFrame()
+    for row in rows:
+        full_data = pd.concat([full_data, pickle.loads(row)], ignore_index=True)
+
+    return full_data
+
+
+def read_arrow(rows: list[tuple[bytes, str]]) -> pd.DataFrame:
+    return concat_tables([deserialize_table(data, data_format) for data, data_format in rows]).to_pandas()
+
+
+def run_benchmark():
+    for count in SAMPLE_COUNTS:
+        samples = create_samples(count)
+        pickled_rows = [pickle.dumps(sample) for sample in samples]
+        arrow_rows = [serialize_dataframe(sample) for sample in samples]
+
+        start = time.perf_counter()
+        pickled = read_pickled(pickled_rows)
+        pickle_duration = time.perf_counter() - start
+
+        start = time.perf_counter()
+        arrow = read_arrow(arrow_rows)
+        arrow_duration = time.perf_counter() - start
+
+        assert pickled.shape == arrow.shape
+        print(f"{count:6d} samples: pickle + concat loop {pickle_duration:7.2f} s, "
+              f"arrow concat {arrow_duration:7.2f} s, speedup {pickle_duration / arrow_duration:6.1f}x, "
+              f"blob size pickle {sum(map(len, pickled_rows)) / 1e6:6.1f} MB "
+              f"arrow {sum(len(data) for data, _ in arrow_rows) / 1e6:6.1f} MB")
+
+
+if __name__ == '__main__':
+    run_benchmark()
@@ -0,0 +1,82 @@
+import asyncio
+import itertools
+import json
+import time
+from typing import Optional
+
+import websockets
+
+from bot.subscription_manager import SubscriptionManager, create_subscription_message
+from constants import ACCOUNT_SUBSCRIPTION_MODE
+
+WALLET_COUNT = 100
+RESPONSE_LATENCY_SECONDS = 0.05
+CONNECTION_COUNTS = [1, 4]
+SUBSCRIPTION_RATE = 50
+
+
+async def start_stub_server():
+    """Websocket RPC stub that answers every subscription after RESPONSE_LATENCY_SECONDS."""
+    sub_ids = itertools.count(1)
+
+    async def respond(websocket, request: dict):
+        await asyncio.sleep(RESPONSE_LATENCY_SECONDS)
+        await websocket.send(json.dumps({"jsonrpc": "2.0", "result": next(sub_ids), "id": request["id"]}))
+
+    async def handler(websocket, path=None):
+        async for message in websocket:
+            asyncio.create_task(respond(websocket, json.loads(message)))
+
+    return await websockets.serve(handler, "127.0.0.1", 0)
+
+
+async def subscribe_serial(url: str, wallets: list) -> float:
+    """Previous approach, one subscription at a time with 0.2 s sleep and waiting for each response."""
+    start = time.perf_counter()
+    async with websockets.connect(url) as websocket:
+        for address in wallets:
+            await asyncio.sleep(0.2)
+            await websocket.send(json.dumps(create_subscription_message(address, ACCOUNT_SUBSCRIPTION_MODE)))
+            await websocket.recv()
+
+    return time.perf_counter() - start
+
+
+async def subscribe_pipelined(url: str, wallets: list, connections: int) -> float:
+    done = asyncio.Event()
+
+    async def on_message(message: str, wallet: Optional[str]):
+        pass
+
+    async def on_subscriptions_changed(subscription_map: dict):
+        if len(subscription_map) == len(wallets):
+            done.set()
+
+    manager = SubscriptionManager(url, wallets, ACCOUNT_SUBSCRIPTION_MODE, on_message, on_subscriptions_changed,
+                                  connections=connections, rate=SUBSCRIPTION_RATE)
+    start = time.perf_counter()
+    task = asyncio.create_task(manager.run())
+    await done.wait()
+    duration = time.perf_counter() - start
+    task.cancel()
+    await asyncio.gather(task, return_exceptions=True)
+    return duration
+
+
+async def run_benchmark():
+    server = await start_stub_server()
+    url = f"ws://127.0.0.1:{server.sockets[0].getsockname()[1]}"
+    wallets = [f"wallet_{index}" for index in range(WALLET_COUNT)]
+
+    print(f"{WALLET_COUNT} wallets, {RESPONSE_LATENCY_SECONDS * 1000:.0f} ms response latency")
+    print(f"{'serial':>30}: {await subscribe_serial(url, wallets):6.2f} s to fully subscribed")
+    for connections in CONNECTION_COUNTS:
+        duration = await subscribe_pipelined(url, wallets, connections)
+        print(f"{f'pipelined, {connections} connections':>30}: {duration:6.2f} s to fully subscribed")
+
+    server.close()
+    await server.wait_closed()
+
+
+if __name__ == '__main__':
+    asyncio.run(run_benchmark())
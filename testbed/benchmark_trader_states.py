@@ -0,0 +1,71 @@
+import time
+
+import numpy as np
+import pandas as pd
+
+from constants import TOKEN_COLUMN, TRADING_MINUTE_COLUMN, TRADER_COLUMN, PRICE_COLUMN, RANDOM_SEED
+from data.combine_price_trades import add_trader_info_to_price_data, add_trader_info_to_price_data_vectorized
+
+TRADER_COUNT = 500
+TOKEN_COUNT = 5000
+MINUTES_PER_TOKEN = 10
+TRADE_COUNT = 20000
+RUN_LEGACY = True
+
+
+def create_synthetic_data(trader_count: int, token_count: int, minutes_per_token: int, trade_count: int,
+                          seed: int = RANDOM_SEED):
+    rng = np.random.default_rng(seed)
+    start = pd.Timestamp("2024-11-01")
+
+    tokens = np.array([f"token_{i}" for i in range(token_count)])
+    token_start = start + pd.to_timedelta(rng.integers(0, 40 * 24 * 60, token_count), unit="min")
+    price_data = pd.DataFrame({
+        TOKEN_COLUMN: np.repeat(tokens, minutes_per_token),
+        TRADING_MINUTE_COLUMN: np.repeat(token_start.values, minutes_per_token) + np.tile(
+            np.arange(minutes_per_token) * np.timedelta64(1, "m"), token_count),
+        PRICE_COLUMN: rng.random(token_count * minutes_per_token),
+    })
+
+    trade_token = rng.integers(0, token_count, trade_count)
+    buy = rng.random(trade_count) < 0.6
+    amount = rng.integers(1, 1000, trade_count).astype(float)
+    trades = pd.DataFrame({
+        TRADER_COLUMN: np.array([f"trader_{i}" for i in range(trader_count)])[
+            rng.integers(0, trader_count, trade_count)],
+        TOKEN_COLUMN: tokens[trade_token],
+        "block_time": token_start.values[trade_token] + pd.to_timedelta(
+            rng.integers(0, minutes_per_token * 60, trade_count), unit="s").values,
+        "buy": buy.astype(int),
+        "token_sold_amount": np.where(buy, amount, amount / 1000),
+        "token_bought_amount": np.where(buy, amount / 1000, amount),
+    })
+    trader = pd.DataFrame(trades[TRADER_COLUMN].unique(), columns=["trader"])
+
+    return price_data, trader, trades
+
+
+def time_function(function, price_data: pd.DataFrame, trader: pd.DataFrame, trades: pd.DataFrame):
+    start = time.perf_counter()
+    result = function(price_data.copy(), trader, trades.copy())
+    return result, time.perf_counter() - start
+
+
+def run_benchmark(trader_count: int, token_count: int, minutes_per_token: int, trade_count: int, run_legacy: bool):
+    price_data, trader, trades = create_synthetic_data(trader_count, token_count, minutes_per_token, trade_count)
+    print(f"{len(trader)} traders, {token_count} tokens, {len(price_data)} price rows, {len(trades)} trades")
+
+    vectorized, vectorized_time = time_function(add_trader_info_to_price_data_vectorized, price_data, trader, trades)
+    print(f"vectorized: {vectorized_time:.2f}s")
+
+    if not run_legacy:
+        return
+
+    legacy, legacy_time = time_function(add_trader_info_to_price_data, price_data, trader, trades)
+    print(f"legacy:     {legacy_time:.2f}s ({legacy_time / vectorized_time:.0f}x slower)")
+    pd.testing.assert_frame_equal(legacy, vectorized)
+    print("outputs identical")
+
+
+if __name__ == '__main__':
+    run_benchmark(TRADER_COUNT, TOKEN_COUNT, MINUTES_PER_TOKEN, TRADE_COUNT, RUN_LEGACY)
@@ -1,4 +1,3 @@
-import os
 import unittest
 from unittest.mock import patch
 
@@ -6,8 +5,8 @@ import psycopg2
 from dotenv import load_dotenv
 from psycopg2 import sql
 
-from constants import POSTGRES_USER, POSTGRES_PASSWORD, ROOT_DIR
-from database.raw_sql import run_sql_file
+from constants import POSTGRES_USER, POSTGRES_PASSWORD
+from database.raw_sql import setup_database
 from env_data.get_env_value import get_env_value
 
 
@@ -52,7 +51,7 @@ class BaseTestDatabase(unittest.TestCase):
         cls.cursor = cls.conn.cursor()
 
         # Create tables (shared setup for all tests)
-        run_sql_file(os.path.join(ROOT_DIR, "database/tables.sql"))
+        setup_database()
         cls.conn.commit()
 
     @classmethod
@@ -0,0 +1,72 @@
+import unittest
+from unittest.mock import patch, AsyncMock
+
+from birdeye_api.api_limit import ApiQuota, EndpointQuota, WindowLimit, Priority, check_api_limit, \
+    LIVE_ACQUIRE_TIMEOUT_SECONDS
+
+
+class FakeRedis:
+
+    def __init__(self, waits: list):
+        self.waits = waits
+        self.calls = list()
+
+    async def eval(self, script: str, key_count: int, *args):
+        self.calls.append((key_count, args))
+        wait = self.waits.pop(0)
+        if isinstance(wait, Exception):
+            raise wait
+        return str(wait)
+
+
+class TestRunner(unittest.IsolatedAsyncioTestCase):
+
+    def create_quota(self, r: FakeRedis) -> ApiQuota:
+        return ApiQuota("QUOTA", EndpointQuota(rate=15, windows=[WindowLimit("minute", 900, 60),
+                                                                 WindowLimit("day", 50000, 86400)]),
+                        {"trades": EndpointQuota(rate=10, capacity=20)}, backfill_share=0.8, live_waiting=2,
+                        redis_factory=lambda: r)
+
+    def test_script_args(self):
+        quota = self.create_quota(FakeRedis([]))
+
+        args = quota.get_script_args("trades", Priority.LIVE)
+
+        self.assertEqual([5, "QUOTA:live_waiting", "QUOTA:global:bucket", "QUOTA:trades:bucket",
+                          "QUOTA:global:minute", "QUOTA:global:day",
+                          1, 0.8, 2, 15, 15, 10, 20, 900, 60, 50000, 86400, 2], args)
+        self.assertEqual([4, "QUOTA:live_waiting", "QUOTA:global:bucket", "QUOTA:global:minute",
+                          "QUOTA:global:day", 0, 0.8, 1, 15, 15, 900, 60, 50000, 86400, 2],
+                         quota.get_script_args("ohlcv", Priority.BACKFILL))
+
+    async def test_acquire_waits_for_quota(self):
+        r = FakeRedis([0.01, 0.01, 0])
+        quota = self.create_quota(r)
+
+        self.assertTrue(await quota.acquire("trades"))
+        self.assertEqual(3, len(r.calls))
+
+    async def test_acquire_timeout(self):
+        r = FakeRedis([0.01, 60])
+        quota = self.create_quota(r)
+
+        self.assertFalse(await quota.acquire("ohlcv", Priority.LIVE, timeout=1))
+        self.assertEqual(2, len(r.calls))
+
+    async def test_acquire_without_redis(self):
+        quota = self.create_quota(FakeRedis([ConnectionError("redis down")]))
+
+        self.assertTrue(await quota.acquire("ohlcv"))
+
+    @patch("birdeye_api.api_limit.birdeye_quota")
+    async def test_check_api_limit(self, mock_quota):
+        mock_quota.acquire = AsyncMock(return_value=False)
+
+        self.assertTrue(await check_api_limit(False, "ohlcv", Priority.LIVE))
+        mock_quota.acquire.assert_not_called()
+
+        self.assertFalse(await check_api_limit(True, "ohlcv", Priority.LIVE))
+        mock_quota.acquire.assert_called_with("ohlcv", Priority.LIVE, LIVE_ACQUIRE_TIMEOUT_SECONDS)
+
+        await check_api_limit(True, "trades")
+        mock_quota.acquire.assert_called_with("trades", Priority.BACKFILL, None)
@@ -0,0 +1,92 @@
+import asyncio
+import tempfile
+import threading
+import time
+import unittest
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+from birdeye_api.api_limit import Priority
+from birdeye_api.ohlcv_endpoint import get_candles, get_candles_for_tokens, OHLCV_MAX_CANDLES
+from constants import TRADING_MINUTE_COLUMN, PRICE_COLUMN, TOKEN_COLUMN
+from data.candle_store import CandleStore
+
+START_DATE = datetime(2024, 1, 1, 12, 0)
+
+
+def create_ohlcv(token: str, start_date: datetime, end_date: datetime, interval: str, priority: Priority) -> dict:
+    items = list()
+    minute = start_date
+    while minute <= end_date:
+        items.append({"unixTime": int(minute.timestamp()), "c": minute.minute, "v": 1.0, "address": token})
+        minute += timedelta(minutes=1)
+
+    return {"success": True, "data": {"items": items}}
+
+
+class TestRunner(unittest.IsolatedAsyncioTestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.store = CandleStore(self.directory.name)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    @patch("birdeye_api.ohlcv_endpoint.get_ohlcv")
+    async def test_request_only_missing_minutes(self, mock_get_ohlcv):
+        mock_get_ohlcv.side_effect = create_ohlcv
+
+        first = await get_candles("token", START_DATE, START_DATE + timedelta(minutes=9), store=self.store)
+        second = await get_candles("token", START_DATE + timedelta(minutes=5), START_DATE + timedelta(minutes=14),
+                                   Priority.LIVE, store=self.store)
+
+        self.assertEqual(10, len(first))
+        self.assertEqual(list(range(5, 15)), second[PRICE_COLUMN].tolist())
+        self.assertEqual(START_DATE + timedelta(minutes=5), second[TRADING_MINUTE_COLUMN].iloc[0])
+        self.assertEqual({"token"}, set(second[TOKEN_COLUMN]))
+        self.assertEqual(2, mock_get_ohlcv.call_count)
+        self.assertEqual((START_DATE + timedelta(minutes=10), START_DATE + timedelta(minutes=14, seconds=59)),
+                         mock_get_ohlcv.call_args.args[1:3])
+        self.assertEqual(Priority.LIVE, mock_get_ohlcv.call_args.kwargs["priority"])
+
+    @patch("birdeye_api.ohlcv_endpoint.get_ohlcv")
+    async def test_chunks_and_failed_tokens(self, mock_get_ohlcv):
+        def get_ohlcv(token, start_date, end_date, interval, priority):
+            if token == "failing":
+                raise ValueError("failed")
+            return create_ohlcv(token, start_date, end_date, interval, priority)
+
+        mock_get_ohlcv.side_effect = get_ohlcv
+        end_date = START_DATE + timedelta(minutes=OHLCV_MAX_CANDLES + 10)
+
+        candles = await get_candles_for_tokens({"token": (START_DATE, end_date), "failing": (START_DATE, end_date)},
+                                               store=self.store)
+
+        self.assertEqual(1, len(candles))
+        self.assertEqual(OHLCV_MAX_CANDLES + 11, len(candles[0]))
+        self.assertEqual(3, mock_get_ohlcv.call_count)
+
+    @patch("birdeye_api.ohlcv_endpoint.get_ohlcv")
+    async def test_locked_store_does_not_block_loop(self, mock_get_ohlcv):
+        mock_get_ohlcv.side_effect = create_ohlcv
+        locked, release = threading.Event(), threading.Event()
+
+        def hold_lock():
+            with self.store.lock("token"):
+                locked.set()
+                release.wait(1)
+
+        thread = threading.Thread(target=hold_lock)
+        thread.start()
+        locked.wait(1)
+        task = asyncio.create_task(get_candles("token", START_DATE, START_DATE + timedelta(minutes=9),
+                                               store=self.store))
+        start = time.perf_counter()
+        await asyncio.sleep(0.05)
+
+        self.assertLess(time.perf_counter() - start, 0.5)
+        self.assertFalse(task.done())
+        release.set()
+        self.assertEqual(10, len(await task))
+        thread.join()
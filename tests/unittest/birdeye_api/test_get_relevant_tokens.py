@@ -0,0 +1,31 @@
+import unittest
+from datetime import datetime, timedelta
+from unittest.mock import patch, AsyncMock
+
+from birdeye_api.trades_endpoint import get_relevant_tokens
+from constants import PUMP_DOT_FUN_AUTHORITY, TOKEN_COLUMN
+
+
+class TestRunner(unittest.IsolatedAsyncioTestCase):
+
+    @patch("birdeye_api.trades_endpoint.insert_token_creation_infos")
+    @patch("birdeye_api.trades_endpoint.load_token_create_info", new_callable=AsyncMock)
+    @patch("birdeye_api.trades_endpoint.select_token_creation_info_for_list")
+    async def test_new_creation_infos_inserted_in_bulk(self, mock_select, mock_load, mock_insert):
+        start_date = datetime(2025, 1, 1)
+        end_date = start_date + timedelta(days=1)
+        launch_time = start_date + timedelta(hours=1)
+
+        mock_select.return_value = {"saved": (launch_time, PUMP_DOT_FUN_AUTHORITY)}
+        mock_load.side_effect = lambda token: None if token == "unknown" else (launch_time, PUMP_DOT_FUN_AUTHORITY)
+
+        relevant_tokens = await get_relevant_tokens(["saved", "new_1", "unknown", "new_2"], start_date, end_date)
+
+        self.assertEqual(["saved", "new_1", "new_2"], [token[TOKEN_COLUMN] for token in relevant_tokens])
+        self.assertEqual(3, mock_load.call_count)
+        mock_insert.assert_called_once_with([("new_1", PUMP_DOT_FUN_AUTHORITY, launch_time),
+                                             ("new_2", PUMP_DOT_FUN_AUTHORITY, launch_time)])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,156 @@
+import asyncio
+import os
+import tempfile
+import unittest
+from datetime import datetime
+from unittest.mock import patch
+
+from aiohttp import web
+
+from birdeye_api.api_limit import TokenBucket, QuotaLimiter, Priority, TRADER_TRADES_ENDPOINT, birdeye_quota
+from birdeye_api.trade_backfill import TradeBackfill, BackfillCheckpointStore, PAGE_LIMIT
+from constants import BIRDEYE_KEY
+from solana_api.http_client import close_http_session
+
+START_DATE = datetime(2024, 1, 1)
+END_DATE = datetime(2024, 1, 2)
+TRADERS = [f"trader{index}" for index in range(6)]
+
+
+def create_trades(trader: str) -> list:
+    start = int(START_DATE.timestamp())
+    index = int(trader[len("trader"):])
+    trades = list()
+    for second in range(50 + 40 * index):
+        # several trades within the same second, more than a page for trader5
+        count = 3 if second % 7 == 0 else 1
+        if index == 5 and second == 10:
+            count = PAGE_LIMIT + 20
+        for position in range(count):
+            trades.append({"owner": trader, "tx_hash": f"{trader}-{second}-{position}",
+                           "block_unix_time": start + 10 * second + 1})
+
+    # trades after the end date are not part of the result
+    trades.append({"owner": trader, "tx_hash": f"{trader}-late", "block_unix_time": int(END_DATE.timestamp()) + 5})
+    return trades
+
+
+class TestRunner(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.trades = {trader: create_trades(trader) for trader in TRADERS}
+        self.requests = list()
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.rate_limited = set()
+        self.failing_trader = None
+
+        async def handle(request: web.Request) -> web.Response:
+            trader = request.query["address"]
+            self.requests.append(trader)
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+            try:
+                await asyncio.sleep(0.002)
+                # every trader is rate limited once
+                if trader not in self.rate_limited:
+                    self.rate_limited.add(trader)
+                    return web.json_response({"success": False}, status=429)
+
+                if trader == self.failing_trader and self.requests.count(trader) > 3:
+                    return web.json_response({"success": False}, status=500)
+
+                after_time = int(request.query["after_time"])
+                offset = int(request.query["offset"])
+                limit = int(request.query["limit"])
+                items = [trade for trade in self.trades[trader] if trade["block_unix_time"] > after_time]
+                page = items[offset:offset + limit]
+                return web.json_response({"success": True,
+                                          "data": {"items": page, "hasNext": offset + limit < len(items)}})
+            finally:
+                self.in_flight -= 1
+
+        app = web.Application()
+        app.router.add_get("/trader/txs/seek_by_time", handle)
+        self.runner = web.AppRunner(app)
+        await self.runner.setup()
+        site = web.TCPSite(self.runner, "127.0.0.1", 0)
+        await site.start()
+        self.base_url = f"http://127.0.0.1:{site._server.sockets[0].getsockname()[1]}"
+        self.directory = tempfile.TemporaryDirectory()
+        self.env = patch.dict(os.environ, {BIRDEYE_KEY: "key"})
+        self.env.start()
+
+    async def asyncTearDown(self):
+        self.env.stop()
+        self.directory.cleanup()
+        await close_http_session()
+        await self.runner.cleanup()
+
+    def create_backfill(self, **kwargs) -> TradeBackfill:
+        return TradeBackfill(START_DATE, END_DATE, BackfillCheckpointStore(self.directory.name),
+                             rate_limiter=TokenBucket(1000), base_url=self.base_url, retry_base_delay=0.001, seed=1,
+                             **kwargs)
+
+    def expected_trades(self) -> list:
+        return [trade for trader in TRADERS for trade in self.trades[trader]
+                if trade["block_unix_time"] < int(END_DATE.timestamp())]
+
+    async def test_fetches_every_trade_once(self):
+        backfill = self.create_backfill(concurrency=3)
+
+        trades = await backfill.run(TRADERS)
+
+        self.assertEqual(self.expected_trades(), trades)
+        self.assertLessEqual(self.max_in_flight, 3)
+        self.assertEqual(len(TRADERS), backfill.stats.done)
+        self.assertEqual(len(TRADERS), backfill.stats.retries)
+        self.assertEqual(len(self.expected_trades()), backfill.stats.trades)
+
+    async def test_resume_from_checkpoint(self):
+        self.failing_trader = "trader4"
+        backfill = self.create_backfill(max_retries=1)
+
+        trades = await backfill.run(TRADERS)
+
+        self.assertEqual(1, backfill.stats.failed)
+        self.assertNotIn("trader4", {trade["owner"] for trade in trades})
+        requests_before = self.requests.count("trader4")
+
+        self.failing_trader = None
+        self.requests.clear()
+        backfill = self.create_backfill()
+        trades = await backfill.run(TRADERS)
+
+        self.assertEqual(self.expected_trades(), trades)
+        self.assertEqual(["trader4"] * len(self.requests), self.requests)
+        # continues after the stored pages instead of starting again
+        self.assertLess(len(self.requests), len(self.trades["trader4"]) // PAGE_LIMIT + 2)
+        self.assertGreater(requests_before, 1)
+
+    async def test_skip_trader_with_too_many_trades(self):
+        backfill = self.create_backfill(max_trades=200)
+
+        trades = await backfill.run(TRADERS)
+
+        self.assertEqual(3, backfill.stats.skipped)
+        self.assertEqual({"trader0", "trader1", "trader2"}, {trade["owner"] for trade in trades})
+
+    def test_default_rate_limiter_is_backfill_quota(self):
+        backfill = TradeBackfill(START_DATE, END_DATE, BackfillCheckpointStore(self.directory.name))
+
+        self.assertIsInstance(backfill.rate_limiter, QuotaLimiter)
+        self.assertIs(birdeye_quota, backfill.rate_limiter.quota)
+        self.assertEqual(TRADER_TRADES_ENDPOINT, backfill.rate_limiter.endpoint)
+        self.assertEqual(Priority.BACKFILL, backfill.rate_limiter.priority)
+
+    def test_token_bucket(self):
+        now = [0.0]
+        bucket = TokenBucket(10, capacity=2, clock=lambda: now[0])
+
+        self.assertEqual(0, bucket.try_acquire())
+        self.assertEqual(0, bucket.try_acquire())
+        self.assertAlmostEqual(0.1, bucket.try_acquire())
+        now[0] = 0.15
+        self.assertEqual(0, bucket.try_acquire())
+        self.assertAlmostEqual(0.05, bucket.try_acquire())
@@ -0,0 +1,125 @@
+import asyncio
+import time
+import unittest
+from datetime import datetime
+from unittest.mock import patch, AsyncMock, MagicMock
+
+import aiohttp
+
+from blockchain_token.token_creation_cache import TokenCreationInfoCache, BIRDEYE_LAYER, LOCAL_LAYER, \
+    POSTGRES_LAYER, REDIS_LAYER
+
+CREATE_INFO = (datetime(2025, 1, 1, 12, 0), "creator")
+
+
+class FakeRedis:
+
+    def __init__(self):
+        self.data = dict()
+        self.expires = dict()
+
+    async def get(self, key):
+        return self.data.get(key)
+
+    async def set(self, key, value, ex=None):
+        self.data[key] = value.encode()
+        self.expires[key] = ex
+
+
+class TestRunner(unittest.IsolatedAsyncioTestCase):
+
+    def setUp(self):
+        self.r = FakeRedis()
+        self.cache = TokenCreationInfoCache(redis_factory=lambda: self.r)
+
+    @patch("blockchain_token.token_creation_cache.insert_token_creation_info_async", new_callable=AsyncMock)
+    @patch("blockchain_token.token_creation_cache.get_token_create_info_bird_eye", new_callable=AsyncMock)
+    @patch("blockchain_token.token_creation_cache.select_token_creation_info_async", new_callable=AsyncMock)
+    async def test_layers(self, mock_select, mock_bird_eye, mock_insert):
+        mock_select.return_value = None
+        mock_bird_eye.return_value = CREATE_INFO
+
+        self.assertEqual(CREATE_INFO, await self.cache.get("token"))
+        self.assertEqual(CREATE_INFO, await self.cache.get("token"))
+        other_worker = TokenCreationInfoCache(redis_factory=lambda: self.r)
+        self.assertEqual(CREATE_INFO, await other_worker.get("token"))
+
+        mock_bird_eye.assert_awaited_once_with("token")
+        mock_insert.assert_awaited_once_with("token", "creator", CREATE_INFO[0])
+        self.assertEqual(1, self.cache.hits[BIRDEYE_LAYER])
+        self.assertEqual(1, self.cache.hits[LOCAL_LAYER])
+        self.assertEqual(1, other_worker.hits[REDIS_LAYER])
+
+    @patch("blockchain_token.token_creation_cache.get_token_create_info_bird_eye", new_callable=AsyncMock)
+    @patch("blockchain_token.token_creation_cache.select_token_creation_info_async", new_callable=AsyncMock)
+    async def test_postgres_hit_skips_bird_eye(self, mock_select, mock_bird_eye):
+        mock_select.return_value = CREATE_INFO
+
+        self.assertEqual(CREATE_INFO, await self.cache.get("token"))
+
+        mock_bird_eye.assert_not_called()
+        self.assertEqual(1, self.cache.hits[POSTGRES_LAYER])
+        self.assertIn("TOKEN_CREATION_INFO:token", self.r.data)
+
+    @patch("blockchain_token.token_creation_cache.get_token_create_info_bird_eye", new_callable=AsyncMock)
+    @patch("blockchain_token.token_creation_cache.select_token_creation_info_async", new_callable=AsyncMock)
+    async def test_missing_token_cached(self, mock_select, mock_bird_eye):
+        mock_select.return_value = None
+        mock_bird_eye.side_effect = TypeError("'NoneType' object is not subscriptable")
+
+        self.assertIsNone(await self.cache.get("junk"))
+        self.assertIsNone(await self.cache.get("junk"))
+        self.assertIsNone(await TokenCreationInfoCache(redis_factory=lambda: self.r).get("junk"))
+
+        mock_bird_eye.assert_awaited_once()
+        self.assertLessEqual(self.r.expires["TOKEN_CREATION_INFO:junk"], 60)
+
+    @patch("blockchain_token.token_creation_cache.insert_token_creation_info_async", new_callable=AsyncMock)
+    @patch("blockchain_token.token_creation_cache.get_token_create_info_bird_eye", new_callable=AsyncMock)
+    @patch("blockchain_token.token_creation_cache.select_token_creation_info_async", new_callable=AsyncMock)
+    async def test_fresh_token_found_after_negative_ttl(self, mock_select, mock_bird_eye, mock_insert):
+        mock_select.return_value = None
+        mock_bird_eye.side_effect = [TypeError("'NoneType' object is not subscriptable"), CREATE_INFO]
+        cache = TokenCreationInfoCache(negative_ttl=30, redis_factory=lambda: self.r)
+
+        self.assertIsNone(await cache.get("fresh"))
+        # the redis entry expired as well
+        del self.r.data["TOKEN_CREATION_INFO:fresh"]
+        with patch("blockchain_token.token_creation_cache.time.monotonic", return_value=time.monotonic() + 31):
+            self.assertEqual(CREATE_INFO, await cache.get("fresh"))
+
+        self.assertEqual(2, mock_bird_eye.await_count)
+
+    @patch("blockchain_token.token_creation_cache.get_token_create_info_bird_eye", new_callable=AsyncMock)
+    @patch("blockchain_token.token_creation_cache.select_token_creation_info_async", new_callable=AsyncMock)
+    async def test_transient_error_not_cached(self, mock_select, mock_bird_eye):
+        mock_select.return_value = None
+        mock_bird_eye.side_effect = aiohttp.ClientResponseError(MagicMock(), (), status=429)
+
+        self.assertIsNone(await self.cache.get("token"))
+        self.assertIsNone(await self.cache.get("token"))
+
+        self.assertEqual(2, mock_bird_eye.await_count)
+        self.assertEqual(dict(), self.r.data)
+
+    @patch("blockchain_token.token_creation_cache.insert_token_creation_info_async", new_callable=AsyncMock)
+    @patch("blockchain_token.token_creation_cache.get_token_create_info_bird_eye", new_callable=AsyncMock)
+    @patch("blockchain_token.token_creation_cache.select_token_creation_info_async", new_callable=AsyncMock)
+    async def test_single_flight(self, mock_select, mock_bird_eye, mock_insert):
+        async def load(token):
+            await asyncio.sleep(0.01)
+            return CREATE_INFO
+
+        mock_select.return_value = None
+        mock_bird_eye.side_effect = load
+
+        results = await asyncio.gather(*[self.cache.get("token") for _ in range(10)])
+
+        self.assertEqual([CREATE_INFO] * 10, results)
+        mock_select.assert_awaited_once()
+        mock_bird_eye.assert_awaited_once()
+        self.assertEqual(dict(), self.cache._in_flight)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,74 @@
+import asyncio
+import unittest
+
+from bot.event_pipeline import EventPipeline, QUEUE_WAIT_STAGE, HANDLE_STAGE, END_TO_END_STAGE
+
+
+class TestRunner(unittest.IsolatedAsyncioTestCase):
+
+    async def test_messages_handled_concurrently(self):
+        running = list()
+        max_running = list()
+        handled = list()
+
+        async def handler(message: str):
+            running.append(message)
+            max_running.append(len(running))
+            await asyncio.sleep(0.01)
+            running.remove(message)
+            handled.append(message)
+
+        pipeline = EventPipeline(handler, consumers=4, max_size=100)
+        pipeline.start()
+        for index in range(20):
+            self.assertTrue(pipeline.submit(str(index)))
+        await pipeline.stop()
+
+        self.assertEqual(sorted(str(index) for index in range(20)), sorted(handled))
+        self.assertEqual(4, max(max_running))
+        summary = pipeline.stats.summary()
+        self.assertEqual(20, summary["processed"])
+        self.assertEqual(0, summary["dropped"])
+        self.assertEqual({QUEUE_WAIT_STAGE, HANDLE_STAGE, END_TO_END_STAGE}, set(summary["stages"].keys()))
+
+    async def test_full_queue_uses_fallback(self):
+        fallback_messages = list()
+        pipeline = EventPipeline(lambda message: asyncio.sleep(0), max_size=2, fallback=fallback_messages.append)
+
+        results = [pipeline.submit(str(index)) for index in range(4)]
+
+        self.assertEqual([True, True, False, False], results)
+        self.assertEqual(["2", "3"], fallback_messages)
+        self.assertEqual(2, pipeline.stats.fallbacks)
+        self.assertEqual(2, pipeline.stats.max_depth)
+
+    async def test_full_queue_without_fallback_drops(self):
+        pipeline = EventPipeline(lambda message: asyncio.sleep(0), max_size=1)
+
+        pipeline.submit("1")
+        pipeline.submit("2")
+
+        self.assertEqual(1, pipeline.stats.dropped)
+        self.assertEqual(1, pipeline.depth)
+
+    async def test_failed_handler_does_not_stop_consumer(self):
+        handled = list()
+
+        async def handler(message: str):
+            if message == "fail":
+                raise ValueError(message)
+            handled.append(message)
+
+        pipeline = EventPipeline(handler, consumers=1)
+        pipeline.start()
+        pipeline.submit("fail")
+        pipeline.submit("ok")
+        await pipeline.stop()
+
+        self.assertEqual(["ok"], handled)
+        self.assertEqual(1, pipeline.stats.failed)
+        self.assertEqual(1, pipeline.stats.processed)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -7,6 +7,7 @@ from unittest.mock import AsyncMock
 from solders.pubkey import Pubkey
 
 from bot.event_worker import handle_user_event
+from bot.subscription_cache import subscription_cache
 from bot.token_watcher import watch_token
 from dto.trade_model import Trade
 
@@ -14,6 +15,10 @@ from dto.trade_model import Trade
 class TestHandleUserEvent(unittest.IsolatedAsyncioTestCase):
 
     def setUp(self):
+        subscription_cache.clear()
+        claim_patcher = mock.patch('bot.event_worker.claim_signature', new_callable=AsyncMock, return_value=True)
+        claim_patcher.start()
+        self.addCleanup(claim_patcher.stop)
         self.event_data = {
             "jsonrpc": "2.0",
             "method": "accountNotification",
@@ -42,10 +47,10 @@ class TestHandleUserEvent(unittest.IsolatedAsyncioTestCase):
     @mock.patch('bot.event_worker.get_latest_user_trade')
     @mock.patch('bot.event_worker.check_token_create_info')
     @mock.patch('bot.event_worker.Queue')
-    @mock.patch('bot.event_worker.token_watch_exists')
-    @mock.patch('bot.event_worker.insert_trade')
+    @mock.patch('bot.event_worker.token_watch_exists_async', new_callable=AsyncMock)
+    @mock.patch('bot.event_worker.insert_trade_async', new_callable=AsyncMock)
     @mock.patch('bot.event_worker.insert_token_watch')
-    @mock.patch('bot.event_worker.insert_event')
+    @mock.patch('bot.event_worker.insert_event_async', new_callable=AsyncMock)
     async def test_handle_user_event_valid_trade(self, mock_insert_event, mock_insert_token_watch, mock_insert_trade,
                                                  mock_token_watch_exists, mock_queue,
                                                  mock_check_token_create_info,
@@ -76,15 +81,15 @@ class TestHandleUserEvent(unittest.IsolatedAsyncioTestCase):
         # Mock subscription_map
         subscription_map = {23784: trader}
 
-        # Mock getting subscription map from Redis
-        mock_redis.get.return_value = json.dumps(subscription_map)
+        # Mock looking up the trader in the subscription map hash
+        mock_redis.hget.side_effect = lambda key, sub_id: subscription_map[int(sub_id)].encode()
 
         # Call the function
         await handle_user_event(json.dumps(self.event_data))
 
         # Ensure that the expected methods were called
         mock_get_latest_user_trade.assert_called_once_with(Pubkey.from_string(trader),
-                                                           "https://api.mainnet-beta.solana.com")
+                                                           "https://api.mainnet-beta.solana.com", f"{trader}:5199307")
         mock_check_token_create_info.assert_called_once_with("testpump")
         mock_queue.return_value.enqueue.assert_called_once_with(watch_token, "testpump")
 
@@ -97,7 +102,7 @@ class TestHandleUserEvent(unittest.IsolatedAsyncioTestCase):
     @mock.patch('bot.event_worker.get_async_redis')
     @mock.patch('bot.event_worker.get_sync_redis')
     @mock.patch('bot.event_worker.get_latest_user_trade')
-    @mock.patch('bot.event_worker.insert_event')
+    @mock.patch('bot.event_worker.insert_event_async', new_callable=AsyncMock)
     async def test_handle_user_event_no_trade(self, mock_insert_event, mock_get_latest_user_trade,
                                               mock_get_sync_redis, mock_get_async_redis, mock_get_env_value):
         # Mock Redis instance
@@ -115,15 +120,15 @@ class TestHandleUserEvent(unittest.IsolatedAsyncioTestCase):
         # Mock subscription_map
         subscription_map = {23784: trader}
 
-        # Mock getting subscription map from Redis
-        mock_redis.get.return_value = json.dumps(subscription_map)
+        # Mock looking up the trader in the subscription map hash
+        mock_redis.hget.side_effect = lambda key, sub_id: subscription_map[int(sub_id)].encode()
 
         # Call the function
         await handle_user_event(json.dumps(self.event_data))
 
         # Ensure that no further Redis operations were made due to no trade being found
         mock_get_latest_user_trade.assert_called_once_with(Pubkey.from_string(trader),
-                                                           "https://api.mainnet-beta.solana.com")
+                                                           "https://api.mainnet-beta.solana.com", f"{trader}:5199307")
         mock_redis.lpush.assert_not_called()
         mock_insert_event.assert_called_once()
 
@@ -132,10 +137,10 @@ class TestHandleUserEvent(unittest.IsolatedAsyncioTestCase):
     @mock.patch('bot.event_worker.get_sync_redis')
     @mock.patch('bot.event_worker.get_latest_user_trade')
     @mock.patch('bot.event_worker.check_token_create_info')
-    @mock.patch('bot.event_worker.insert_event')
+    @mock.patch('bot.event_worker.insert_event_async', new_callable=AsyncMock)
     @mock.patch('bot.event_worker.insert_token_watch')
-    @mock.patch('bot.event_worker.token_watch_exists')
-    @mock.patch('bot.event_worker.insert_trade')
+    @mock.patch('bot.event_worker.token_watch_exists_async', new_callable=AsyncMock)
+    @mock.patch('bot.event_worker.insert_trade_async', new_callable=AsyncMock)
     async def test_handle_user_event_token_already_exists(self, mock_insert_trade, mock_token_watch_exists,
                                                           mock_insert_token_watch, mock_insert_event,
                                                           mock_check_token_create_info,
@@ -161,8 +166,8 @@ class TestHandleUserEvent(unittest.IsolatedAsyncioTestCase):
         # Mock subscription_map
         subscription_map = {23784: trader}
 
-        # Mock getting subscription map from Redis
-        mock_redis.get.return_value = json.dumps(subscription_map)
+        # Mock looking up the trader in the subscription map hash
+        mock_redis.hget.side_effect = lambda key, sub_id: subscription_map[int(sub_id)].encode()
 
         # Mock that the token is already being watched
         mock_redis.exists.return_value = True
@@ -181,9 +186,9 @@ class TestHandleUserEvent(unittest.IsolatedAsyncioTestCase):
     @mock.patch('bot.event_worker.get_sync_redis')
     @mock.patch('bot.event_worker.get_latest_user_trade')
     @mock.patch('bot.event_worker.check_token_create_info')
-    @mock.patch('bot.event_worker.insert_event')
-    @mock.patch('bot.event_worker.token_watch_exists')
-    @mock.patch('bot.event_worker.insert_trade')
+    @mock.patch('bot.event_worker.insert_event_async', new_callable=AsyncMock)
+    @mock.patch('bot.event_worker.token_watch_exists_async', new_callable=AsyncMock)
+    @mock.patch('bot.event_worker.insert_trade_async', new_callable=AsyncMock)
     async def test_handle_user_event_token_creation_check_fail(self, mock_insert_trade,
                                                                mock_token_watch_exists,
                                                                mock_insert_event, mock_check_token_create_info,
@@ -210,8 +215,8 @@ class TestHandleUserEvent(unittest.IsolatedAsyncioTestCase):
         # Mock subscription_map
         subscription_map = {23784: trader}
 
-        # Mock getting subscription map from Redis
-        mock_redis.get.return_value = json.dumps(subscription_map)
+        # Mock looking up the trader in the subscription map hash
+        mock_redis.hget.side_effect = lambda key, sub_id: subscription_map[int(sub_id)].encode()
 
         # Call the function
         await handle_user_event(json.dumps(self.event_data))
@@ -0,0 +1,124 @@
+import json
+import unittest
+from unittest import mock
+from unittest.mock import AsyncMock
+
+from solders.pubkey import Pubkey
+from solders.signature import Signature
+
+from bot.event_worker import get_trade_from_event
+from constants import PUMP_DOT_FUN_ID
+
+RPC = "https://api.mainnet-beta.solana.com"
+
+
+def create_transaction_notification(trader: str, token: str, signature: str, err=None) -> str:
+    transaction = {
+        "transaction": {
+            "signatures": [signature],
+            "message": {
+                "header": {"numRequiredSignatures": 1, "numReadonlySignedAccounts": 0,
+                           "numReadonlyUnsignedAccounts": 1},
+                "accountKeys": [trader, token, PUMP_DOT_FUN_ID],
+                "recentBlockhash": "11111111111111111111111111111111",
+                "instructions": []
+            }
+        },
+        "meta": {
+            "err": err, "status": {"Ok": None} if err is None else {"Err": err}, "fee": 5000,
+            "preBalances": [2_000_000_000, 0, 0], "postBalances": [1_000_000_000, 0, 0],
+            "innerInstructions": [],
+            "logMessages": [f"Program {PUMP_DOT_FUN_ID} invoke [1]", "Program log: Instruction: Buy"],
+            "preTokenBalances": [],
+            "postTokenBalances": [{"accountIndex": 1, "mint": token, "owner": trader,
+                                   "programId": "TokenkegQfeZyiNwAJbNbGKPFXCWuBvf9Ss623VQ5DA",
+                                   "uiTokenAmount": {"amount": "1000", "decimals": 6, "uiAmount": 0.001,
+                                                     "uiAmountString": "0.001"}}],
+            "rewards": [], "loadedAddresses": {"writable": [], "readonly": []}
+        },
+        "version": 0
+    }
+    return json.dumps({"jsonrpc": "2.0", "method": "transactionNotification",
+                       "params": {"subscription": 1, "result": {"transaction": transaction,
+                                                                "signature": signature, "slot": 10}}})
+
+
+class TestRunner(unittest.IsolatedAsyncioTestCase):
+
+    def setUp(self):
+        claim_patcher = mock.patch('bot.event_worker.claim_signature', new_callable=AsyncMock, return_value=True)
+        self.mock_claim_signature = claim_patcher.start()
+        self.addCleanup(claim_patcher.stop)
+        self.trader = str(Pubkey.new_unique())
+        self.token = str(Pubkey.new_unique())
+        self.signature = str(Signature.new_unique())
+
+    @mock.patch('bot.event_worker.get_user_trade_by_signature', new_callable=AsyncMock)
+    @mock.patch('bot.event_worker.get_latest_user_trade', new_callable=AsyncMock)
+    async def test_transaction_notification_without_rpc(self, mock_latest_trade, mock_trade_by_signature):
+        event = create_transaction_notification(self.trader, self.token, self.signature)
+
+        trade = await get_trade_from_event(event, self.trader, RPC)
+
+        self.assertEqual(self.token, trade.token)
+        self.assertEqual(self.signature, trade.tx_signature)
+        self.assertEqual(-1_000_000_000, trade.sol_amount)
+        self.assertEqual(1000, trade.token_amount)
+        self.assertTrue(trade.buy)
+        mock_latest_trade.assert_not_called()
+        mock_trade_by_signature.assert_not_called()
+
+    async def test_failed_transaction_notification(self):
+        event = create_transaction_notification(self.trader, self.token, self.signature,
+                                                err={"InstructionError": [0, "InvalidArgument"]})
+
+        self.assertIsNone(await get_trade_from_event(event, self.trader, RPC))
+        self.mock_claim_signature.assert_not_called()
+
+    @mock.patch('bot.event_worker.get_user_trade_by_signature', new_callable=AsyncMock)
+    @mock.patch('bot.event_worker.get_latest_user_trade', new_callable=AsyncMock)
+    async def test_logs_notification_fetches_only_transaction(self, mock_latest_trade, mock_trade_by_signature):
+        event = json.dumps({"jsonrpc": "2.0", "method": "logsNotification",
+                            "params": {"subscription": 1, "result": {
+                                "context": {"slot": 10},
+                                "value": {"signature": self.signature, "err": None, "logs": []}}}})
+
+        await get_trade_from_event(event, self.trader, RPC)
+
+        mock_trade_by_signature.assert_awaited_once_with(Pubkey.from_string(self.trader),
+                                                         Signature.from_string(self.signature), RPC)
+        mock_latest_trade.assert_not_called()
+
+    @mock.patch('bot.event_worker.get_latest_user_trade', new_callable=AsyncMock)
+    async def test_account_notification_fetches_latest_trade(self, mock_latest_trade):
+        event = json.dumps({"jsonrpc": "2.0", "method": "accountNotification",
+                            "params": {"subscription": 1, "result": {"context": {"slot": 10}, "value": {}}}})
+
+        await get_trade_from_event(event, self.trader, RPC)
+
+        mock_latest_trade.assert_awaited_once_with(Pubkey.from_string(self.trader), RPC, f"{self.trader}:10")
+
+
+    @mock.patch('bot.event_worker.get_user_trade_by_signature', new_callable=AsyncMock)
+    @mock.patch('bot.event_worker.get_latest_user_trade', new_callable=AsyncMock)
+    async def test_repeated_notifications_dropped_before_rpc(self, mock_latest_trade, mock_trade_by_signature):
+        self.mock_claim_signature.return_value = False
+        logs_event = json.dumps({"jsonrpc": "2.0", "method": "logsNotification",
+                                 "params": {"subscription": 1, "result": {
+                                     "context": {"slot": 10},
+                                     "value": {"signature": self.signature, "err": None, "logs": []}}}})
+        account_event = json.dumps({"jsonrpc": "2.0", "method": "accountNotification",
+                                    "params": {"subscription": 1, "result": {"context": {"slot": 10}, "value": {}}}})
+        transaction_event = create_transaction_notification(self.trader, self.token, self.signature)
+
+        for event in [logs_event, account_event, transaction_event]:
+            self.assertIsNone(await get_trade_from_event(event, self.trader, RPC))
+
+        self.assertEqual([mock.call(self.signature), mock.call(f"{self.trader}:10"), mock.call(self.signature)],
+                         self.mock_claim_signature.await_args_list)
+        mock_latest_trade.assert_not_called()
+        mock_trade_by_signature.assert_not_called()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,89 @@
+import unittest
+
+from bot.subscription_cache import SubscriptionCache, store_subscription_map
+from constants import SUBSCRIPTION_MAP
+
+
+class FakePipeline:
+
+    def __init__(self, redis):
+        self.redis = redis
+        self.commands = list()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        return False
+
+    def __getattr__(self, name):
+        return lambda *args, **kwargs: self.commands.append((name, args, kwargs))
+
+    async def execute(self):
+        for name, args, kwargs in self.commands:
+            await getattr(self.redis, name)(*args, **kwargs)
+
+
+class FakeRedis:
+
+    def __init__(self):
+        self.data = dict()
+        self.calls = list()
+
+    def pipeline(self, transaction: bool = True):
+        return FakePipeline(self)
+
+    async def delete(self, key):
+        self.data.pop(key, None)
+
+    async def hset(self, key, mapping):
+        self.data.setdefault(key, dict()).update({field: value.encode() for field, value in mapping.items()})
+
+    async def incr(self, key):
+        self.data[key] = str(int(self.data.get(key, b"0")) + 1).encode()
+
+    async def get(self, key):
+        self.calls.append("get")
+        return self.data.get(key)
+
+    async def hget(self, key, field):
+        self.calls.append("hget")
+        return self.data.get(key, dict()).get(field)
+
+
+class TestRunner(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.r = FakeRedis()
+        await store_subscription_map(self.r, {1: "trader_a", 2: "trader_b"})
+
+    async def test_store_as_hash(self):
+        self.assertEqual({"1": b"trader_a", "2": b"trader_b"}, self.r.data[SUBSCRIPTION_MAP])
+
+    async def test_lookup_cached(self):
+        cache = SubscriptionCache(check_interval=60)
+
+        self.assertEqual("trader_a", await cache.get_trader(self.r, 1))
+        self.assertEqual("trader_a", await cache.get_trader(self.r, 1))
+        self.assertEqual("trader_b", await cache.get_trader(self.r, 2))
+
+        self.assertEqual(["get", "hget", "hget"], self.r.calls)
+
+    async def test_unknown_id(self):
+        cache = SubscriptionCache()
+
+        self.assertIsNone(await cache.get_trader(self.r, 3))
+        self.assertNotIn(3, cache.traders)
+
+    async def test_new_map_invalidates_cache(self):
+        cache = SubscriptionCache(check_interval=0)
+        self.assertEqual("trader_a", await cache.get_trader(self.r, 1))
+
+        await store_subscription_map(self.r, {1: "trader_c"})
+
+        self.assertEqual("trader_c", await cache.get_trader(self.r, 1))
+        self.assertIsNone(await cache.get_trader(self.r, 2))
+
+
+if __name__ == "__main__":
+    unittest.main()
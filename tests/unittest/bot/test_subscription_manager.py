@@ -0,0 +1,148 @@
+import asyncio
+import itertools
+import json
+import random
+import unittest
+from typing import Dict, Optional
+
+import websockets
+
+from bot.subscription_manager import SubscriptionManager
+from constants import ACCOUNT_SUBSCRIPTION_MODE
+
+WALLETS = [f"wallet_{index}" for index in range(20)]
+
+
+class TestRunner(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.server_subscriptions: Dict[int, str] = dict()
+        self.requests: Dict[str, int] = dict()
+        self.connections = list()
+        self.connection_wallets = dict()
+        self.connection_ids = False
+        self.connection_subscriptions = dict()
+        shared_sub_ids = itertools.count(100)
+
+        async def respond(websocket, request: dict, sub_ids):
+            # answer out of order, the manager has to match the responses by id
+            await asyncio.sleep(random.uniform(0, 0.02))
+            sub_id = next(sub_ids)
+            self.server_subscriptions[sub_id] = request["params"][0]
+            self.connection_subscriptions[websocket][request["params"][0]] = sub_id
+            await websocket.send(json.dumps({"jsonrpc": "2.0", "result": sub_id, "id": request["id"]}))
+
+        async def handler(websocket, path=None):
+            self.connections.append(websocket)
+            self.connection_wallets[websocket] = set()
+            self.connection_subscriptions[websocket] = dict()
+            # every node of a load balanced RPC counts its own subscription ids
+            sub_ids = itertools.count(100) if self.connection_ids else shared_sub_ids
+            async for message in websocket:
+                request = json.loads(message)
+                self.connection_wallets[websocket].add(request["params"][0])
+                self.requests[request["params"][0]] = self.requests.get(request["params"][0], 0) + 1
+                asyncio.create_task(respond(websocket, request, sub_ids))
+
+        self.server = await websockets.serve(handler, "127.0.0.1", 0)
+        self.url = f"ws://127.0.0.1:{self.server.sockets[0].getsockname()[1]}"
+        self.messages = list()
+        self.maps = list()
+        self.changed = asyncio.Event()
+
+    async def asyncTearDown(self):
+        self.task.cancel()
+        await asyncio.gather(self.task, return_exceptions=True)
+        self.server.close()
+        await self.server.wait_closed()
+
+    def start_manager(self, connections: int, rate: float = 1000) -> SubscriptionManager:
+        async def on_message(message: str, wallet: Optional[str]):
+            self.messages.append((message, wallet))
+
+        async def on_subscriptions_changed(subscription_map: Dict[int, str]):
+            self.maps.append(subscription_map)
+            self.changed.set()
+
+        manager = SubscriptionManager(self.url, WALLETS, ACCOUNT_SUBSCRIPTION_MODE, on_message,
+                                      on_subscriptions_changed, connections=connections, rate=rate,
+                                      reconnect_base_delay=0)
+        self.task = asyncio.create_task(manager.run())
+        return manager
+
+    async def wait_for_subscribed(self, manager: SubscriptionManager, connections: int):
+        while len(manager.subscriptions) < connections or \
+                sum(connection.connects for connection in manager.connections) < connections:
+            self.changed.clear()
+            await asyncio.wait_for(self.changed.wait(), 5)
+
+    async def test_wallets_spread_over_connections(self):
+        manager = self.start_manager(connections=4)
+
+        await self.wait_for_subscribed(manager, 4)
+
+        self.assertEqual(4, len(self.connections))
+        self.assertEqual([5, 5, 5, 5], [len(connection.wallets) for connection in manager.connections])
+        self.assertEqual(self.server_subscriptions, manager.subscription_map)
+        self.assertEqual(self.server_subscriptions, self.maps[-1])
+        self.assertEqual({wallet: 1 for wallet in WALLETS}, self.requests)
+
+    async def test_notifications_forwarded(self):
+        manager = self.start_manager(connections=2)
+        await self.wait_for_subscribed(manager, 2)
+
+        notification = json.dumps({"jsonrpc": "2.0", "method": "accountNotification",
+                                   "params": {"subscription": 100, "result": {}}})
+        for connection in self.connections:
+            await connection.send(notification)
+        await asyncio.sleep(0.1)
+
+        self.assertEqual(2, len(self.messages))
+        self.assertEqual([notification, notification], [message for message, _ in self.messages])
+        self.assertIn(self.server_subscriptions[100], [wallet for _, wallet in self.messages])
+
+    async def test_same_subscription_id_on_several_connections(self):
+        self.connection_ids = True
+        manager = self.start_manager(connections=2)
+        await self.wait_for_subscribed(manager, 2)
+
+        notification = json.dumps({"jsonrpc": "2.0", "method": "accountNotification",
+                                   "params": {"subscription": 100, "result": {}}})
+        expected = list()
+        for connection, subscriptions in self.connection_subscriptions.items():
+            expected += [wallet for wallet, sub_id in subscriptions.items() if sub_id == 100]
+            await connection.send(notification)
+        await asyncio.sleep(0.1)
+
+        self.assertEqual(2, len(set(expected)))
+        self.assertEqual(sorted(expected), sorted(wallet for _, wallet in self.messages))
+
+    async def test_reconnect_resubscribes_only_dropped_connection(self):
+        manager = self.start_manager(connections=4)
+        await self.wait_for_subscribed(manager, 4)
+        dropped = manager.connections[0]
+        server_connection = [connection for connection, wallets in self.connection_wallets.items()
+                             if wallets == set(dropped.wallets)][0]
+
+        await server_connection.close()
+        while len(self.maps) < 5:
+            self.changed.clear()
+            await asyncio.wait_for(self.changed.wait(), 5)
+
+        self.assertEqual({wallet: 2 if wallet in dropped.wallets else 1 for wallet in WALLETS}, self.requests)
+        self.assertEqual([2, 1, 1, 1], [connection.connects for connection in manager.connections])
+        self.assertEqual(set(WALLETS), set(manager.subscription_map.values()))
+        self.assertIsNotNone(dropped.subscribe_seconds)
+
+    async def test_subscription_rate_limit(self):
+        manager = self.start_manager(connections=1, rate=100)
+        start = asyncio.get_running_loop().time()
+
+        await self.wait_for_subscribed(manager, 1)
+
+        self.assertGreaterEqual(asyncio.get_running_loop().time() - start, (len(WALLETS) - 1) / 100)
+        self.assertEqual(len(WALLETS), len(manager.subscription_map))
+
+
+if __name__ == "__main__":
+    unittest.main()
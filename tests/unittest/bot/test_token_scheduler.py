@@ -0,0 +1,155 @@
+import unittest
+from datetime import datetime, timedelta
+from unittest.mock import MagicMock, patch, AsyncMock
+
+import numpy as np
+import pandas as pd
+
+from bot.token_scheduler import TokenWatchScheduler
+from constants import PRICE_COLUMN, TOTAL_VOLUME_COLUMN, TRADING_MINUTE_COLUMN, TOKEN_COLUMN, TOKEN_SCHEDULER_WATCHES
+from data.token_feature_state import TokenFeatureState
+from dto.trade_model import Trade
+
+
+class TestRunner(unittest.IsolatedAsyncioTestCase):
+
+    def create_candles(self, token: str, trading_minute: datetime) -> pd.DataFrame:
+        return pd.DataFrame({
+            TOKEN_COLUMN: [token],
+            TRADING_MINUTE_COLUMN: [trading_minute],
+            TOTAL_VOLUME_COLUMN: [100.0],
+            PRICE_COLUMN: [10.0],
+        })
+
+    @patch("bot.token_scheduler.Queue")
+    @patch("bot.token_scheduler.get_sync_redis")
+    @patch("bot.token_scheduler.get_async_redis")
+    @patch("bot.token_scheduler.set_end_time_async", new_callable=AsyncMock)
+    @patch("bot.token_scheduler.insert_token_datasets_async", new_callable=AsyncMock)
+    @patch("bot.token_scheduler.get_time_frame_ohlcv")
+    @patch("bot.token_scheduler.get_new_trades_by_tokens_async", new_callable=AsyncMock)
+    async def test_run_minute(self, mock_get_new_trades, mock_get_ohlcv, mock_insert_token_dataset,
+                              mock_set_end_time, mock_async_redis, mock_sync_redis, mock_queue):
+        trading_minute = datetime.utcnow().replace(second=0, microsecond=0) - timedelta(minutes=1)
+        launch_time = trading_minute - timedelta(minutes=30)
+        redis_instance = AsyncMock()
+        redis_instance.lpop.return_value = None
+        mock_async_redis.return_value = redis_instance
+
+        model = MagicMock()
+        model.get_columns.return_value = [PRICE_COLUMN, "trader_sol_amount_spent"]
+        model.predict_batch.side_effect = lambda values, columns: np.array([False, True, False])
+
+        scheduler = TokenWatchScheduler(model)
+        for token in ["A", "B", "C"]:
+            scheduler.feature_states[token] = TokenFeatureState(token, launch_time, [])
+
+        trade_time = (trading_minute - timedelta(minutes=5)).isoformat()
+        mock_get_new_trades.return_value = {
+            token: ([Trade("trader", token, 1, 1, True, 1, trade_time, "")], 1) for token in ["A", "B", "C"]
+        }
+        mock_get_ohlcv.side_effect = lambda token, minute, window, interval: self.create_candles(token, minute)
+
+        await scheduler.run_minute(trading_minute)
+
+        mock_get_new_trades.assert_called_once_with({"A": 0, "B": 0, "C": 0})
+        self.assertEqual(3, mock_get_ohlcv.call_count)
+        mock_insert_token_dataset.assert_called_once()
+        self.assertEqual(3, len(mock_insert_token_dataset.call_args[0][0]))
+        model.predict_batch.assert_called_once()
+        values, columns = model.predict_batch.call_args[0]
+        self.assertEqual((3, 2), values.shape)
+        mock_queue.return_value.enqueue.assert_called_once()
+        self.assertEqual("B", mock_queue.return_value.enqueue.call_args[0][1])
+        mock_set_end_time.assert_called_once()
+        self.assertEqual(["A", "C"], sorted(scheduler.feature_states.keys()))
+
+    @patch("bot.token_scheduler.Queue")
+    @patch("bot.token_scheduler.get_sync_redis")
+    @patch("bot.token_scheduler.get_async_redis")
+    @patch("bot.token_scheduler.set_end_time_async", new_callable=AsyncMock)
+    async def test_remove_old_tokens(self, mock_set_end_time, mock_async_redis, mock_sync_redis, mock_queue):
+        now = datetime.utcnow()
+        mock_async_redis.return_value = AsyncMock()
+        scheduler = TokenWatchScheduler(MagicMock())
+        scheduler.feature_states["old"] = TokenFeatureState("old", now - timedelta(minutes=121), [])
+        scheduler.feature_states["new"] = TokenFeatureState("new", now - timedelta(minutes=10), [])
+
+        await scheduler.remove_old_tokens(now)
+
+        self.assertEqual(["new"], list(scheduler.feature_states.keys()))
+        mock_set_end_time.assert_called_once()
+        mock_async_redis.return_value.srem.assert_called_once_with(TOKEN_SCHEDULER_WATCHES, "old")
+
+    @patch("bot.token_scheduler.Queue")
+    @patch("bot.token_scheduler.get_sync_redis")
+    @patch("bot.token_scheduler.get_async_redis")
+    @patch("bot.token_scheduler.set_end_time_async", new_callable=AsyncMock)
+    @patch("bot.token_scheduler.insert_token_datasets_async", new_callable=AsyncMock)
+    @patch("bot.token_scheduler.get_time_frame_ohlcv")
+    @patch("bot.token_scheduler.get_new_trades_by_tokens_async", new_callable=AsyncMock)
+    async def test_failing_token_skipped(self, mock_get_new_trades, mock_get_ohlcv, mock_insert_token_dataset,
+                                         mock_set_end_time, mock_async_redis, mock_sync_redis, mock_queue):
+        trading_minute = datetime.utcnow().replace(second=0, microsecond=0) - timedelta(minutes=1)
+        launch_time = trading_minute - timedelta(minutes=30)
+        redis_instance = AsyncMock()
+        redis_instance.lpop.return_value = None
+        mock_async_redis.return_value = redis_instance
+
+        model = MagicMock()
+        model.get_columns.return_value = [PRICE_COLUMN, "trader_sol_amount_spent"]
+        model.predict_batch.side_effect = lambda values, columns: np.array([True] * len(values))
+
+        scheduler = TokenWatchScheduler(model)
+        for token in ["A", "B", "C"]:
+            scheduler.feature_states[token] = TokenFeatureState(token, launch_time, [])
+
+        trade_time = (trading_minute - timedelta(minutes=5)).isoformat()
+        mock_get_new_trades.return_value = {
+            token: ([Trade("trader", token, 1, 1, True, 1, trade_time, "")], 1) for token in ["A", "B", "C"]
+        }
+
+        def get_ohlcv(token, minute, window, interval):
+            if token == "B":
+                raise ValueError("candles failed")
+            return self.create_candles(token, minute)
+
+        mock_get_ohlcv.side_effect = get_ohlcv
+        mock_insert_token_dataset.side_effect = RuntimeError("insert failed")
+        mock_queue.return_value.enqueue.side_effect = [RuntimeError("enqueue failed"), None]
+
+        await scheduler.run_minute(trading_minute)
+
+        self.assertEqual(["A", "C"], [call.args[1] for call in mock_queue.return_value.enqueue.call_args_list])
+        mock_set_end_time.assert_called_once()
+        self.assertEqual(["A", "B"], sorted(scheduler.feature_states.keys()))
+
+    @patch("bot.token_scheduler.Queue")
+    @patch("bot.token_scheduler.get_sync_redis")
+    @patch("bot.token_scheduler.get_async_redis")
+    @patch("bot.token_scheduler.insert_token_watch_async", new_callable=AsyncMock)
+    @patch("bot.token_scheduler.create_token_feature_state", new_callable=AsyncMock)
+    @patch("bot.token_scheduler.get_open_token_watches_async", new_callable=AsyncMock)
+    async def test_restore_token_watches(self, mock_get_open_token_watches, mock_create_feature_state,
+                                         mock_insert_token_watch, mock_async_redis, mock_sync_redis, mock_queue):
+        launch_time = datetime.utcnow() - timedelta(minutes=10)
+        redis_instance = AsyncMock()
+        # D was ended, E is an open watch of an RQ watch_token job
+        redis_instance.smembers.return_value = {b"A", b"B", b"C", b"D"}
+        mock_async_redis.return_value = redis_instance
+        mock_get_open_token_watches.return_value = ["A", "B", "C", "E"]
+        mock_create_feature_state.side_effect = lambda token, columns: \
+            None if token == "C" else TokenFeatureState(token, launch_time, [])
+        scheduler = TokenWatchScheduler(MagicMock())
+        scheduler.feature_states["A"] = TokenFeatureState("A", launch_time, [])
+
+        await scheduler.restore_token_watches()
+
+        self.assertEqual(["A", "B"], sorted(scheduler.feature_states.keys()))
+        self.assertEqual(2, mock_create_feature_state.call_count)
+        mock_insert_token_watch.assert_not_called()
+        redis_instance.srem.assert_called_once_with(TOKEN_SCHEDULER_WATCHES, "D")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,101 @@
+import os
+import pickle
+import tempfile
+import time
+import unittest
+
+import pandas as pd
+
+from data.data_cache import DataCache
+
+
+def create_frame(rows: int = 100) -> pd.DataFrame:
+    return pd.DataFrame({"token": [f"token{index % 7}" for index in range(rows)],
+                         "trading_minute": pd.date_range("2024-01-01", periods=rows, freq="min"),
+                         "price": [index / 3 for index in range(rows)],
+                         "buy": [index % 2 == 0 for index in range(rows)]})
+
+
+class TestRunner(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.legacy_folder = os.path.join(self.directory.name, "legacy")
+        os.makedirs(self.legacy_folder)
+        self.cache = DataCache(os.path.join(self.directory.name, "cache"), max_bytes=None,
+                               legacy_folder=self.legacy_folder)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_dataframe_round_trip(self):
+        df = create_frame()
+
+        metadata = self.cache.put("frame", df, source="test")
+
+        self.assertEqual("arrow", metadata["entry"]["kind"])
+        self.assertEqual("test", metadata["source"])
+        self.assertEqual("double", metadata["entry"]["schema"]["price"])
+        pd.testing.assert_frame_equal(df, self.cache.get("frame"))
+        pd.testing.assert_frame_equal(df[["price"]], self.cache.get("frame", columns=["price"]))
+
+    def test_read_only_is_memory_mapped(self):
+        df = create_frame()
+        self.cache.put("frame", df)
+
+        read_only = self.cache.get("frame", read_only=True)
+        writable = self.cache.get("frame")
+
+        pd.testing.assert_frame_equal(df, read_only)
+        with self.assertRaises(ValueError):
+            read_only.loc[0, "price"] = 1.0
+        writable.loc[0, "price"] = 1.0
+        self.assertEqual(1.0, writable.loc[0, "price"])
+
+    def test_tuple_and_pickle_fallback(self):
+        data = (["a", "b"], create_frame(), 60, pd.DataFrame({0: [1, 2]}))
+
+        metadata = self.cache.put("prep", data)
+        actual = self.cache.get("prep")
+
+        self.assertEqual(["pickle", "arrow", "pickle", "pickle"],
+                         [item["kind"] for item in metadata["entry"]["items"]])
+        self.assertEqual(data[0], actual[0])
+        pd.testing.assert_frame_equal(data[1], actual[1])
+        self.assertEqual(60, actual[2])
+        pd.testing.assert_frame_equal(data[3], actual[3])
+
+    def test_equal_content_stored_once(self):
+        self.cache.put("first", create_frame())
+        self.cache.put("second", create_frame())
+
+        self.assertEqual(self.cache.metadata("first")["entry"]["object"],
+                         self.cache.metadata("second")["entry"]["object"])
+        self.assertEqual(1, len(self.cache.get_object_sizes()))
+
+    def test_missing_and_legacy_pickle(self):
+        self.assertFalse(self.cache.contains("chat"))
+        self.assertIsNone(self.cache.get("chat"))
+
+        with open(os.path.join(self.legacy_folder, "chat.pkl"), "wb") as f:
+            pickle.dump(1234, f)
+
+        self.assertTrue(self.cache.contains("chat"))
+        self.assertEqual(1234, self.cache.get("chat"))
+        self.assertEqual("legacy pickle", self.cache.metadata("chat")["source"])
+
+    def test_evict_least_recently_used(self):
+        self.cache.put("old", create_frame(1000))
+        self.cache.put("recent", create_frame(1001))
+        past = time.time() - 100
+        os.utime(self.cache.get_index_path("recent"), (past, past))
+        os.utime(self.cache.get_index_path("old"), (past - 100, past - 100))
+        self.cache.get("old")
+        size = sum(self.cache.get_object_sizes().values())
+
+        self.cache.max_bytes = size + size // 4
+        self.cache.put("new", create_frame(1002))
+
+        self.assertTrue(self.cache.contains("old"))
+        self.assertFalse(self.cache.contains("recent"))
+        self.assertTrue(self.cache.contains("new"))
@@ -0,0 +1,66 @@
+import unittest
+
+import pandas as pd
+from pandas.testing import assert_frame_equal
+
+from constants import TOKEN_COLUMN, TRADING_MINUTE_COLUMN, TRADER_COLUMN, PRICE_COLUMN
+from data.combine_price_trades import add_trader_info_to_price_data, add_trader_info_to_price_data_vectorized, \
+    TraderState
+
+
+class TestRunner(unittest.TestCase):
+
+    def setUp(self):
+        minutes = pd.date_range("2024-11-17 00:00", periods=5, freq="min")
+        self.price_data = pd.DataFrame({
+            TOKEN_COLUMN: ["token1"] * 5 + ["token2"] * 5,
+            TRADING_MINUTE_COLUMN: list(minutes) * 2,
+            PRICE_COLUMN: range(10),
+        })
+        self.trader = pd.DataFrame({"trader": ["trader1", "trader2", "trader3"]})
+        self.trades = pd.DataFrame([
+            # trader1 buys token1, adds, sells part and nukes the rest
+            ("trader1", "token1", "2024-11-17 00:01:10", 1, 100.0, 1.0),
+            ("trader1", "token1", "2024-11-17 00:02:10", 1, 50.0, 0.5),
+            ("trader1", "token1", "2024-11-17 00:02:40", 0, 0.4, 20.0),
+            ("trader1", "token1", "2024-11-17 00:03:10", 0, 1.0, 130.0),
+            # trader2 buys token2 and sells part of it
+            ("trader2", "token2", "2024-11-17 00:00:30", 1, 10.0, 0.1),
+            ("trader2", "token2", "2024-11-17 00:03:30", 0, 0.05, 5.0),
+            # trader2 trades a token without price data
+            ("trader2", "token3", "2024-11-17 00:00:30", 1, 10.0, 0.1),
+        ], columns=[TRADER_COLUMN, TOKEN_COLUMN, "block_time", "buy", "token_sold_amount", "token_bought_amount"])
+
+    def test_trader_states(self):
+        # Act
+        actual = add_trader_info_to_price_data_vectorized(self.price_data.copy(), self.trader, self.trades.copy())
+        # Assert
+        self.assertEqual(
+            [TraderState.JUST_BOUGHT, TraderState.JUST_BOUGHT, TraderState.NUKED, TraderState.SOLD_ALL],
+            actual[actual[TOKEN_COLUMN] == "token1"]["trader_trader1_state"].tolist()
+        )
+        self.assertEqual(
+            [TraderState.JUST_BOUGHT, TraderState.STILL_HOLDS, TraderState.STILL_HOLDS, TraderState.JUST_SOLD,
+             TraderState.STILL_HOLDS],
+            actual[actual[TOKEN_COLUMN] == "token2"]["trader_trader2_state"].tolist()
+        )
+        self.assertTrue((actual["trader_trader3_state"] == TraderState.NO_ACTION).all())
+
+    def test_matches_add_trader_info_to_price_data(self):
+        # Act
+        expected = add_trader_info_to_price_data(self.price_data.copy(), self.trader, self.trades.copy())
+        actual = add_trader_info_to_price_data_vectorized(self.price_data.copy(), self.trader, self.trades.copy())
+        # Assert
+        assert_frame_equal(expected, actual)
+
+    def test_no_trades(self):
+        # Act
+        expected = add_trader_info_to_price_data(self.price_data.copy(), self.trader, self.trades.iloc[:0].copy())
+        actual = add_trader_info_to_price_data_vectorized(self.price_data.copy(), self.trader,
+                                                          self.trades.iloc[:0].copy())
+        # Assert
+        assert_frame_equal(expected, actual)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,66 @@
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+from data.candle_store import CandleStore, CANDLE_DTYPE, merge_ranges, subtract_ranges
+
+START = 1_700_000_040
+NOW = START + 24 * 60 * 60
+
+
+def create_candles(timestamps: list, close: float = 1.0) -> np.ndarray:
+    candles = np.empty(len(timestamps), dtype=CANDLE_DTYPE)
+    candles["timestamp"] = timestamps
+    candles["close"] = close
+    candles["volume"] = np.arange(len(timestamps))
+    return candles
+
+
+class TestRunner(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.store = CandleStore(self.directory.name)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_ranges(self):
+        self.assertEqual([(0, 20), (30, 40)], merge_ranges([(10, 20), (30, 40), (0, 10)]))
+        self.assertEqual([(0, 10), (20, 30), (40, 50)], subtract_ranges(0, 50, [(10, 20), (30, 40)]))
+        self.assertEqual([], subtract_ranges(12, 18, [(10, 20)]))
+
+    def test_only_missing_ranges(self):
+        self.store.append("token", create_candles([START, START + 60]), START, START + 120, now=NOW)
+        self.store.append("token", create_candles([START + 600]), START + 600, START + 660, now=NOW)
+
+        self.assertEqual([(START + 120, START + 600), (START + 660, START + 900)],
+                         self.store.missing_ranges("token", START, START + 900))
+        self.assertEqual(["token"], self.store.tokens())
+
+    def test_read_sorted_without_duplicates(self):
+        self.store.append("token", create_candles([START + 120, START + 180]), START + 120, START + 240, now=NOW)
+        self.store.append("token", create_candles([START, START + 60, START + 120], close=2.0), START, START + 180,
+                          now=NOW)
+
+        candles = self.store.read("token", START, START + 240)
+
+        self.assertEqual([START, START + 60, START + 120, START + 180], candles["timestamp"].tolist())
+        self.assertEqual([2.0, 2.0, 2.0, 1.0], candles["close"].tolist())
+        self.assertEqual(0, len(self.store.read("other", START, START + 240)))
+
+    def test_unsettled_candles_not_stored(self):
+        self.store.append("token", create_candles([NOW - 180, NOW - 120, NOW - 60]), NOW - 180, NOW, now=NOW)
+
+        self.assertEqual([NOW - 180], self.store.read("token", NOW - 180, NOW)["timestamp"].tolist())
+        self.assertEqual([(NOW - 120, NOW)], self.store.missing_ranges("token", NOW - 180, NOW))
+
+    def test_ignore_partly_written_record(self):
+        self.store.append("token", create_candles([START]), START, START + 60, now=NOW)
+        with open(self.store.candles_path("token"), "ab") as f:
+            f.write(b"\x01\x02")
+
+        self.assertEqual([START], self.store.read("token", START, START + 60)["timestamp"].tolist())
+        self.assertTrue(os.path.exists(self.store.index_path("token")))
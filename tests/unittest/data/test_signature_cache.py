@@ -0,0 +1,84 @@
+import unittest
+from unittest.mock import patch
+
+from data.signature_cache import SignatureCache
+
+
+class FakeRedis:
+
+    def __init__(self):
+        self.data = dict()
+        self.calls = 0
+
+    async def set(self, key, value, nx=False, ex=None):
+        self.calls += 1
+        if nx and key in self.data:
+            return None
+        self.data[key] = (value, ex)
+        return True
+
+    async def delete(self, key):
+        return 1 if self.data.pop(key, None) is not None else 0
+
+
+class TestRunner(unittest.IsolatedAsyncioTestCase):
+
+    def setUp(self):
+        self.r = FakeRedis()
+
+    async def test_repeat_answered_locally(self):
+        cache = SignatureCache(redis_factory=lambda: self.r)
+
+        self.assertTrue(await cache.claim("sig"))
+        self.assertFalse(await cache.claim("sig"))
+
+        self.assertEqual(1, self.r.calls)
+
+    async def test_shared_between_workers(self):
+        worker_a = SignatureCache(redis_factory=lambda: self.r)
+        worker_b = SignatureCache(redis_factory=lambda: self.r)
+
+        self.assertTrue(await worker_a.claim("sig"))
+        self.assertFalse(await worker_b.claim("sig"))
+        self.assertEqual(24 * 60 * 60, self.r.data["SEEN_SIGNATURE:sig"][1])
+
+    async def test_released_signature_claimed_again(self):
+        worker_a = SignatureCache(redis_factory=lambda: self.r)
+        worker_b = SignatureCache(redis_factory=lambda: self.r)
+
+        self.assertTrue(await worker_a.claim("sig"))
+        await worker_a.release("sig")
+
+        self.assertNotIn("SEEN_SIGNATURE:sig", self.r.data)
+        self.assertTrue(await worker_b.claim("sig"))
+        await worker_b.release("sig")
+        self.assertTrue(await worker_a.claim("sig"))
+
+    async def test_lru_eviction(self):
+        cache = SignatureCache(max_size=2, redis_factory=lambda: self.r)
+
+        for signature in ["a", "b", "c"]:
+            await cache.claim(signature)
+
+        self.assertEqual(["b", "c"], list(cache._local.keys()))
+
+    async def test_local_entry_expires(self):
+        cache = SignatureCache(ttl=10, redis_factory=lambda: self.r)
+        await cache.claim("sig")
+
+        with patch("data.signature_cache.time.monotonic", return_value=10 ** 9):
+            self.assertFalse(cache.seen_locally("sig"))
+
+    async def test_redis_failure_uses_local_cache(self):
+        class FailingRedis:
+            async def set(self, *args, **kwargs):
+                raise ConnectionError("redis down")
+
+        cache = SignatureCache(redis_factory=FailingRedis)
+
+        self.assertTrue(await cache.claim("sig"))
+        self.assertFalse(await cache.claim("sig"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,85 @@
+import unittest
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+
+from constants import TOKEN_COLUMN, TRADING_MINUTE_COLUMN, PRICE_COLUMN, TOTAL_VOLUME_COLUMN, LAUNCH_DATE_COLUMN, \
+    CUMULATIVE_VOLUME, PRICE_PCT_CHANGE, TOTAL_VOLUME_PCT_CHANGE, AGE_IN_MINUTES_COLUMN, CHANGE_FROM_ATH, \
+    CHANGE_FROM_ATL, MARKET_CAP_USD
+from data.feature_engineering import add_features, add_ath_atl_changes
+from data.token_feature_state import TokenFeatureState, get_traders_from_columns
+from data.trade_data import create_dataframe_with_trades, get_valid_trades
+from dto.trade_model import Trade
+
+
+class TestRunner(unittest.TestCase):
+
+    def setUp(self):
+        self.launch_time = datetime(2024, 12, 1, 0, 0, 20)
+        self.minutes = pd.date_range("2024-12-01 00:00:00", periods=6, freq="min")
+        self.candles = pd.DataFrame({
+            TOKEN_COLUMN: ["SOL"] * 6,
+            TRADING_MINUTE_COLUMN: self.minutes,
+            TOTAL_VOLUME_COLUMN: [100.0, 0.0, 300.0, 50.0, 80.0, 120.0],
+            PRICE_COLUMN: [10.0, 12.0, 9.0, 0.0, 15.0, 11.0],
+        })
+        self.trades = [
+            Trade("trader1", "SOL", 10, 100, True, 10, (self.launch_time + timedelta(minutes=1)).isoformat(), "a"),
+            Trade("trader2", "SOL", 10, 50, True, 10, (self.launch_time + timedelta(minutes=2)).isoformat(), "b"),
+            Trade("trader1", "SOL", 5, 70, False, 5, (self.launch_time + timedelta(minutes=4)).isoformat(), "c"),
+        ]
+
+    def test_get_traders_from_columns(self):
+        columns = ["trader1_sol_amount_spent", "trader1_sol_amount_received", "trader2_sol_amount_spent", "price"]
+        self.assertEqual(["trader1", "trader2"], get_traders_from_columns(columns))
+
+    def test_matches_full_recalculation(self):
+        state = TokenFeatureState("SOL", self.launch_time, ["trader3"])
+        state.add_trades(self.trades, 3)
+
+        for i, trading_minute in enumerate(self.minutes):
+            trading_minute = trading_minute.to_pydatetime()
+            row = state.update(trading_minute, self.candles.iloc[i:i + 1])
+
+            history = self.candles.iloc[:i + 1].copy()
+            history[LAUNCH_DATE_COLUMN] = self.launch_time
+            expected = add_ath_atl_changes(add_features(history)).iloc[-1]
+            for column in [CUMULATIVE_VOLUME, PRICE_PCT_CHANGE, TOTAL_VOLUME_PCT_CHANGE, AGE_IN_MINUTES_COLUMN,
+                           MARKET_CAP_USD, CHANGE_FROM_ATH, CHANGE_FROM_ATL]:
+                with self.subTest(minute=i, column=column):
+                    self.assertTrue(np.isclose(expected[column], row[column].iloc[0], equal_nan=True))
+
+            expected_trades = create_dataframe_with_trades(get_valid_trades(self.trades, trading_minute),
+                                                           trading_minute, 1)
+            for column in expected_trades.columns.drop(TRADING_MINUTE_COLUMN):
+                with self.subTest(minute=i, column=column):
+                    self.assertEqual(expected_trades[column].iloc[0], row[column].iloc[0])
+
+            self.assertEqual(0.0, row["trader3_sol_amount_spent"].iloc[0])
+
+    def test_missing_candle(self):
+        state = TokenFeatureState("SOL", self.launch_time, [])
+        trading_minute = self.minutes[2].to_pydatetime()
+
+        self.assertEqual(3, state.get_missing_minutes(trading_minute))
+        self.assertIsNone(state.update(trading_minute, self.candles.iloc[:2]))
+        self.assertEqual(1, state.get_missing_minutes(trading_minute))
+        self.assertIsNotNone(state.update(trading_minute, self.candles.iloc[:3]))
+        self.assertEqual(400.0, state.cumulative_volume)
+
+    def test_pending_trades(self):
+        state = TokenFeatureState("SOL", self.launch_time, [])
+        state.add_trades(self.trades, 3)
+
+        self.assertFalse(state.has_valid_trades(self.minutes[0].to_pydatetime()))
+        self.assertTrue(state.has_valid_trades(self.minutes[1].to_pydatetime()))
+
+        state.apply_trades(self.minutes[2].to_pydatetime())
+        self.assertEqual(1, len(state.pending_trades))
+        self.assertEqual(100, state.sol_amount_spent["trader1"])
+        self.assertEqual(0.0, state.sol_amount_received["trader1"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,55 @@
+import asyncio
+import threading
+import time
+import unittest
+from unittest.mock import patch
+
+from database.db_connection import DatabasePool, set_db_pool
+from database.trade_table import get_trades_by_token_async, insert_trade_async
+from dto.trade_model import Trade
+from tests.unittest.database.test_database_pool import create_fake_connection
+
+
+class TestRunner(unittest.IsolatedAsyncioTestCase):
+
+    def setUp(self):
+        set_db_pool(DatabasePool(0, 4, connect=create_fake_connection))
+
+    async def test_calls_do_not_block_event_loop(self):
+        loop_thread = threading.get_ident()
+        call_threads = list()
+
+        def slow_query(token: str):
+            call_threads.append(threading.get_ident())
+            time.sleep(0.2)
+            return [token]
+
+        ticks = 0
+
+        async def count_ticks():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.01)
+                ticks += 1
+
+        ticker = asyncio.create_task(count_ticks())
+        with patch("database.trade_table.get_trades_by_token", side_effect=slow_query):
+            start = time.monotonic()
+            results = await asyncio.gather(*[get_trades_by_token_async(token) for token in ["A", "B", "C"]])
+            duration = time.monotonic() - start
+        ticker.cancel()
+
+        self.assertEqual([["A"], ["B"], ["C"]], results)
+        self.assertNotIn(loop_thread, call_threads)
+        # the three queries run in parallel on the pool threads while the loop keeps running
+        self.assertLess(duration, 0.5)
+        self.assertGreater(ticks, 5)
+
+    async def test_pool_failure_handled_like_sync_call(self):
+        with patch("database.db_connection.get_db_pool", side_effect=ConnectionError("database down")):
+            self.assertEqual([], await get_trades_by_token_async("A"))
+            self.assertIsNone(await insert_trade_async(Trade("trader", "A", 1, 1, True, 1, "2024-01-01T00:00:00", "")))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,74 @@
+import unittest
+from datetime import datetime
+from unittest.mock import patch, MagicMock
+
+import pandas as pd
+
+from database.db_connection import DatabasePool, set_db_pool
+from database.token_creation_info_table import insert_token_creation_infos
+from database.token_sample_table import insert_token_samples
+from database.trade_table import insert_trades
+from dto.token_sample_model import TokenSample
+from dto.trade_model import Trade
+from tests.unittest.database.test_database_pool import create_fake_connection
+
+
+class TestRunner(unittest.TestCase):
+
+    def setUp(self):
+        self.connect = MagicMock(return_value=create_fake_connection())
+        set_db_pool(DatabasePool(0, 1, connect=self.connect))
+
+    @patch("database.trade_table.execute_values")
+    def test_insert_trades(self, mock_execute_values):
+        trade_time = datetime(2025, 1, 1)
+        trades = [Trade(f"trader_{i}", "token", 1, 2, True, 3, trade_time.isoformat(), f"sig_{i}") for i in range(5)]
+
+        inserted = insert_trades(trades, batch_size=2)
+
+        self.assertEqual(5, inserted)
+        mock_execute_values.assert_called_once()
+        rows = mock_execute_values.call_args[0][2]
+        self.assertEqual(("trader_0", "token", 1, 2, True, 3, trade_time, "sig_0"), rows[0])
+        self.assertEqual(5, len(rows))
+        self.assertEqual(2, mock_execute_values.call_args[1]["page_size"])
+        self.connect.return_value.commit.assert_called_once()
+
+    @patch("database.token_sample_table.execute_values")
+    def test_insert_token_samples(self, mock_execute_values):
+        samples = [TokenSample(f"token_{i}", pd.DataFrame({"price": [1.0, 2.0]})) for i in range(3)]
+
+        inserted = insert_token_samples(samples)
+
+        self.assertEqual(3, inserted)
+        rows = mock_execute_values.call_args[0][2]
+        self.assertEqual(["token_0", "token_1", "token_2"], [row[0] for row in rows])
+        self.assertEqual({"arrow"}, {row[2] for row in rows})
+
+    @patch("database.token_creation_info_table.execute_values")
+    def test_insert_token_creation_infos(self, mock_execute_values):
+        infos = [("token", "creator", datetime(2025, 1, 1))]
+
+        inserted = insert_token_creation_infos(infos)
+
+        self.assertEqual(1, inserted)
+        self.assertIn("ON CONFLICT DO NOTHING", mock_execute_values.call_args[0][1])
+        self.assertEqual(infos, mock_execute_values.call_args[0][2])
+
+    @patch("database.trade_table.execute_values")
+    def test_insert_nothing(self, mock_execute_values):
+        self.assertEqual(0, insert_trades([]))
+        mock_execute_values.assert_not_called()
+        self.connect.assert_not_called()
+
+    @patch("database.trade_table.execute_values")
+    def test_failed_insert(self, mock_execute_values):
+        mock_execute_values.side_effect = Exception("connection lost")
+        trade = Trade("trader", "token", 1, 2, True, 3, datetime(2025, 1, 1).isoformat(), "sig")
+
+        self.assertEqual(0, insert_trades([trade]))
+        self.connect.return_value.commit.assert_not_called()
+
+
+if __name__ == "__main__":
+    unittest.main()
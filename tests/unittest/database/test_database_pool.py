@@ -0,0 +1,113 @@
+import asyncio
+import threading
+import unittest
+from unittest.mock import MagicMock, patch
+
+from psycopg2 import extensions
+from psycopg2.pool import PoolError
+
+from database import db_connection
+from database.db_connection import DatabasePool, AsyncDatabasePool, get_db_pool, set_db_pool
+
+
+def create_fake_connection():
+    conn = MagicMock()
+    conn.closed = 0
+    conn.info.transaction_status = extensions.TRANSACTION_STATUS_IDLE
+    conn.__enter__.return_value = conn
+    conn.__exit__.return_value = False
+    return conn
+
+
+class TestRunner(unittest.TestCase):
+
+    def test_connection_reused(self):
+        pool = DatabasePool(0, 2, connect=create_fake_connection)
+
+        with pool.connection() as first:
+            pass
+        with pool.connection() as second:
+            pass
+
+        self.assertIs(first, second)
+        self.assertEqual(1, pool.created_connections)
+
+    def test_min_size_created_upfront(self):
+        pool = DatabasePool(2, 4, connect=create_fake_connection)
+        self.assertEqual(2, pool.created_connections)
+
+    def test_max_idle_closes_extra_connections(self):
+        pool = DatabasePool(0, 2, max_idle=0, connect=create_fake_connection)
+
+        with pool.connection() as conn:
+            pass
+
+        conn.close.assert_called_once()
+        with pool.connection():
+            pass
+        self.assertEqual(2, pool.created_connections)
+
+    def test_checkout_waits_for_free_connection(self):
+        pool = DatabasePool(0, 1, checkout_timeout=0.1, connect=create_fake_connection)
+
+        conn = pool.checkout()
+        with self.assertRaises(PoolError):
+            pool.checkout()
+
+        threading.Timer(0.05, pool.checkin, args=(conn,)).start()
+        pool.checkout_timeout = 2
+        self.assertIs(conn, pool.checkout())
+
+    def test_broken_connection_replaced(self):
+        pool = DatabasePool(0, 2, health_check_interval=0, connect=create_fake_connection)
+
+        with pool.connection() as first:
+            pass
+        first.cursor.return_value.__enter__.return_value.execute.side_effect = Exception("server closed")
+
+        with pool.connection() as second:
+            pass
+
+        self.assertIsNot(first, second)
+        first.close.assert_called_once()
+
+    def test_open_transaction_rolled_back(self):
+        pool = DatabasePool(0, 1, connect=create_fake_connection)
+
+        conn = pool.checkout()
+        conn.info.transaction_status = extensions.TRANSACTION_STATUS_INTRANS
+        pool.checkin(conn)
+
+        conn.rollback.assert_called_once()
+
+    def test_async_run(self):
+        pool = DatabasePool(0, 2, connect=create_fake_connection)
+        async_pool = AsyncDatabasePool(pool)
+
+        async def run():
+            return await asyncio.gather(*[async_pool.run(lambda conn, value: value * 2, i) for i in range(10)])
+
+        self.assertEqual([i * 2 for i in range(10)], asyncio.run(run()))
+        self.assertLessEqual(pool.created_connections, 2)
+
+    @patch("database.db_connection.os.getpid")
+    def test_forked_process_keeps_parent_pool_open(self, getpid):
+        self.addCleanup(db_connection._pools.clear)
+        self.addCleanup(db_connection._inherited_pools.clear)
+        getpid.return_value = 1
+        parent_pool = DatabasePool(1, 2, connect=create_fake_connection)
+        set_db_pool(parent_pool)
+        parent_connection = parent_pool._idle[0][0]
+
+        getpid.return_value = 2
+        with patch("database.db_connection.DatabasePool", return_value=MagicMock()) as create_pool:
+            child_pool = get_db_pool()
+
+        create_pool.assert_called_once()
+        self.assertIsNot(parent_pool, child_pool)
+        self.assertIn(parent_pool, db_connection._inherited_pools)
+        parent_connection.close.assert_not_called()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,80 @@
+import pickle
+import unittest
+from datetime import datetime
+from decimal import Decimal
+
+import pandas as pd
+
+from constants import TOKEN_COLUMN, TRADING_MINUTE_COLUMN, PRICE_COLUMN
+from database.dataframe_blob import serialize_dataframe, deserialize_dataframe, deserialize_table, concat_tables, \
+    ARROW_FORMAT, PICKLE_FORMAT
+
+
+class TestRunner(unittest.TestCase):
+
+    def create_frame(self, token: str, trader: str, rows: int) -> pd.DataFrame:
+        return pd.DataFrame({
+            TOKEN_COLUMN: [token] * rows,
+            TRADING_MINUTE_COLUMN: pd.date_range(datetime(2025, 1, 1), periods=rows, freq="min"),
+            PRICE_COLUMN: [float(i) for i in range(rows)],
+            f"{trader}_sol_amount_spent": [1.0] * rows,
+        })
+
+    def test_round_trip(self):
+        df = self.create_frame("A", "trader", 3)
+
+        data, data_format = serialize_dataframe(df)
+
+        self.assertEqual(ARROW_FORMAT, data_format)
+        pd.testing.assert_frame_equal(df, deserialize_dataframe(memoryview(data), data_format))
+
+    def test_round_trip_keeps_index(self):
+        df = pd.concat([self.create_frame("A", "trader", 3), self.create_frame("B", "trader", 2)])
+        sample = df[df[TOKEN_COLUMN] == "B"]
+
+        data, data_format = serialize_dataframe(sample)
+
+        pd.testing.assert_frame_equal(sample, deserialize_dataframe(data, data_format))
+
+    def test_mixed_types_stored_as_pickle(self):
+        df = pd.DataFrame({"value": [1, "a", Decimal("1.5")]})
+
+        data, data_format = serialize_dataframe(df)
+
+        self.assertEqual(PICKLE_FORMAT, data_format)
+        pd.testing.assert_frame_equal(df, deserialize_dataframe(data, data_format))
+
+    def test_legacy_pickle_rows(self):
+        df = self.create_frame("A", "trader", 2)
+
+        table = deserialize_table(pickle.dumps(df), PICKLE_FORMAT)
+
+        pd.testing.assert_frame_equal(df, table.to_pandas())
+
+    def test_concat_tables(self):
+        first = self.create_frame("A", "first", 2)
+        second = self.create_frame("B", "second", 3).iloc[1:]
+        tables = [deserialize_table(*serialize_dataframe(df)) for df in [first, second]]
+
+        result = concat_tables(tables).to_pandas()
+
+        expected = pd.concat([first, second], ignore_index=True)
+        self.assertEqual(list(expected.columns), list(result.columns))
+        pd.testing.assert_frame_equal(expected, result)
+
+    def test_concat_int_and_float_rows(self):
+        legacy = pd.DataFrame({TOKEN_COLUMN: ["A"], PRICE_COLUMN: [2]})
+        current = pd.DataFrame({TOKEN_COLUMN: ["B"], PRICE_COLUMN: [1.5]})
+        tables = [deserialize_table(*serialize_dataframe(df)) for df in [legacy, current]]
+
+        result = concat_tables(tables).to_pandas()
+
+        self.assertEqual([2.0, 1.5], result[PRICE_COLUMN].tolist())
+        self.assertEqual("float64", str(result[PRICE_COLUMN].dtype))
+
+    def test_concat_no_tables(self):
+        self.assertEqual(0, concat_tables([]).num_rows)
+
+
+if __name__ == "__main__":
+    unittest.main()
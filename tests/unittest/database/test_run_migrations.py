@@ -0,0 +1,76 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import MagicMock
+
+from database.db_connection import DatabasePool, set_db_pool
+from database.raw_sql import get_migrations, run_migrations
+from tests.unittest.database.test_database_pool import create_fake_connection
+
+
+class TestRunner(unittest.TestCase):
+
+    def setUp(self):
+        self.migrations_dir = tempfile.mkdtemp()
+        for file_name, script in [("002_second.sql", "SELECT 2"), ("001_first.sql", "SELECT 1"),
+                                  ("README.md", "not a migration")]:
+            with open(os.path.join(self.migrations_dir, file_name), "w") as file:
+                file.write(script)
+
+    def create_pool(self, applied_versions, failing_query=None):
+        executed = list()
+        cursor = MagicMock()
+
+        def execute(query, params=None):
+            if query == failing_query:
+                raise Exception("broken migration")
+
+            executed.append((query, params))
+            cursor.fetchone.return_value = (1,) if "FROM schema_migrations" in query and params[0] in applied_versions \
+                else None
+
+        cursor.execute.side_effect = execute
+
+        def connect():
+            conn = create_fake_connection()
+            conn.cursor.return_value.__enter__.return_value = cursor
+            return conn
+
+        set_db_pool(DatabasePool(0, 1, connect=connect))
+        return executed
+
+    def test_get_migrations_sorted_by_version(self):
+        migrations = get_migrations(self.migrations_dir)
+
+        self.assertEqual([1, 2], [version for version, _, _ in migrations])
+        self.assertEqual(["first", "second"], [name for _, name, _ in migrations])
+
+    def test_duplicate_version(self):
+        with open(os.path.join(self.migrations_dir, "001_other.sql"), "w") as file:
+            file.write("SELECT 3")
+
+        with self.assertRaises(ValueError):
+            get_migrations(self.migrations_dir)
+
+    def test_only_pending_migrations_applied(self):
+        executed = self.create_pool(applied_versions={1})
+
+        applied = run_migrations(self.migrations_dir)
+
+        self.assertEqual([2], applied)
+        queries = [query for query, _ in executed]
+        self.assertNotIn("SELECT 1", queries)
+        self.assertIn("SELECT 2", queries)
+        self.assertIn(("INSERT INTO schema_migrations (version, name) VALUES (%s, %s)", (2, "second")), executed)
+
+    def test_failed_migration_stops(self):
+        executed = self.create_pool(applied_versions=set(), failing_query="SELECT 1")
+
+        applied = run_migrations(self.migrations_dir)
+
+        self.assertEqual([], applied)
+        self.assertNotIn("SELECT 2", [query for query, _ in executed])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,136 @@
+import asyncio
+import tempfile
+import unittest
+
+import pandas as pd
+from aiohttp import web
+
+from dune.execution_manager import DuneExecutionManager, DuneQuery
+from solana_api.http_client import close_http_session
+
+ROW_COUNT = 25
+PAGE_SIZE = 10
+COLUMN_NAMES = ["trader_id", "amount", "buy", "block_time"]
+COLUMN_TYPES = ["varchar", "bigint", "boolean", "timestamp(3) with time zone"]
+
+
+def create_rows(query_id: int) -> list:
+    return [{"trader_id": f"trader{query_id}_{index}", "amount": index, "buy": index % 2 == 0,
+             "block_time": f"2024-01-01 00:00:{index:02d}.000 UTC"} for index in range(ROW_COUNT)]
+
+
+def create_records(query_id: int) -> list:
+    return [{**row, "block_time": pd.Timestamp(row["block_time"][:-len(" UTC")])} for row in create_rows(query_id)]
+
+
+class TestRunner(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.executions = dict()
+        self.status_calls = 0
+        self.page_requests = list()
+        self.running = 0
+        self.max_running = 0
+        self.fail_offset = None
+
+        async def execute(request: web.Request) -> web.Response:
+            query_id = int(request.match_info["query_id"])
+            body = await request.json()
+            execution_id = f"execution{len(self.executions)}"
+            self.executions[execution_id] = {"query_id": query_id, "params": body["query_parameters"],
+                                             "polls": 0}
+            self.running += 1
+            self.max_running = max(self.max_running, self.running)
+            return web.json_response({"execution_id": execution_id, "state": "QUERY_STATE_PENDING"})
+
+        async def status(request: web.Request) -> web.Response:
+            self.status_calls += 1
+            execution = self.executions[request.match_info["execution_id"]]
+            execution["polls"] += 1
+            if execution["polls"] < 3:
+                return web.json_response({"state": "QUERY_STATE_EXECUTING"})
+            if execution["polls"] == 3:
+                self.running -= 1
+            return web.json_response({"state": "QUERY_STATE_COMPLETED"})
+
+        def results(execution_id: str, query_id: int, request: web.Request) -> web.Response:
+            offset = int(request.query["offset"])
+            limit = int(request.query["limit"])
+            self.page_requests.append((execution_id, offset))
+            if offset == self.fail_offset:
+                self.fail_offset = None
+                return web.json_response({"error": "not found"}, status=404)
+
+            rows = create_rows(query_id)
+            response = {"execution_id": execution_id,
+                        "result": {"rows": rows[offset:offset + limit],
+                                   "metadata": {"column_names": COLUMN_NAMES, "column_types": COLUMN_TYPES}}}
+            if offset + limit < len(rows):
+                response["next_offset"] = offset + limit
+            return web.json_response(response)
+
+        async def execution_results(request: web.Request) -> web.Response:
+            execution_id = request.match_info["execution_id"]
+            return results(execution_id, self.executions[execution_id]["query_id"], request)
+
+        async def latest_results(request: web.Request) -> web.Response:
+            query_id = int(request.match_info["query_id"])
+            self.executions.setdefault(f"latest{query_id}", {"query_id": query_id, "params": None, "polls": 3})
+            return results(f"latest{query_id}", query_id, request)
+
+        app = web.Application()
+        app.router.add_post("/api/v1/query/{query_id}/execute", execute)
+        app.router.add_get("/api/v1/execution/{execution_id}/status", status)
+        app.router.add_get("/api/v1/execution/{execution_id}/results", execution_results)
+        app.router.add_get("/api/v1/query/{query_id}/results", latest_results)
+        self.runner = web.AppRunner(app)
+        await self.runner.setup()
+        site = web.TCPSite(self.runner, "127.0.0.1", 0)
+        await site.start()
+        self.directory = tempfile.TemporaryDirectory()
+        self.manager = DuneExecutionManager(
+            api_key="key", base_url=f"http://127.0.0.1:{site._server.sockets[0].getsockname()[1]}/api/v1",
+            directory=self.directory.name, page_size=PAGE_SIZE, poll_base_delay=0.001)
+
+    async def asyncTearDown(self):
+        self.directory.cleanup()
+        await close_http_session()
+        await self.runner.cleanup()
+
+    async def test_concurrent_queries_with_paging(self):
+        queries = [DuneQuery(1, {"token": "a"}), DuneQuery(2, {"token": "b"}), DuneQuery(3)]
+
+        results = await self.manager.get_results(queries)
+
+        self.assertEqual(2, self.max_running)
+        self.assertEqual(6, self.status_calls)
+        for query, df in zip(queries, results):
+            self.assertEqual(create_records(query.query_id), df.to_dict("records"))
+            self.assertEqual(COLUMN_NAMES, list(df.columns))
+        self.assertEqual({"token": "a"}, self.executions["execution0"]["params"])
+        self.assertEqual(9, len(self.page_requests))
+
+    async def test_use_cache(self):
+        await self.manager.get_result(DuneQuery(1, {"token": "a"}))
+        requests = len(self.page_requests)
+
+        df = await self.manager.get_result(DuneQuery(1, {"token": "a"}))
+        self.assertEqual(ROW_COUNT, len(df))
+        self.assertEqual(requests, len(self.page_requests))
+
+        await self.manager.get_result(DuneQuery(1, {"token": "a"}), use_cache=False)
+        self.assertEqual(2, len(self.executions))
+
+    async def test_resume_download(self):
+        query = DuneQuery(1, {"token": "a"})
+        self.fail_offset = 20
+
+        self.assertIsNone(await self.manager.get_result(query))
+        self.assertEqual(2, self.manager.load_state(query)["parts"])
+
+        self.page_requests.clear()
+        df = await self.manager.get_result(query)
+
+        self.assertEqual(create_records(1), df.to_dict("records"))
+        self.assertEqual(1, len(self.executions))
+        self.assertEqual([("execution0", 20)], self.page_requests)
@@ -0,0 +1,53 @@
+import unittest
+
+import pandas as pd
+from dune_client.models import ResultsResponse
+
+from dune.data_transform import transform_dune_result_typed, transform_dune_result_to_pandas
+
+
+def create_result(rows: list, column_names: list, column_types: list) -> ResultsResponse:
+    return ResultsResponse.from_dict({
+        "execution_id": "execution", "query_id": 1, "state": "QUERY_STATE_COMPLETED",
+        "submitted_at": "2024-01-01T00:00:00Z",
+        "result": {"rows": rows,
+                   "metadata": {"column_names": column_names, "column_types": column_types,
+                                "total_row_count": len(rows), "result_set_bytes": 0, "datapoint_count": 0,
+                                "execution_time_millis": 0}}})
+
+
+class TestRunner(unittest.TestCase):
+
+    def test_typed_columns(self):
+        rows = [{"token": "a", "trader_id": "t1", "amount": 1.5, "slot": 10, "buy": True,
+                 "block_time": "2024-01-01 00:00:01.500 UTC", "big": 2 ** 70},
+                {"token": "b", "trader_id": "t1", "amount": 2, "slot": None, "buy": False,
+                 "block_time": None, "big": None}]
+        result = create_result(rows, ["token", "trader_id", "amount", "slot", "buy", "block_time", "big"],
+                               ["varchar", "varchar", "double", "bigint", "boolean",
+                                "timestamp(3) with time zone", "uint256"])
+
+        df = transform_dune_result_typed(result)
+
+        self.assertIsInstance(df["token"].dtype, pd.CategoricalDtype)
+        self.assertIsInstance(df["trader_id"].dtype, pd.CategoricalDtype)
+        self.assertEqual(["a", "b"], df["token"].tolist())
+        self.assertEqual("float64", df["amount"].dtype)
+        self.assertEqual([10.0], df["slot"].dropna().tolist())
+        self.assertEqual([True, False], df["buy"].tolist())
+        self.assertEqual(pd.Timestamp("2024-01-01 00:00:01.500"), df["block_time"].iloc[0])
+        self.assertTrue(pd.isna(df["block_time"].iloc[1]))
+        self.assertEqual(str(2 ** 70), df["big"].iloc[0])
+
+    def test_same_values_as_row_transform(self):
+        rows = [{"token": f"token{index % 3}", "trader_id": f"trader{index % 5}", "amount": index * 0.5,
+                 "slot": index} for index in range(20)]
+        result = create_result(rows, ["token", "trader_id", "amount", "slot"],
+                               ["varchar", "varchar", "double", "bigint"])
+
+        typed = transform_dune_result_typed(result, categorical_columns=())
+
+        pd.testing.assert_frame_equal(transform_dune_result_to_pandas(result), typed)
+
+    def test_empty_result(self):
+        self.assertTrue(transform_dune_result_typed(create_result([], ["token"], ["varchar"])).empty)
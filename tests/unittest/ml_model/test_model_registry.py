@@ -0,0 +1,68 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from ml_model import model_registry
+from ml_model.base_model import BaseModelBuilder
+
+
+class CountingModelBuilder(BaseModelBuilder):
+    load_count = 0
+
+    def load_model(self, name):
+        CountingModelBuilder.load_count += 1
+
+
+class TestRunner(unittest.TestCase):
+
+    def setUp(self):
+        CountingModelBuilder.load_count = 0
+        model_registry.clear_models()
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.model_path = os.path.join(self.temp_dir.name, "test_model.pkl")
+        with open(self.model_path, "wb") as file:
+            file.write(b"model")
+
+        self.path_patch = patch("ml_model.model_registry.get_model_file_path", return_value=self.model_path)
+        self.version_patch = patch("ml_model.model_registry.get_model_version", return_value="1")
+        self.path_patch.start()
+        self.mock_version = self.version_patch.start()
+
+    def tearDown(self):
+        self.path_patch.stop()
+        self.version_patch.stop()
+        model_registry.clear_models()
+        self.temp_dir.cleanup()
+
+    def test_model_loaded_once(self):
+        first = model_registry.get_model("test_model", CountingModelBuilder)
+        second = model_registry.get_model("test_model", CountingModelBuilder)
+
+        self.assertIs(first, second)
+        self.assertEqual(1, CountingModelBuilder.load_count)
+
+    @patch("ml_model.model_registry.RELOAD_CHECK_INTERVAL_SECONDS", 0)
+    def test_reload_on_file_change(self):
+        first = model_registry.get_model("test_model", CountingModelBuilder)
+        self.assertIs(first, model_registry.get_model("test_model", CountingModelBuilder))
+
+        os.utime(self.model_path, (0, 0))
+        second = model_registry.get_model("test_model", CountingModelBuilder)
+
+        self.assertIsNot(first, second)
+        self.assertEqual(2, CountingModelBuilder.load_count)
+
+    @patch("ml_model.model_registry.RELOAD_CHECK_INTERVAL_SECONDS", 0)
+    def test_reload_on_version_change(self):
+        first = model_registry.get_model("test_model", CountingModelBuilder)
+
+        self.mock_version.return_value = "2"
+        second = model_registry.get_model("test_model", CountingModelBuilder)
+
+        self.assertIsNot(first, second)
+        self.assertEqual(2, CountingModelBuilder.load_count)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,64 @@
+import unittest
+
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import HistGradientBoostingClassifier
+
+from constants import PRICE_COLUMN, TOTAL_VOLUME_COLUMN, TOKEN_COLUMN, TRADING_MINUTE_COLUMN, RANDOM_SEED
+from data.feature_engineering import compute_bin_edges, bin_data
+from ml_model.hist_gradient_model_builder import HistGradientBoostModelBuilder
+
+
+class TestRunner(unittest.TestCase):
+
+    def setUp(self):
+        rng = np.random.default_rng(RANDOM_SEED)
+        self.data = pd.DataFrame({
+            TOKEN_COLUMN: [f"token_{i}" for i in range(200)],
+            TRADING_MINUTE_COLUMN: pd.Timestamp("2024-12-01"),
+            PRICE_COLUMN: rng.random(200),
+            TOTAL_VOLUME_COLUMN: rng.random(200) * 1000,
+            "trader1_sol_amount_spent": rng.integers(0, 3, 200).astype(float),
+        })
+        self.label = (self.data[PRICE_COLUMN] + self.data["trader1_sol_amount_spent"] > 1.5).to_numpy()
+
+        self.model = HistGradientBoostModelBuilder(dict())
+        self.model.columns = [PRICE_COLUMN, TOTAL_VOLUME_COLUMN, "trader1_sol_amount_spent", "trader2_sol_amount_spent"]
+        self.data["trader2_sol_amount_spent"] = 0.0
+        self.model.model = HistGradientBoostingClassifier(random_state=RANDOM_SEED)
+        self.model.model.fit(self.data[self.model.columns], self.label)
+
+    def test_predict_batch_matches_predict(self):
+        input_columns = [TOTAL_VOLUME_COLUMN, "trader1_sol_amount_spent", PRICE_COLUMN]
+        expected_x, _ = self.model.prepare_prediction_data(self.data.copy(), False)
+
+        actual = self.model.predict_batch(self.data[input_columns].to_numpy(), input_columns)
+
+        # prepare_prediction_data sorts by token, the batch path keeps the input order
+        np.testing.assert_array_equal(self.model.predict(expected_x), actual[expected_x.index])
+        matrix = self.model.prepare_prediction_matrix(self.data[input_columns].to_numpy(), input_columns)
+        np.testing.assert_allclose(self.model.model.predict_proba(expected_x),
+                                   self.model.predict_proba_matrix(matrix)[expected_x.index], rtol=1e-5)
+
+    def test_prepare_prediction_matrix_binning(self):
+        self.model.binned_data = True
+        self.model.bin_edges = compute_bin_edges(self.data, [PRICE_COLUMN, TOTAL_VOLUME_COLUMN], 5)
+        input_columns = self.model.columns
+
+        expected = bin_data(self.data.copy(), self.model.binned_columns, self.model.bin_edges)[input_columns]
+        actual = self.model.prepare_prediction_matrix(self.data[input_columns].to_numpy(), input_columns,
+                                                      dtype=np.float64)
+
+        np.testing.assert_array_equal(expected.to_numpy(dtype=np.float64), actual)
+
+    def test_missing_columns_filled(self):
+        input_columns = [PRICE_COLUMN]
+        matrix = self.model.prepare_prediction_matrix(np.array([[0.5], [0.7]]), input_columns)
+
+        self.assertEqual((2, 4), matrix.shape)
+        self.assertEqual(np.float32, matrix.dtype)
+        np.testing.assert_array_equal(np.zeros((2, 3), dtype=np.float32), matrix[:, 1:])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,69 @@
+import asyncio
+import unittest
+
+from aiohttp import web
+
+from solana_api.http_client import HttpClientManager
+
+
+class TestRunner(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.client_ports = set()
+
+        async def handle(request: web.Request) -> web.Response:
+            self.client_ports.add(request.transport.get_extra_info("peername")[1])
+            return web.json_response({"ok": True})
+
+        app = web.Application()
+        app.router.add_get("/", handle)
+        self.runner = web.AppRunner(app)
+        await self.runner.setup()
+        site = web.TCPSite(self.runner, "127.0.0.1", 0)
+        await site.start()
+        self.url = f"http://127.0.0.1:{site._server.sockets[0].getsockname()[1]}/"
+        self.manager = HttpClientManager(limit_per_host=2)
+
+    async def asyncTearDown(self):
+        await self.manager.close()
+        await self.runner.cleanup()
+
+    async def test_connections_kept_alive(self):
+        for _ in range(5):
+            async with self.manager.get_session().get(self.url) as response:
+                self.assertEqual({"ok": True}, await response.json())
+
+        self.assertEqual(1, len(self.client_ports))
+
+    async def test_limit_per_host(self):
+        async def request():
+            async with self.manager.get_session().get(self.url) as response:
+                return await response.json()
+
+        await asyncio.gather(*[request() for _ in range(10)])
+
+        self.assertEqual(2, len(self.client_ports))
+
+    async def test_session_reused_until_closed(self):
+        session = self.manager.get_session()
+        self.assertIs(session, self.manager.get_session())
+
+        await self.manager.close()
+
+        self.assertTrue(session.closed)
+        self.assertIsNot(session, self.manager.get_session())
+
+    async def test_session_per_event_loop(self):
+        async def get_session_in_new_loop():
+            session = self.manager.get_session()
+            await self.manager.close()
+            return session
+
+        other_session = await asyncio.to_thread(asyncio.run, get_session_in_new_loop())
+
+        self.assertIsNot(other_session, self.manager.get_session())
+        self.assertTrue(other_session.closed)
+
+
+if __name__ == "__main__":
+    unittest.main()
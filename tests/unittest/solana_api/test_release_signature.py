@@ -0,0 +1,57 @@
+import unittest
+from unittest.mock import patch, AsyncMock, MagicMock
+
+from solders.pubkey import Pubkey
+from solders.signature import Signature
+
+from solana_api.solana_data import get_user_trade_by_signature, get_latest_user_trade
+
+RPC = "http://rpc.test"
+TRADER = Pubkey.from_string("GWwmd3zZQnLvqvixKGD3RKtaFVAtfPn1kGN4bx8tHRTR")
+SIGNATURE = Signature.default()
+
+
+class TestRunner(unittest.IsolatedAsyncioTestCase):
+
+    @patch("solana_api.solana_data.release_signature", new_callable=AsyncMock)
+    @patch("solana_api.solana_data.get_transaction", new_callable=AsyncMock, return_value=None)
+    @patch("solana_api.solana_data.get_solana_client")
+    async def test_signature_released_if_transaction_missing(self, mock_client, mock_get_transaction,
+                                                             mock_release_signature):
+        self.assertIsNone(await get_user_trade_by_signature(TRADER, SIGNATURE, RPC))
+
+        mock_release_signature.assert_awaited_once_with(str(SIGNATURE))
+
+    @patch("solana_api.solana_data.release_signature", new_callable=AsyncMock)
+    @patch("solana_api.solana_data.claim_signature", new_callable=AsyncMock, return_value=True)
+    @patch("solana_api.solana_data.get_transaction", new_callable=AsyncMock, side_effect=ValueError("rpc failed"))
+    @patch("solana_api.solana_data.get_recent_signature", new_callable=AsyncMock)
+    @patch("solana_api.solana_data.get_solana_client")
+    async def test_latest_trade_releases_claims_on_failure(self, mock_client, mock_recent_signature,
+                                                           mock_get_transaction, mock_claim_signature,
+                                                           mock_release_signature):
+        mock_recent_signature.return_value = MagicMock(signature=SIGNATURE, err=None)
+
+        self.assertIsNone(await get_latest_user_trade(TRADER, RPC, "trader:10"))
+
+        self.assertEqual(["trader:10", str(SIGNATURE)],
+                         [call.args[0] for call in mock_release_signature.await_args_list])
+
+    @patch("solana_api.solana_data.release_signature", new_callable=AsyncMock)
+    @patch("solana_api.solana_data.claim_signature", new_callable=AsyncMock, return_value=True)
+    @patch("solana_api.solana_data.get_transaction", new_callable=AsyncMock)
+    @patch("solana_api.solana_data.get_recent_signature", new_callable=AsyncMock)
+    @patch("solana_api.solana_data.get_solana_client")
+    async def test_latest_trade_keeps_claim_of_failed_transaction(self, mock_client, mock_recent_signature,
+                                                                  mock_get_transaction, mock_claim_signature,
+                                                                  mock_release_signature):
+        mock_recent_signature.return_value = MagicMock(signature=SIGNATURE, err="InstructionError")
+
+        self.assertIsNone(await get_latest_user_trade(TRADER, RPC, "trader:10"))
+
+        mock_get_transaction.assert_not_called()
+        mock_release_signature.assert_not_called()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,140 @@
+import asyncio
+import time
+import unittest
+
+import numpy as np
+from aiohttp import web
+from solana.rpc.async_api import AsyncClient
+from solana.rpc.core import RPCException
+from solders.pubkey import Pubkey
+from solders.rpc.requests import GetTransaction
+from solders.rpc.responses import GetTransactionResp
+from solders.signature import Signature
+
+from solana_api.solana_data import RpcBatchCoalescer, get_recent_signature, get_transaction, _batch_coalescers
+
+SIGNATURE = str(Signature.default())
+CALL_COUNT = 200
+
+
+def create_result(request: dict) -> dict:
+    if request["method"] == "getSignaturesForAddress":
+        return {"jsonrpc": "2.0", "id": request["id"],
+                "result": [{"signature": SIGNATURE, "slot": request["id"], "err": None, "memo": None,
+                            "blockTime": 1, "confirmationStatus": "finalized"}]}
+
+    if request["params"][0] == SIGNATURE:
+        return {"jsonrpc": "2.0", "id": request["id"], "error": {"code": -32009, "message": "not available"}}
+
+    return {"jsonrpc": "2.0", "id": request["id"], "result": None}
+
+
+class TestRunner(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.batches = list()
+
+        async def handle(request: web.Request) -> web.Response:
+            body = await request.json()
+            self.batches.append(body)
+            await asyncio.sleep(0.005)
+            # answer in reverse order, responses have to be matched by id
+            return web.json_response([create_result(item) for item in reversed(body)])
+
+        app = web.Application()
+        app.router.add_post("/", handle)
+        self.runner = web.AppRunner(app)
+        await self.runner.setup()
+        site = web.TCPSite(self.runner, "127.0.0.1", 0)
+        await site.start()
+        self.client = AsyncClient(f"http://127.0.0.1:{site._server.sockets[0].getsockname()[1]}/")
+
+    async def asyncTearDown(self):
+        _batch_coalescers.pop(self.client, None)
+        await self.client.close()
+        await self.runner.cleanup()
+
+    async def test_concurrent_calls_sent_as_one_batch(self):
+        accounts = [Pubkey.new_unique() for _ in range(10)]
+
+        signatures = await asyncio.gather(*[get_recent_signature(self.client, account) for account in accounts])
+
+        self.assertEqual(1, len(self.batches))
+        self.assertEqual(10, len(self.batches[0]))
+        self.assertEqual(["getSignaturesForAddress"], list({item["method"] for item in self.batches[0]}))
+        self.assertEqual([item["id"] for item in self.batches[0]], [signature.slot for signature in signatures])
+
+    async def test_mixed_methods_and_errors(self):
+        results = await asyncio.gather(get_recent_signature(self.client, Pubkey.new_unique()),
+                                       get_transaction(self.client, Signature.new_unique()),
+                                       get_transaction(self.client, Signature.default()))
+
+        self.assertEqual(1, len(self.batches))
+        self.assertEqual(SIGNATURE, str(results[0].signature))
+        self.assertIsNone(results[1])
+        self.assertIsNone(results[2])
+
+    async def test_error_fails_only_its_request(self):
+        coalescer = RpcBatchCoalescer(self.client)
+        _batch_coalescers[self.client] = coalescer
+        failing_call = coalescer.request(lambda request_id: GetTransaction(Signature.default(), None, request_id),
+                                         GetTransactionResp)
+        other_call = get_transaction(self.client, Signature.new_unique())
+
+        results = await asyncio.gather(failing_call, other_call, return_exceptions=True)
+
+        self.assertEqual(1, len(self.batches))
+        self.assertIsInstance(results[0], RPCException)
+        self.assertIsNone(results[1])
+
+    async def test_max_batch_size_flushes_immediately(self):
+        _batch_coalescers[self.client] = RpcBatchCoalescer(self.client, window=10, max_batch_size=5)
+
+        await asyncio.wait_for(asyncio.gather(*[get_recent_signature(self.client, Pubkey.new_unique())
+                                                for _ in range(10)]), 5)
+
+        self.assertEqual([5, 5], [len(batch) for batch in self.batches])
+
+    async def test_latency_percentiles(self):
+        async def timed_call() -> float:
+            start = time.perf_counter()
+            await get_recent_signature(self.client, Pubkey.new_unique())
+            return time.perf_counter() - start
+
+        latencies = list()
+        for _ in range(CALL_COUNT // 50):
+            latencies += await asyncio.gather(*[timed_call() for _ in range(50)])
+
+        latencies_ms = np.array(latencies) * 1000
+        p50, p99 = np.percentile(latencies_ms, 50), np.percentile(latencies_ms, 99)
+
+        self.assertEqual(CALL_COUNT // 50, len(self.batches))
+        self.assertLess(p99, 1000, f"p50 {p50:.1f} ms, p99 {p99:.1f} ms")
+
+    async def test_single_call_not_delayed(self):
+        # the first call opens the connection
+        await get_recent_signature(self.client, Pubkey.new_unique())
+        latencies = list()
+        for _ in range(10):
+            start = time.perf_counter()
+            await get_recent_signature(self.client, Pubkey.new_unique())
+            latencies.append(time.perf_counter() - start)
+        latency_ms = np.median(latencies) * 1000
+
+        self.assertEqual([1] * 11, [len(batch) for batch in self.batches])
+        self.assertLess(latency_ms, 20, f"median latency {latency_ms:.1f} ms")
+
+    async def test_window_collects_sequential_calls(self):
+        _batch_coalescers[self.client] = RpcBatchCoalescer(self.client, window=0.05)
+
+        async def delayed_call(delay: float):
+            await asyncio.sleep(delay)
+            return await get_recent_signature(self.client, Pubkey.new_unique())
+
+        await asyncio.gather(delayed_call(0), delayed_call(0.01))
+
+        self.assertEqual([2], [len(batch) for batch in self.batches])
+
+
+if __name__ == "__main__":
+    unittest.main()
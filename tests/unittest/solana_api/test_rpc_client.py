@@ -0,0 +1,83 @@
+import json
+import unittest
+
+import httpx
+from solders.pubkey import Pubkey
+from solders.rpc.requests import GetBalance, GetSlot
+from solders.rpc.responses import GetBalanceResp, GetSlotResp
+
+from solana_api.rpc_client import PooledHTTPProvider, RpcLatencyStats, SolanaClientPool
+
+ENDPOINT = "http://rpc.test"
+
+
+class TestRunner(unittest.IsolatedAsyncioTestCase):
+
+    def create_provider(self, responses: list, stats: RpcLatencyStats) -> PooledHTTPProvider:
+        self.requests = list()
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            body = json.loads(request.content)
+            self.requests.append(body)
+            status = responses.pop(0) if len(responses) > 0 else 200
+            if status != 200:
+                return httpx.Response(status)
+
+            if isinstance(body, list):
+                return httpx.Response(200, json=[{"jsonrpc": "2.0", "id": item["id"], "result": 7} for item in body])
+
+            return httpx.Response(200, json={"jsonrpc": "2.0", "id": body["id"],
+                                             "result": {"context": {"slot": 1}, "value": 5}})
+
+        provider = PooledHTTPProvider(ENDPOINT, retry_base_delay=0, stats=stats)
+        provider.session = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        return provider
+
+    async def test_retry_on_unavailable(self):
+        stats = RpcLatencyStats()
+        provider = self.create_provider([503, 429], stats)
+
+        response = await provider.make_request(GetBalance(Pubkey.default()), GetBalanceResp)
+
+        self.assertEqual(5, response.value)
+        self.assertEqual(3, len(self.requests))
+        summary = stats.summary()
+        self.assertEqual(1, summary["GetBalance"]["calls"])
+        self.assertEqual(2, summary["GetBalance"]["retries"])
+        self.assertEqual(0, summary["GetBalance"]["errors"])
+
+    async def test_give_up_after_max_retries(self):
+        stats = RpcLatencyStats()
+        provider = self.create_provider([503] * 10, stats)
+
+        with self.assertRaises(Exception):
+            await provider.make_request(GetBalance(Pubkey.default()), GetBalanceResp)
+
+        self.assertEqual(provider.max_retries + 1, len(self.requests))
+        self.assertEqual(1, stats.summary()["GetBalance"]["errors"])
+
+    async def test_batch_request(self):
+        stats = RpcLatencyStats()
+        provider = self.create_provider([], stats)
+
+        responses = await provider.make_batch_request((GetSlot(), GetSlot()), (GetSlotResp, GetSlotResp))
+
+        self.assertEqual([7, 7], [response.value for response in responses])
+        self.assertEqual(1, len(self.requests))
+        self.assertIn("batch[GetSlot]", stats.summary())
+
+    async def test_client_shared_per_endpoint(self):
+        pool = SolanaClientPool()
+
+        client = pool.get_client(ENDPOINT)
+
+        self.assertIs(client, pool.get_client(ENDPOINT))
+        self.assertIsNot(client, pool.get_client("http://other.test"))
+        self.assertIsInstance(client._provider, PooledHTTPProvider)
+        await pool.close()
+        self.assertIsNot(client, pool.get_client(ENDPOINT))
+        await pool.close()
+
+
+if __name__ == "__main__":
+    unittest.main()